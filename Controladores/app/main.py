@@ -4,9 +4,38 @@ import logging
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
+from contextlib import asynccontextmanager
 from app.routers import routers  # importa la lista de routers definida en __init__.py
+from app.services.pdf_render import pdf_render_service
+from app.services.jobs import crear_tabla_jobs, job_runner
+from app.services.versiones_lista import crear_tabla_versiones
+from app.services.email_outbox import EMAIL_DISPATCHER_ENABLED, crear_tabla_outbox, email_dispatcher
+from app.services.metrics import METRICS_ENABLED, instrumentar_engine, metrics_middleware
+from app.services.presupuesto_sql import QUERY_GUARD_ENABLED, query_guard_middleware
+from app.database import engine, async_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Procesos de renderizado PDF listos (fuentes y estilos cargados) antes del primer request
+    pdf_render_service.start()
+    # Versiones de los catálogos para los ETag de los endpoints /list
+    crear_tabla_versiones()
+    # Cola de documentos en segundo plano (tabla job + workers de esta instancia)
+    crear_tabla_jobs()
+    job_runner.start()
+    # Outbox de correos y su dispatcher en segundo plano
+    crear_tabla_outbox()
+    if EMAIL_DISPATCHER_ENABLED:
+        email_dispatcher.start()
+    yield
+    await email_dispatcher.stop()
+    await job_runner.stop()
+    pdf_render_service.shutdown()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="ERP System",
     description="Backend ERP con FastAPI",
     version="1.0.0",
@@ -37,6 +66,15 @@ for r in routers:
 def root():
     return {"msg": "API funcionando 🚀"}
 
+# Sentencias SQL de ambos engines (sync y async) para /metrics y el detector de N+1
+instrumentar_engine(engine)
+instrumentar_engine(async_engine.sync_engine)
+if METRICS_ENABLED:
+    app.middleware("http")(metrics_middleware)
+# Solo en desarrollo: avisa cuando un request repite la misma sentencia (N+1)
+if QUERY_GUARD_ENABLED:
+    app.middleware("http")(query_guard_middleware)
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     logger = logging.getLogger("uvicorn")
@@ -0,0 +1,41 @@
+from sqlalchemy import JSON, DateTime, Index, Integer, LargeBinary, PrimaryKeyConstraint, String, Text, text
+from sqlalchemy.orm import deferred, mapped_column
+
+from app.models.generated import Base
+
+# Estados de un job en segundo plano
+JOB_PENDIENTE = "pendiente"
+JOB_EN_PROCESO = "en_proceso"
+JOB_COMPLETADO = "completado"
+JOB_ERROR = "error"
+
+
+class Job(Base):
+    """
+    Documento pedido en segundo plano (PDF o Excel). La tabla hace de cola:
+    los workers toman el pendiente más antiguo y guardan ahí el resultado.
+    No viene de sqlacodegen; se crea al iniciar la app si no existe.
+    """
+    __tablename__ = 'job'
+    __table_args__ = (
+        PrimaryKeyConstraint('id_job', name='job_pkey'),
+        Index('ix_job_estado_creado', 'estado', 'creado'),
+    )
+
+    id_job = mapped_column(String(36))
+    kind = mapped_column(String(40), nullable=False)
+    estado = mapped_column(String(20), nullable=False, server_default=text("'pendiente'"))
+    id_empresa = mapped_column(Integer, nullable=False)
+    id_usuario = mapped_column(Integer)
+    payload = mapped_column(JSON, nullable=False)
+    # El archivo solo se carga al descargarlo, no al consultar el estado
+    resultado = deferred(mapped_column(LargeBinary))
+    media_type = mapped_column(String(100))
+    filename = mapped_column(String(150))
+    error = mapped_column(Text)
+    intentos = mapped_column(Integer, nullable=False, server_default=text('0'))
+    # Tras un error el job no se vuelve a tomar antes de esta hora (NULL = ya)
+    proximo_intento = mapped_column(DateTime(True))
+    creado = mapped_column(DateTime(True), nullable=False)
+    iniciado = mapped_column(DateTime(True))
+    terminado = mapped_column(DateTime(True))
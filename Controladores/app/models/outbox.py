@@ -0,0 +1,38 @@
+from sqlalchemy import JSON, DateTime, Identity, Index, Integer, PrimaryKeyConstraint, String, Text, text
+from sqlalchemy.orm import mapped_column
+
+from app.models.generated import Base
+
+# Estados de un correo en el outbox
+EMAIL_PENDIENTE = "pendiente"
+EMAIL_ENVIADO = "enviado"
+EMAIL_ERROR = "error"
+
+
+class EmailOutbox(Base):
+    """
+    Correo por enviar. Se inserta en la misma transacción que el cambio que
+    lo origina (p. ej. el registro) y un dispatcher en segundo plano lo envía.
+    asunto/texto/html son plantillas; `variables` trae los reemplazos de
+    este destinatario, así varios correos iguales salen en un solo envío.
+    No viene de sqlacodegen; se crea al iniciar la app si no existe.
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        PrimaryKeyConstraint('id_email', name='email_outbox_pkey'),
+        Index('ix_email_outbox_estado_proximo', 'estado', 'proximo_intento'),
+    )
+
+    id_email = mapped_column(Integer, Identity(start=1, increment=1))
+    destinatario = mapped_column(String(255), nullable=False)
+    asunto = mapped_column(String(255), nullable=False)
+    texto = mapped_column(Text, nullable=False)
+    html = mapped_column(Text)
+    variables = mapped_column(JSON)
+    estado = mapped_column(String(20), nullable=False, server_default=text("'pendiente'"))
+    intentos = mapped_column(Integer, nullable=False, server_default=text('0'))
+    # Próximo envío posible: backoff tras un error o lease mientras se envía
+    proximo_intento = mapped_column(DateTime(True), nullable=False)
+    ultimo_error = mapped_column(Text)
+    creado = mapped_column(DateTime(True), nullable=False)
+    enviado = mapped_column(DateTime(True))
@@ -0,0 +1,22 @@
+from sqlalchemy import DateTime, Integer, PrimaryKeyConstraint, String, text
+from sqlalchemy.orm import mapped_column
+
+from app.models.generated import Base
+
+
+class VersionLista(Base):
+    """
+    Versión de una tabla de catálogo por empresa (id_empresa = 0 para los
+    catálogos globales). Se incrementa en la misma transacción que la
+    escritura y alimenta los ETag de los endpoints /list.
+    No viene de sqlacodegen; se crea al iniciar la app si no existe.
+    """
+    __tablename__ = 'version_lista'
+    __table_args__ = (
+        PrimaryKeyConstraint('tabla', 'id_empresa', name='version_lista_pkey'),
+    )
+
+    tabla = mapped_column(String(60))
+    id_empresa = mapped_column(Integer)
+    version = mapped_column(Integer, nullable=False, server_default=text('1'))
+    actualizado = mapped_column(DateTime(True), nullable=False)
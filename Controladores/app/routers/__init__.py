@@ -6,6 +6,9 @@ from . import workers
 from . import nacionalidad
 from . import contrato
 from . import clausulas
+from . import internal
+from . import jobs
+from . import metrics
 
 routers = [
     #afps.router,
@@ -25,5 +28,8 @@ routers = [
     workers.router,
     nacionalidad.router,
     contrato.router,
-    clausulas.router
+    clausulas.router,
+    internal.router,
+    jobs.router,
+    metrics.router
 ]
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from hashlib import sha256
 from datetime import timedelta, datetime, timezone
 import secrets
 from jose import jwt, JWTError
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.generated import LoginUsuario, Usuario, Sesiones
 from app.services import auth
+from app.services.token_cache import token_cache
 from app.schemas.login import LoginRequest, LoginResponse
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -19,15 +21,25 @@ templates = Jinja2Templates(directory="app/templates")
 # 1. LOGIN API (JSON)
 # ---------------------------
 @router.post("/login_api", response_model=LoginResponse)
-def login_user(data: LoginRequest, request: Request, db: Session = Depends(get_db)):
-    login_entry = db.query(LoginUsuario).filter(LoginUsuario.correo == data.email).first()
-    if not login_entry or not auth.verify_password(data.password, login_entry.password):
+async def login_user(data: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    login_entry = (await db.execute(
+        select(LoginUsuario).where(LoginUsuario.correo == data.email)
+    )).scalars().first()
+    # bcrypt es CPU-bound: se verifica en el executor dedicado, fuera del event loop
+    if not login_entry:
+        raise HTTPException(status_code=401, detail="Credenciales inválidas")
+    valida, nuevo_hash = await auth.verify_and_rehash_async(data.password, login_entry.password)
+    if not valida:
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
 
     if not login_entry.email_verificado_at:
         raise HTTPException(status_code=403, detail="Correo no verificado")
 
-    usuario = db.query(Usuario).filter(Usuario.id_usuario == login_entry.id_usuario).first()
+    # Hash guardado con un costo anterior: se reemplaza en el mismo commit de la sesión
+    if nuevo_hash:
+        login_entry.password = nuevo_hash
+
+    usuario = await db.get(Usuario, login_entry.id_usuario) if login_entry.id_usuario else None
     empresa_id = usuario.id_empresa if usuario else None
 
     access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -51,7 +63,7 @@ def login_user(data: LoginRequest, request: Request, db: Session = Depends(get_d
         ip=request.client.host
     )
     db.add(sesion)
-    db.commit()
+    await db.commit()
 
     role_map = {
     1: {"nombre": "admin", "redirect": "../datos_empresa/view_datos_empresa.html"},
@@ -78,15 +90,15 @@ def login_page(request: Request):
     return templates.TemplateResponse("views/Login/view_login.html", {"request": request})
 
 @router.post("/login")
-def login_html(
+async def login_html(
     request: Request,
     email: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         data = LoginRequest(email=email, password=password)
-        api_response = login_user(data=data, request=request, db=db)
+        api_response = await login_user(data=data, request=request, db=db)
 
         resp = RedirectResponse(url="/empresa", status_code=303)
         resp.set_cookie(
@@ -101,7 +113,14 @@ def login_html(
         return RedirectResponse(url="/login", status_code=303)
 
 @router.get("/logout")
-def logout():
+def logout(request: Request):
+    # El token de la cookie deja de aceptarse aunque siga vigente (también
+    # sale de la caché de tokens verificados)
+    token = request.cookies.get("access_token")
+    payload = auth.decode_access_token(token) if token else None
+    if payload:
+        token_cache.revocar_token(token, payload["exp"])
+
     resp = RedirectResponse(url="/login", status_code=303)
     resp.delete_cookie("access_token")
     return resp
@@ -1,33 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from hashlib import sha256
 from datetime import datetime, timedelta, timezone
-from app.database import get_db
-from app.models.generated import Sesiones
+import secrets
+from app.database import get_async_db
+from app.models.generated import LoginUsuario, Usuario, Sesiones
 from app.services import auth
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+
+def _utc(fecha: datetime) -> datetime:
+    # SQLite devuelve fechas sin zona; PostgreSQL (timestamptz) ya vienen en UTC
+    return fecha if fecha.tzinfo else fecha.replace(tzinfo=timezone.utc)
+
+
 @router.post("/refresh")
-def refresh_access_token(refresh_token: str, db: Session = Depends(get_db)):
-    # 1. Buscar sesión por el refresh token
-    sesion = db.query(Sesiones).filter(Sesiones.tokenrefresh_hash == refresh_token).first()
+async def refresh_access_token(refresh_token: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    # 1. Buscar sesión por el hash del refresh token (se guarda igual que en login_user),
+    #    usando el índice único de tokenrefresh_hash. FOR UPDATE bloquea la sesión
+    #    para que dos refresh simultáneos con el mismo token no roten ambos
+    fila = (await db.execute(
+        select(Sesiones, LoginUsuario, Usuario.id_empresa)
+        .join(LoginUsuario, LoginUsuario.id_login == Sesiones.idusuario)
+        .outerjoin(Usuario, Usuario.id_usuario == LoginUsuario.id_usuario)
+        .where(Sesiones.tokenrefresh_hash == sha256(refresh_token.encode()).hexdigest())
+        .with_for_update(of=Sesiones)
+    )).first()
 
-    if not sesion:
+    if not fila:
         raise HTTPException(status_code=401, detail="Refresh token inválido")
+    sesion, login_entry, empresa_id = fila
 
-    # 2. Revisar si está revocado
+    # 2. Revisar si está revocado (incluye tokens ya rotados)
     if sesion.revoked_at is not None:
         raise HTTPException(status_code=401, detail="Refresh token revocado")
 
     # 3. Revisar si expiró
-    if sesion.limite_sesion < datetime.now(timezone.utc):
+    ahora = datetime.now(timezone.utc)
+    if _utc(sesion.limite_sesion) < ahora:
         raise HTTPException(status_code=401, detail="Refresh token expirado")
 
-    # 4. Generar nuevo Access Token
+    # 4. Generar nuevo Access Token con los mismos claims que el login
+    #    (get_current_user necesita empresa_id y rol)
     access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = auth.create_access_token(
-        data={"sub": str(sesion.idusuario)}, 
+        data={
+            "sub": str(login_entry.id_usuario),
+            "empresa_id": str(empresa_id),
+            "rol": str(login_entry.tipo_usuario)
+        },
         expires_delta=access_token_expires
     )
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    # 5. Rotación: el refresh token usado queda revocado y se emite uno nuevo
+    #    con el mismo vencimiento de la sesión, en la misma transacción
+    nuevo_refresh_token = secrets.token_urlsafe(64)
+    sesion.revoked_at = ahora
+    db.add(Sesiones(
+        idusuario=sesion.idusuario,
+        tokenrefresh_hash=sha256(nuevo_refresh_token.encode()).hexdigest(),
+        fecha_sesion=ahora,
+        limite_sesion=sesion.limite_sesion,
+        revoked_at=None,
+        user_agent=request.headers.get("user-agent"),
+        ip=request.client.host
+    ))
+    await db.commit()
+
+    return {"access_token": access_token, "refresh_token": nuevo_refresh_token, "token_type": "bearer"}
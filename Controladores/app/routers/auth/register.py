@@ -1,27 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.generated import Empresa
 from app.models.generated import Usuario
 from app.models.generated import LoginUsuario
-from app.schemas.register import Register
+from app.schemas.register import Register, RegisterBulk, RegisterBulkResponse
 from app.services import auth
+from app.services.dependencies import get_current_user
 import secrets
+from collections import Counter
 from datetime import datetime, timedelta
-from app.services.email_validation import send_verification_email
+from app.services.email_outbox import email_dispatcher
+from app.services.email_validation import queue_verification_email
+from app.services.versiones_lista import EMPRESA_FULL, subir_version
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/register")
-def register_user(data: Register, db: Session = Depends(get_db)):
+async def register_user(data: Register, db: AsyncSession = Depends(get_async_db)):
+    # bcrypt antes de tocar la base: así la sesión no retiene una conexión
+    # del pool mientras se calcula el hash
+    hashed_password = await auth.hash_password_async(data.password)
+
     # 0. Validar que el correo no exista en login_usuario
-    existing = db.query(LoginUsuario).filter(LoginUsuario.correo == data.email).first()
+    existing = (await db.execute(
+        select(LoginUsuario.id_login).where(LoginUsuario.correo == data.email)
+    )).first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El correo ya está registrado"
         )
 
+    # Todo el registro es una sola transacción: flush envía cada INSERT y
+    # trae el id generado (RETURNING) sin commit ni refresh intermedios
+
     # 1. Crear empresa vacía
     nueva_empresa = Empresa(
         id_territorial=None,
@@ -39,8 +53,7 @@ def register_user(data: Register, db: Session = Depends(get_db)):
         correo=""
     )
     db.add(nueva_empresa)
-    db.commit()
-    db.refresh(nueva_empresa)
+    await db.flush()
 
     # 2. Crear usuario ligado a la empresa
     nuevo_usuario = Usuario(
@@ -50,11 +63,9 @@ def register_user(data: Register, db: Session = Depends(get_db)):
         id_empresa=nueva_empresa.id_empresa
     )
     db.add(nuevo_usuario)
-    db.commit()
-    db.refresh(nuevo_usuario)
+    await db.flush()
 
     # 3. Crear login_usuario ligado al usuario
-    hashed_password = auth.get_password_hash(data.password)
     verification_token = secrets.token_hex(32)  # 🔑 token único
     expiry_time = datetime.utcnow() + timedelta(hours=24)  # expira en 24h
 
@@ -68,11 +79,12 @@ def register_user(data: Register, db: Session = Depends(get_db)):
     email_verificacion_hash=verification_token,
     email_verificacion_expira=expiry_time
     )
-    db.add_all([nueva_empresa, nuevo_usuario, login_entry])
-    db.commit()
-    db.refresh(login_entry)
-
-    send_verification_email(login_entry.correo, login_entry.email_verificacion_hash) #enviar correo de verificación
+    db.add(login_entry)
+    # Correo de verificación al outbox en la misma transacción: el request no
+    # espera a SendGrid y el correo no se pierde si el envío falla
+    queue_verification_email(db, data.email, verification_token)
+    await db.commit()
+    email_dispatcher.notificar()
 
     return {
         "msg": "Usuario registrado con éxito",
@@ -80,4 +92,96 @@ def register_user(data: Register, db: Session = Depends(get_db)):
         "usuario_id": nuevo_usuario.id_usuario,
         "login_id": login_entry.id_login,
         "email": login_entry.correo
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/register/bulk", response_model=RegisterBulkResponse, status_code=status.HTTP_201_CREATED)
+async def register_users_bulk(
+    data: RegisterBulk,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Alta masiva de usuarios en la empresa del administrador (p. ej. todo un
+    estudio contable). Todo o nada: un solo commit, INSERT por lotes y un
+    correo de verificación por usuario en el outbox.
+    """
+    if current_user["rol"] != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para crear usuarios"
+        )
+
+    empresa_id = current_user["empresa_id"]
+    correos = [u.email for u in data.usuarios]
+
+    repetidos = sorted(c for c, veces in Counter(correos).items() if veces > 1)
+    if repetidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Correos repetidos en la solicitud: {', '.join(repetidos)}"
+        )
+
+    # Una sola consulta para todos los correos
+    registrados = (await db.execute(
+        select(LoginUsuario.correo).where(LoginUsuario.correo.in_(correos))
+    )).scalars().all()
+    if registrados:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Correos ya registrados: {', '.join(sorted(registrados))}"
+        )
+
+    # Hashes en paralelo, a lo más PASSWORD_HASH_WORKERS a la vez en el executor de bcrypt
+    hashes = await auth.hash_passwords_async([u.password for u in data.usuarios])
+
+    # INSERT ... RETURNING por lotes; sort_by_parameter_order asegura que los
+    # ids vuelvan en el mismo orden que las filas enviadas
+    usuario_ids = (await db.execute(
+        insert(Usuario).returning(Usuario.id_usuario, sort_by_parameter_order=True),
+        [
+            {
+                "nombre": u.name,
+                "apellido_paterno": u.paternal_surname,
+                "apellido_materno": u.maternal_surname,
+                "id_empresa": empresa_id,
+            }
+            for u in data.usuarios
+        ],
+    )).scalars().all()
+
+    tokens = [secrets.token_hex(32) for _ in data.usuarios]
+    expiry_time = datetime.utcnow() + timedelta(hours=24)
+    login_ids = (await db.execute(
+        insert(LoginUsuario).returning(LoginUsuario.id_login, sort_by_parameter_order=True),
+        [
+            {
+                "telefono": "",
+                "correo": u.email,
+                "password": password_hash,
+                "id_usuario": usuario_id,
+                "tipo_usuario": u.rol,
+                "email_verificado_at": None,
+                "email_verificacion_hash": token,
+                "email_verificacion_expira": expiry_time,
+            }
+            for u, password_hash, usuario_id, token in zip(data.usuarios, hashes, usuario_ids, tokens)
+        ],
+    )).scalars().all()
+
+    for u, token in zip(data.usuarios, tokens):
+        queue_verification_email(db, u.email, token)
+    # Los INSERT de Core no pasan por el flush: la versión de /empresa/full se sube a mano
+    await subir_version(db, EMPRESA_FULL, empresa_id)
+    await db.commit()
+    email_dispatcher.notificar()
+
+    return {
+        "msg": "Usuarios registrados con éxito",
+        "empresa_id": empresa_id,
+        "total": len(usuario_ids),
+        "usuarios": [
+            {"usuario_id": usuario_id, "login_id": login_id, "email": u.email}
+            for u, usuario_id, login_id in zip(data.usuarios, usuario_ids, login_ids)
+        ],
+    }
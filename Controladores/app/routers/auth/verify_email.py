@@ -1,17 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
-from app.database import get_db
+from app.database import get_async_db
 from app.models.generated import LoginUsuario
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.get("/verify-email/{token}")
-def verify_email(token: str, db: Session = Depends(get_db)):
+async def verify_email(token: str, db: AsyncSession = Depends(get_async_db)):
     # 1. Buscar usuario con ese token
-    login_entry = db.query(LoginUsuario).filter(
-        LoginUsuario.email_verificacion_hash == token
-    ).first()
+    login_entry = (await db.execute(
+        select(LoginUsuario).where(LoginUsuario.email_verificacion_hash == token)
+    )).scalars().first()
 
     if not login_entry:
         raise HTTPException(
@@ -31,7 +32,7 @@ def verify_email(token: str, db: Session = Depends(get_db)):
     login_entry.email_verificacion_hash = None   # evitar reutilización del token
     login_entry.email_verificacion_expira = None # limpiar expiración
 
-    db.commit()
+    await db.commit()
 
     return {
         "msg": "Correo verificado con éxito ✅",
@@ -1,19 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.generated import Clausulas
 from app.schemas.clausulas import ClausulaCreate, ClausulaResponse
 from app.services.dependencies import get_current_user
+from app.services.versiones_lista import etag_lista, respuesta_condicional
 
 router = APIRouter(prefix="/clausulas", tags=["Clausulas"])
 
 
 @router.post("/create", response_model=ClausulaResponse, status_code=status.HTTP_201_CREATED)
-def create_clausula(
+async def create_clausula(
     clausula_data: ClausulaCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["rol"] not in [1, 2]:
@@ -33,13 +35,13 @@ def create_clausula(
         )
 
         db.add(new_clausula)
-        db.commit()
-        db.refresh(new_clausula)
+        await db.commit()
+        await db.refresh(new_clausula)
 
         return new_clausula
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         if "unique_empresa_titulo" in str(e.orig):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,8 +55,10 @@ def create_clausula(
 
 
 @router.get("/list", response_model=list[ClausulaResponse])
-def list_clausulas(
-    db: Session = Depends(get_db),
+async def list_clausulas(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["rol"] not in [1, 2]:
@@ -64,5 +68,13 @@ def list_clausulas(
         )
 
     empresa_id = current_user["empresa_id"]
-    clausulas = db.query(Clausulas).filter(Clausulas.id_empresa == empresa_id).all()
+
+    # Si el cliente ya tiene esta versión del listado, 304 sin leer las cláusulas
+    no_modificado = respuesta_condicional(request, response, await etag_lista(db, "clausulas", empresa_id))
+    if no_modificado:
+        return no_modificado
+
+    clausulas = (await db.execute(
+        select(Clausulas).where(Clausulas.id_empresa == empresa_id)
+    )).scalars().all()
     return clausulas
@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-import os
 
-from app.database import get_db
-from app.models.generated import Epp, Empresa, Trabajador, DatosTrabajador, Cargo
+from app.database import get_async_db
+from app.models.generated import Epp, Empresa
 from app.schemas.epp import EppCreate, EppResponse
-from app.schemas.pdf_epp import PDFEppRequest, PDFEppResponse
-from app.services.pdf_generator import PDFEppGenerator
+from app.schemas.pdf_epp import PDFEppBatchRequest, PDFEppRequest, PDFEppResponse
+from app.services.documentos import datos_epp, datos_epp_lote
+from app.services.pdf_render import render_pdf
 from app.services.dependencies import get_current_user
+from app.services.zip_stream import iter_zip
+from app.services.versiones_lista import etag_lista, respuesta_condicional
 
 router = APIRouter(prefix="/epp", tags=["EPP"])
 
 
 @router.get("/list", response_model=list[EppResponse])
-def list_epp(
-    db: Session = Depends(get_db),
+async def list_epp(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Verificar que el usuario tenga rol 1 (admin) o 2 (contador)
@@ -29,16 +34,23 @@ def list_epp(
     # Obtener empresa_id de la sesión del usuario
     empresa_id = current_user["empresa_id"]
 
+    # Si el cliente ya tiene esta versión del listado, 304 sin leer los EPP
+    no_modificado = respuesta_condicional(request, response, await etag_lista(db, "epp", empresa_id))
+    if no_modificado:
+        return no_modificado
+
     # Obtener todos los EPP de la empresa
-    epps = db.query(Epp).filter(Epp.id_empresa == empresa_id).all()
+    epps = (await db.execute(
+        select(Epp).where(Epp.id_empresa == empresa_id)
+    )).scalars().all()
 
     return epps
 
 
 @router.post("/create", response_model=EppResponse, status_code=status.HTTP_201_CREATED)
-def create_epp(
+async def create_epp(
     epp_data: EppCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Verificar que el usuario tenga rol 1 (admin) o 2 (contador)
@@ -52,7 +64,7 @@ def create_epp(
     empresa_id = current_user["empresa_id"]
 
     # Verificar que la empresa existe
-    empresa = db.query(Empresa).filter(Empresa.id_empresa == empresa_id).first()
+    empresa = await db.get(Empresa, empresa_id)
     if not empresa:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -67,13 +79,13 @@ def create_epp(
         )
 
         db.add(new_epp)
-        db.commit()
-        db.refresh(new_epp)
+        await db.commit()
+        await db.refresh(new_epp)
 
         return new_epp
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         if "epp_nombre_unique" in str(e.orig):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,9 +109,9 @@ def create_epp(
 
 
 @router.post("/generate-pdf")
-def generate_epp_pdf(
+async def generate_epp_pdf(
     pdf_data: PDFEppRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     # Verificar que el usuario tenga rol 1 (admin) o 2 (contador)
@@ -113,114 +125,68 @@ def generate_epp_pdf(
         # Obtener empresa_id del usuario autenticado
         empresa_id = current_user["empresa_id"]
 
-        # Obtener empresa
-        empresa = db.query(Empresa).filter(Empresa.id_empresa == empresa_id).first()
-        if not empresa:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Empresa no encontrada"
-            )
-
-        # Validar que el RUT contenga solo números
-        if not pdf_data.rut.isdigit():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="El RUT debe contener solo números"
-            )
-
-        # Buscar trabajador por RUT en la empresa con ORM
-        trabajadores = db.query(Trabajador).filter(
-            Trabajador.id_empresa == empresa_id
-        ).all()
-
-        datos_trabajador = None
-        trabajador_obj = None
-
-        for t in trabajadores:
-            datos = db.query(DatosTrabajador).filter(
-                DatosTrabajador.id_trabajador == t.id_trabajador,
-                DatosTrabajador.rut == int(pdf_data.rut)
-            ).first()
-            if datos:
-                trabajador_obj = t
-                datos_trabajador = datos
-                break
-
-        if not datos_trabajador:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Trabajador no encontrado en tu empresa"
-            )
-
-        # Obtener cargo si existe
-        cargo = db.query(Cargo).filter(Cargo.id_cargo == trabajador_obj.id_cargo).first() if trabajador_obj.id_cargo else None
-
-        # Obtener datos del trabajador
-        trabajador_nombre = f"{datos_trabajador.nombre} {datos_trabajador.apellido_paterno} {datos_trabajador.apellido_materno}"
-        trabajador_rut = f"{datos_trabajador.rut}-{datos_trabajador.DV_rut}"
-        trabajador_cargo = cargo.nombre if cargo else ""
+        # Empresa, trabajador y elementos en app/services/documentos.py
+        # (compartido con los jobs en segundo plano)
+        pdf_generator_data = await datos_epp(db, empresa_id, pdf_data)
 
-        # Obtener IDs de los elementos
-        elementos_ids = [e.id_epp for e in pdf_data.elementos]
+        # Generar el PDF en el pool de procesos de renderizado
+        pdf_buffer = await render_pdf("epp", pdf_generator_data)
 
-        # Obtener los elementos EPP por IDs
-        elementos_epp = db.query(Epp).filter(
-            Epp.id_epp.in_(elementos_ids),
-            Epp.id_empresa == empresa_id
-        ).all()
+        # Devolver el PDF como respuesta, sin pasar por disco
+        return StreamingResponse(
+            pdf_buffer,
+            media_type='application/pdf',
+            headers={"Content-Disposition": f'attachment; filename="entrega_epp_{pdf_data.rut}.pdf"'}
+        )
 
-        if len(elementos_epp) != len(elementos_ids):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Algunos elementos EPP no fueron encontrados o no pertenecen a tu empresa"
-            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al generar el PDF: {str(e)}"
+        )
 
-        # Crear diccionario para mapear id_epp a objeto Epp
-        epp_dict = {e.id_epp: e for e in elementos_epp}
-
-        # Construir los datos para el PDF
-        class EppDeliveryItem:
-            def __init__(self, elemento_proteccion: str, cantidad=None, fecha_entrega=None):
-                self.elemento_proteccion = elemento_proteccion
-                self.cantidad = cantidad
-                self.fecha_entrega = fecha_entrega
-
-        class PDFDataForGenerator:
-            pass
-
-        pdf_generator_data = PDFDataForGenerator()
-        pdf_generator_data.nombre = trabajador_nombre
-        pdf_generator_data.rut = trabajador_rut
-        pdf_generator_data.cargo = trabajador_cargo
-        pdf_generator_data.empresa_nombre = empresa.nombre_fantasia
-        pdf_generator_data.empresa_rut = f"{empresa.rut_empresa}-{empresa.DV_rut}"
-        pdf_generator_data.elementos = [
-            EppDeliveryItem(
-                elemento_proteccion=epp_dict[e.id_epp].epp,
-                cantidad=e.cantidad,
-                fecha_entrega=e.fecha_entrega
-            )
-            for e in pdf_data.elementos
-        ]
 
-        # Crear instancia del generador de PDF
-        pdf_generator = PDFEppGenerator()
+@router.post("/generate-pdf-batch")
+async def generate_epp_pdf_batch(
+    pdf_data: PDFEppBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Entrega de los mismos EPP a varios trabajadores (p. ej. una cuadrilla).
+    Resuelve trabajadores y elementos en dos consultas y genera un solo PDF
+    (formato=pdf) o un ZIP con un PDF por trabajador (formato=zip).
+    """
+    if current_user["rol"] not in [1, 2]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para generar PDF de EPP"
+        )
 
-        # Generar el PDF
-        pdf_path = pdf_generator.generate_pdf(pdf_generator_data)
+    try:
+        empresa_id = current_user["empresa_id"]
 
-        # Verificar que el archivo se creó correctamente
-        if not os.path.exists(pdf_path):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error al generar el PDF"
+        # Empresa, trabajador y elementos en app/services/documentos.py
+        # (compartido con los jobs en segundo plano)
+        ruts, lote = await datos_epp_lote(db, empresa_id, pdf_data)
+
+        # Un único trabajo en el pool de renderizado, con un solo generador
+        if pdf_data.formato == "zip":
+            pdfs = await render_pdf("epp_lote_separado", lote)
+            archivos = ((f"entrega_epp_{rut}.pdf", pdf) for rut, pdf in zip(ruts, pdfs))
+            return StreamingResponse(
+                iter_zip(archivos),
+                media_type='application/zip',
+                headers={"Content-Disposition": 'attachment; filename="entrega_epp_lote.zip"'}
             )
 
-        # Devolver el archivo PDF como respuesta
-        return FileResponse(
-            path=pdf_path,
+        pdf_buffer = await render_pdf("epp_lote", lote)
+        return StreamingResponse(
+            pdf_buffer,
             media_type='application/pdf',
-            filename=f"entrega_epp_{pdf_data.rut}.pdf"
+            headers={"Content-Disposition": 'attachment; filename="entrega_epp_lote.pdf"'}
         )
 
     except HTTPException:
@@ -229,4 +195,4 @@ def generate_epp_pdf(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al generar el PDF: {str(e)}"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.database import engine, async_engine
+from app.services.dependencies import get_current_user
+from app.services.empresa_cache import empresa_full_cache
+from app.services.pdf_cache import pdf_cache
+from app.services.pdf_render import pdf_render_service
+from app.services.pool_metrics import pool_status
+from app.services.token_cache import token_cache
+
+router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+@router.get("/db-pool")
+def db_pool_status(current_user: dict = Depends(get_current_user)):
+    """
+    Estado de los pools de conexiones (sync y async): conexiones en uso,
+    libres, overflow y tiempos de espera de checkout.
+    """
+    if current_user["rol"] != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para ver el estado de la base de datos"
+        )
+
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine.sync_engine),
+    }
+
+
+@router.get("/pdf-render")
+def pdf_render_status(current_user: dict = Depends(get_current_user)):
+    """
+    Estado del pool de procesos que genera los PDF: workers, profundidad
+    de cola y documentos en curso.
+    """
+    if current_user["rol"] != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para ver el estado del renderizado"
+        )
+
+    return pdf_render_service.status()
+
+
+@router.get("/pdf-cache")
+def pdf_cache_status(current_user: dict = Depends(get_current_user)):
+    """
+    Caché de documentos generados: aciertos en memoria y disco, fallos,
+    desalojos y ocupación de cada nivel.
+    """
+    if current_user["rol"] != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para ver el estado de la caché"
+        )
+
+    return pdf_cache.status()
+
+
+@router.get("/auth-cache")
+def auth_cache_status(current_user: dict = Depends(get_current_user)):
+    """
+    Caché de tokens verificados: entradas, aciertos, fallos y revocaciones
+    registradas en este proceso.
+    """
+    if current_user["rol"] != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para ver el estado de la caché"
+        )
+
+    return token_cache.status()
+
+
+@router.get("/empresa-cache")
+def empresa_cache_status(current_user: dict = Depends(get_current_user)):
+    """
+    Caché de GET /empresa/full: empresas guardadas, bytes y aciertos.
+    """
+    if current_user["rol"] != 1:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para ver el estado de la caché"
+        )
+
+    return empresa_full_cache.status()
@@ -0,0 +1,107 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.jobs import JOB_COMPLETADO, Job
+from app.schemas.jobs import JobResponse
+from app.services.dependencies import get_current_user
+from app.services.jobs import TIPOS_JOB, encolar_job
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id_job,
+        kind=job.kind,
+        estado=job.estado,
+        intentos=job.intentos,
+        error=job.error,
+        creado=job.creado,
+        iniciado=job.iniciado,
+        terminado=job.terminado,
+        status_url=router.url_path_for("get_job", job_id=job.id_job),
+        result_url=router.url_path_for("get_job_result", job_id=job.id_job) if job.estado == JOB_COMPLETADO else None,
+    )
+
+
+async def _get_job_empresa(db: AsyncSession, job_id: str, current_user: dict) -> Job:
+    job = await db.get(Job, job_id)
+    # Un job de otra empresa se responde igual que uno inexistente
+    if not job or job.id_empresa != current_user["empresa_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job no encontrado"
+        )
+    return job
+
+
+@router.post("/{kind}", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    kind: str,
+    payload: dict = Body(default_factory=dict),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Encola la generación de un documento y responde de inmediato con el id.
+    `kind`: epp, epp_lote, odi, contrato, termino_contrato o listado_contratos;
+    el cuerpo es el mismo que el del endpoint síncrono correspondiente.
+    """
+    if current_user["rol"] not in [1, 2]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para generar documentos"
+        )
+
+    tipo = TIPOS_JOB.get(kind)
+    if tipo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tipo de job desconocido: {kind}. Disponibles: {', '.join(TIPOS_JOB)}"
+        )
+
+    # Se valida antes de encolar para que un cuerpo inválido no llegue al worker
+    try:
+        datos = tipo.schema.model_validate(payload)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False)
+        )
+
+    job = await encolar_job(db, kind, current_user["empresa_id"], current_user["usuario_id"], datos)
+    return _job_response(job)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    job = await _get_job_empresa(db, job_id, current_user)
+    return _job_response(job)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    job = await _get_job_empresa(db, job_id, current_user)
+    if job.estado != JOB_COMPLETADO:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"El job no tiene resultado (estado: {job.estado})"
+        )
+
+    # resultado es una columna diferida: se carga solo aquí
+    await db.refresh(job, ["resultado"])
+    return Response(
+        content=job.resultado,
+        media_type=job.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{job.filename}"'}
+    )
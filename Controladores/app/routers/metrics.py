@@ -0,0 +1,23 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.services.metrics import CONTENT_TYPE, METRICS_TOKEN, registro
+
+router = APIRouter(tags=["Internal"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """
+    Métricas en formato de texto de Prometheus: latencia, requests en curso,
+    sentencias SQL por request y duración de PDF / Excel. Cada proceso
+    (worker de uvicorn) expone las suyas.
+    """
+    # El scraper no tiene JWT: se protege con un token fijo opcional
+    if METRICS_TOKEN:
+        autorizacion = request.headers.get("authorization", "")
+        if not secrets.compare_digest(autorizacion, f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token de métricas inválido")
+
+    return Response(content=registro.exportar(), media_type=CONTENT_TYPE)
@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.generated import Nacionalidad
 from app.schemas.nacionalidad import NacionalidadResponse
 from app.services.dependencies import get_current_user
+from app.services.versiones_lista import etag_lista, respuesta_condicional
 
 router = APIRouter(prefix="/nacionalidad", tags=["Nacionalidad"])
 
 
 @router.get("/list", response_model=list[NacionalidadResponse])
-def list_nacionalidades(
-    db: Session = Depends(get_db),
+async def list_nacionalidades(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
-    nacionalidades = db.query(Nacionalidad).all()
+    # Catálogo global: una sola versión para todas las empresas
+    no_modificado = respuesta_condicional(request, response, await etag_lista(db, "nacionalidad"))
+    if no_modificado:
+        return no_modificado
+
+    nacionalidades = (await db.execute(select(Nacionalidad))).scalars().all()
     return nacionalidades
@@ -1,21 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-import os
 
-from app.database import get_db
-from app.models.generated import Odi, Empresa
+from app.database import get_async_db
+from app.models.generated import Odi
 from app.schemas.odi import OdiCreate, OdiResponse 
 from app.schemas.pdf_odi import PDFOdiRequest, PDFOdiResponse
-from app.services.pdf_generator import PDFOdiGenerator
+from app.services.documentos import datos_odi
+from app.services.pdf_render import render_pdf
 from app.services.dependencies import get_current_user
+from app.services.versiones_lista import etag_lista, respuesta_condicional
 
 router = APIRouter(prefix="/odi", tags=["ODI"])
 
 
 @router.post("/create", response_model=OdiResponse, status_code=status.HTTP_201_CREATED)
-def create_odi(odi_data: OdiCreate, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def create_odi(odi_data: OdiCreate, db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(get_current_user)):
 
     if current_user["rol"] not in [1, 2]:
         raise HTTPException(
@@ -32,13 +34,13 @@ def create_odi(odi_data: OdiCreate, db: Session = Depends(get_db), current_user:
         )
         
         db.add(new_odi)
-        db.commit()
-        db.refresh(new_odi)
+        await db.commit()
+        await db.refresh(new_odi)
         
         return new_odi 
     
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         if "odi_tarea_unique" in str(e.orig):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -52,7 +54,7 @@ def create_odi(odi_data: OdiCreate, db: Session = Depends(get_db), current_user:
 
 
 @router.post("/generate-pdf")
-def generate_odi_pdf(pdf_data: PDFOdiRequest, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def generate_odi_pdf(pdf_data: PDFOdiRequest, db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(get_current_user)):
 
     if current_user["rol"] not in [1, 2]:
         raise HTTPException(
@@ -63,69 +65,23 @@ def generate_odi_pdf(pdf_data: PDFOdiRequest, db: Session = Depends(get_db), cur
         # Obtener empresa_id del usuario autenticado
         empresa_id = current_user["empresa_id"]
 
-        # Obtener empresa
-        empresa = db.query(Empresa).filter(Empresa.id_empresa == empresa_id).first()
-        if not empresa:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Empresa no encontrada"
-            )
-
-        # Obtener los elementos ODI por IDs
-        elementos = db.query(Odi).filter(
-            Odi.id_odi.in_(pdf_data.elementos),
-            Odi.id_empresa == empresa_id
-        ).all()
-        if len(elementos) != len(pdf_data.elementos):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Algunos elementos ODI no fueron encontrados"
-            )
-        print("HOLLAAAAAA")
-        print(elementos)
-
-        print(elementos[0].tarea)
-
-        # Construir los datos para el PDF
-        class OdiRow:
-            def __init__(self, tarea: str, riesgo: str, consecuencias: str, precaucion: str):
-                self.tarea = tarea
-                self.riesgo =  riesgo 
-                self.consecuencias = consecuencias
-                self.precaucion = precaucion
-
-
-        class PDFDataForGenerator:
-            pass
+        # Empresa, trabajador y elementos en app/services/documentos.py
+        # (compartido con los jobs en segundo plano)
+        pdf_generator_data = await datos_odi(db, empresa_id, pdf_data)
 
-        pdf_generator_data = PDFDataForGenerator()
-        pdf_generator_data.nombre = pdf_data.nombre
-        pdf_generator_data.rut = pdf_data.rut
-        pdf_generator_data.cargo = pdf_data.cargo
-        pdf_generator_data.empresa_nombre = empresa.nombre_fantasia
-        pdf_generator_data.empresa_rut = f"{empresa.rut_empresa}-{empresa.DV_rut}"
-        pdf_generator_data.elementos = [OdiRow(tarea=e.tarea, riesgo=e.riesgo, consecuencias=e.consecuencias, precaucion=e.precaucion) for e in elementos]
+        # Generar el PDF en el pool de procesos de renderizado (un ODI largo
+        # ya no compite por el GIL con el resto de la API)
+        pdf_buffer = await render_pdf("odi", pdf_generator_data)
 
-        # Crear instancia del generador de PDF
-        pdf_generator = PDFOdiGenerator()
-
-        # Generar el PDF
-        pdf_path = pdf_generator.generate_pdf(pdf_generator_data)
-
-        # Verificar que el archivo se creó correctamente
-        if not os.path.exists(pdf_path):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error al generar el PDF"
-            )
-
-        # Devolver el archivo PDF como respuesta
-        return FileResponse(
-            path=pdf_path,
+        # Devolver el PDF como respuesta, sin pasar por disco
+        return StreamingResponse(
+            pdf_buffer,
             media_type='application/pdf',
-            filename=f"entrega_odi_{pdf_data.rut}.pdf"
+            headers={"Content-Disposition": f'attachment; filename="entrega_odi_{pdf_data.rut}.pdf"'}
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -133,8 +89,10 @@ def generate_odi_pdf(pdf_data: PDFOdiRequest, db: Session = Depends(get_db), cur
         )
 
 @router.get("/list", response_model=list[OdiResponse])
-def list_odi(
-    db: Session = Depends(get_db),
+async def list_odi(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["rol"] not in [1, 2]:
@@ -144,11 +102,19 @@ def list_odi(
         )
     
     empresa_id = current_user["empresa_id"]
-    odis = db.query(Odi).filter(Odi.id_empresa == empresa_id).all()
+
+    # Si el cliente ya tiene esta versión del listado, 304 sin leer los ODI
+    no_modificado = respuesta_condicional(request, response, await etag_lista(db, "odi", empresa_id))
+    if no_modificado:
+        return no_modificado
+
+    odis = (await db.execute(
+        select(Odi).where(Odi.id_empresa == empresa_id)
+    )).scalars().all()
     return odis
 
 @router.delete("/delete/{id_odi}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_odi(id_odi: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+async def delete_odi(id_odi: int, db: AsyncSession = Depends(get_async_db), current_user: dict = Depends(get_current_user)):
 
     if current_user["rol"] not in [1, 2]:
         raise HTTPException(
@@ -158,10 +124,12 @@ def delete_odi(id_odi: int, db: Session = Depends(get_db), current_user: dict =
  
     empresa_id = current_user["empresa_id"]
 
-    odi = db.query(Odi).filter(Odi.id_odi == id_odi, Odi.id_empresa == empresa_id).first()
+    odi = (await db.execute(
+        select(Odi).where(Odi.id_odi == id_odi, Odi.id_empresa == empresa_id)
+    )).scalars().first()
     if not odi:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ODI no encontrado")
 
-    db.delete(odi)
-    db.commit()
+    await db.delete(odi)
+    await db.commit()
     return None
\ No newline at end of file
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.orm import joinedload
-from app.database import get_db
+from sqlalchemy.orm import joinedload, selectinload
+from app.database import get_async_db, get_db
 from app.models.generated import Empresa, EmpresaSocio, EmpresaSeguridad, EmpresaTipo, Usuario
 from app.schemas.register_company import EmpresaUpdateRequest, EmpresaFullResponse
 from app.services.dependencies import get_current_user
+from app.services.empresa_cache import empresa_full_cache
+from app.services.versiones_lista import EMPRESA_FULL, etag_lista, respuesta_condicional
 router = APIRouter(prefix="/empresa", tags=["empresa"])
 
 @router.put("/{empresa_id}")
@@ -33,33 +37,51 @@ def actualizar_empresa(empresa_id: int, data: EmpresaUpdateRequest, db: Session
     }
 
 
+def _opciones_empresa_full():
+    # joinedload solo para relaciones a-uno (no multiplican filas); cada
+    # colección va en su propio SELECT ... IN con selectinload, así socios ×
+    # pagos × representantes × usuarios × logins no se combinan en un producto
+    return (
+        joinedload(Empresa.territorial),
+        joinedload(Empresa.empresa_parametros),
+        joinedload(Empresa.empresa_seguridad).joinedload(EmpresaSeguridad.caja_compensaciones),
+        joinedload(Empresa.empresa_seguridad).joinedload(EmpresaSeguridad.mutual_seguridad),
+        joinedload(Empresa.empresa_tipo).joinedload(EmpresaTipo.regimen_tributario),
+        joinedload(Empresa.empresa_tipo).joinedload(EmpresaTipo.tipo_actividad),
+        joinedload(Empresa.empresa_tipo).joinedload(EmpresaTipo.tipo_sociedad),
+        selectinload(Empresa.empresa_socio).selectinload(EmpresaSocio.pago_acciones),
+        selectinload(Empresa.empresa_representante),
+        selectinload(Empresa.usuario).joinedload(Usuario.territorial),
+        selectinload(Empresa.usuario).selectinload(Usuario.login_usuario),
+    )
+
+
 @router.get("/full", response_model=EmpresaFullResponse)
-def obtener_empresa(
-    db: Session = Depends(get_db),
+async def obtener_empresa(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user)   # 👈 empresa_id viene del token
     ):
-    empresa = (
-        db.query(Empresa)
-        .options(
-            joinedload(Empresa.territorial),
-            joinedload(Empresa.empresa_socio),
-            joinedload(Empresa.empresa_socio).joinedload(EmpresaSocio.pago_acciones),
-            joinedload(Empresa.empresa_parametros),
-            joinedload(Empresa.empresa_representante),
-            joinedload(Empresa.empresa_seguridad),
-            joinedload(Empresa.empresa_seguridad).joinedload(EmpresaSeguridad.caja_compensaciones),
-            joinedload(Empresa.empresa_seguridad).joinedload(EmpresaSeguridad.mutual_seguridad),
-            joinedload(Empresa.empresa_tipo),
-            joinedload(Empresa.empresa_tipo).joinedload(EmpresaTipo.regimen_tributario),
-            joinedload(Empresa.empresa_tipo).joinedload(EmpresaTipo.tipo_actividad),
-            joinedload(Empresa.empresa_tipo).joinedload(EmpresaTipo.tipo_sociedad),
-            joinedload(Empresa.usuario),
-            joinedload(Empresa.usuario).joinedload(Usuario.territorial),
-            joinedload(Empresa.usuario).joinedload(Usuario.login_usuario),
-        )
-        .filter(Empresa.id_empresa == user["empresa_id"])
-        .first()
-    )
-    if not empresa:
-        raise HTTPException(status_code=404, detail="Empresa no encontrada")
-    return empresa
\ No newline at end of file
+    empresa_id = user["empresa_id"]
+
+    # La versión de la empresa sube con cualquier cambio en sus tablas
+    # (versiones_lista): sirve de ETag y de clave de la caché
+    etag = await etag_lista(db, EMPRESA_FULL, empresa_id)
+    no_modificado = respuesta_condicional(request, response, etag)
+    if no_modificado:
+        return no_modificado
+
+    cuerpo = empresa_full_cache.get(empresa_id, etag)
+    if cuerpo is None:
+        empresa = (await db.execute(
+            select(Empresa)
+            .options(*_opciones_empresa_full())
+            .where(Empresa.id_empresa == empresa_id)
+        )).unique().scalar_one_or_none()
+        if not empresa:
+            raise HTTPException(status_code=404, detail="Empresa no encontrada")
+        cuerpo = EmpresaFullResponse.model_validate(empresa).model_dump_json().encode()
+        empresa_full_cache.put(empresa_id, etag, cuerpo)
+
+    return Response(content=cuerpo, media_type="application/json", headers=dict(response.headers))
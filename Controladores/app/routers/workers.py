@@ -1,28 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional, List
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.generated import DatosTrabajador, Trabajador, Cargo, Territorial, Salud,Afp
 from app.services.dependencies import get_current_user
-from app.schemas.workers import TrabajadorCreate, TrabajadorResponse
+from app.services.trabajadores import find_trabajador_by_rut
+from app.services.worker_search import buscar_trabajadores_fuzzy, invalidar_indice
+from app.services.importacion_trabajadores import ArchivoInvalido, importar_trabajadores
+from app.schemas.workers import TrabajadorCreate, TrabajadorImportResponse, TrabajadorResponse
 
 router = APIRouter(prefix="/trabajadores", tags=["Trabajadores"])
 
 
+def _contiene(columna, valor: str):
+    """ILIKE '%valor%' escapando los comodines que vengan en el texto."""
+    escapado = valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return columna.ilike(f"%{escapado}%", escape="\\")
+
+
+def _trabajador_dict(datos: DatosTrabajador, cargo_obj: Optional[Cargo], afp: Optional[Afp], salud: Optional[Salud]) -> dict:
+    return {
+        "id_trabajador": datos.id_trabajador,
+        "nombre": datos.nombre,
+        "apellido_paterno": datos.apellido_paterno,
+        "apellido_materno": datos.apellido_materno,
+        "rut": f"{datos.rut}-{datos.DV_rut}",
+        "fecha_nacimiento": datos.fecha_nacimiento,
+        "nacionalidad": datos.nacionalidad,
+        "direccion_real": datos.direccion_real,
+        "cargo": {
+            "id_cargo": cargo_obj.id_cargo,
+            "nombre": cargo_obj.nombre
+        } if cargo_obj else None,
+        "afp": {
+            "id_afp": afp.id_afp,
+            "nombre": afp.nombre
+        } if afp else None,
+        "salud": {
+            "id_salud": salud.id_salud,
+            "nombre": salud.nombre
+        } if salud else None
+    }
+
+
 @router.get("/search")
-def search_trabajadores(
+async def search_trabajadores(
     nombre: Optional[str] = Query(None, description="Nombre del trabajador"),
     apellido_paterno: Optional[str] = Query(None, description="Apellido paterno del trabajador"),
     apellido_materno: Optional[str] = Query(None, description="Apellido materno del trabajador"),
     cargo: Optional[str] = Query(None, description="Nombre del cargo"),
-    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=500, description="Cantidad máxima de resultados"),
+    after_id: Optional[int] = Query(None, description="id_trabajador del último resultado de la página anterior"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Busca trabajadores por nombre, apellidos y/o cargo.
     Puede recibir 1, 2, 3 o los 4 parametros.
+    Paginación por keyset: enviar `after_id` = `next_after_id` de la respuesta anterior.
     """
     # Verificar que el usuario tenga rol 1 (admin) o 2 (contador)
     if current_user["rol"] not in [1, 2]:
@@ -34,59 +71,81 @@ def search_trabajadores(
     # Obtener empresa_id del usuario autenticado
     empresa_id = current_user["empresa_id"]
 
-    # Buscar trabajadores con ORM
-    trabajadores_query = db.execute(
-        select(Trabajador).where(
-            Trabajador.id_empresa == empresa_id
+    # Una sola consulta: DatosTrabajador ya incluye trabajador (herencia joined)
+    # y cargo/afp/salud se resuelven con outer joins
+    query = (
+        select(DatosTrabajador, Cargo, Afp, Salud)
+        .outerjoin(Cargo, Cargo.id_cargo == DatosTrabajador.id_cargo)
+        .outerjoin(Afp, Afp.id_afp == DatosTrabajador.id_afp)
+        .outerjoin(Salud, Salud.id_salud == DatosTrabajador.id_salud)
+        .where(DatosTrabajador.id_empresa == empresa_id)
+    )
+
+    # Filtros opcionales en SQL
+    if nombre:
+        query = query.where(_contiene(DatosTrabajador.nombre, nombre))
+    if apellido_paterno:
+        query = query.where(_contiene(DatosTrabajador.apellido_paterno, apellido_paterno))
+    if apellido_materno:
+        query = query.where(_contiene(DatosTrabajador.apellido_materno, apellido_materno))
+    if cargo:
+        query = query.where(_contiene(Cargo.nombre, cargo))
+    if after_id is not None:
+        query = query.where(DatosTrabajador.id_trabajador > after_id)
+
+    query = query.order_by(DatosTrabajador.id_trabajador).limit(limit)
+
+    rows = (await db.execute(query)).all()
+    trabajadores = [_trabajador_dict(datos, cargo_obj, afp, salud) for datos, cargo_obj, afp, salud in rows]
+
+    return {
+        "total": len(trabajadores),
+        "trabajadores": trabajadores,
+        # None cuando no hay más páginas
+        "next_after_id": trabajadores[-1]["id_trabajador"] if len(trabajadores) == limit else None
+    }
+
+
+@router.get("/search/fuzzy")
+async def search_trabajadores_fuzzy(
+    q: str = Query(..., min_length=2, description="Nombre, apellido, prefijo de RUT o cargo (tolera tildes y errores)"),
+    limit: int = Query(10, ge=1, le=100, description="Cantidad máxima de resultados"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Búsqueda difusa y ordenada por relevancia: "Gonzalez" encuentra "González".
+    Cada resultado incluye su `score` (0 a 1).
+    """
+    if current_user["rol"] not in [1, 2]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para buscar trabajadores"
         )
-    ).scalars().all()
 
-    trabajadores = []
-    for t in trabajadores_query:
-        datos = db.query(DatosTrabajador).filter(
-            DatosTrabajador.id_trabajador == t.id_trabajador
-        ).first()
-
-        if datos:
-            # Aplicar filtros opcionales
-            if nombre and nombre.lower() not in datos.nombre.lower():
-                continue
-            if apellido_paterno and apellido_paterno.lower() not in datos.apellido_paterno.lower():
-                continue
-            if apellido_materno and apellido_materno.lower() not in datos.apellido_materno.lower():
-                continue
-
-            cargo_obj = db.query(Cargo).filter(Cargo.id_cargo == t.id_cargo).first() if t.id_cargo else None
-
-            # Filtro de cargo
-            if cargo and (not cargo_obj or cargo.lower() not in cargo_obj.nombre.lower()):
-                continue
-
-            afp = db.query(Afp).filter(Afp.id_afp == t.id_afp).first() if t.id_afp else None
-            salud = db.query(Salud).filter(Salud.id_salud == t.id_salud).first() if t.id_salud else None
-
-            trabajadores.append({
-                "id_trabajador": datos.id_trabajador,
-                "nombre": datos.nombre,
-                "apellido_paterno": datos.apellido_paterno,
-                "apellido_materno": datos.apellido_materno,
-                "rut": f"{datos.rut}-{datos.DV_rut}",
-                "fecha_nacimiento": datos.fecha_nacimiento,
-                "nacionalidad": datos.nacionalidad,
-                "direccion_real": datos.direccion_real,
-                "cargo": {
-                    "id_cargo": cargo_obj.id_cargo,
-                    "nombre": cargo_obj.nombre
-                } if cargo_obj else None,
-                "afp": {
-                    "id_afp": afp.id_afp,
-                    "nombre": afp.nombre
-                } if afp else None,
-                "salud": {
-                    "id_salud": salud.id_salud,
-                    "nombre": salud.nombre
-                } if salud else None
-            })
+    empresa_id = current_user["empresa_id"]
+
+    resultados = await buscar_trabajadores_fuzzy(db, empresa_id, q, limit)
+    if not resultados:
+        return {"total": 0, "trabajadores": []}
+
+    scores = dict(resultados)
+    rows = (await db.execute(
+        select(DatosTrabajador, Cargo, Afp, Salud)
+        .outerjoin(Cargo, Cargo.id_cargo == DatosTrabajador.id_cargo)
+        .outerjoin(Afp, Afp.id_afp == DatosTrabajador.id_afp)
+        .outerjoin(Salud, Salud.id_salud == DatosTrabajador.id_salud)
+        .where(
+            DatosTrabajador.id_empresa == empresa_id,
+            DatosTrabajador.id_trabajador.in_(list(scores))
+        )
+    )).all()
+
+    trabajadores = [
+        {**_trabajador_dict(datos, cargo_obj, afp, salud), "score": scores[datos.id_trabajador]}
+        for datos, cargo_obj, afp, salud in rows
+    ]
+    trabajadores.sort(key=lambda t: (-t["score"], t["id_trabajador"]))
 
     return {
         "total": len(trabajadores),
@@ -95,9 +154,9 @@ def search_trabajadores(
 
 
 @router.get("/search-by-rut")
-def search_trabajadores_by_rut(
+async def search_trabajadores_by_rut(
     rut: str = Query(..., description="RUT del trabajador (sin digito verificador)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -120,58 +179,57 @@ def search_trabajadores_by_rut(
             detail="El RUT debe contener solo numeros"
         )
 
-    # Buscar trabajador con ORM
-    trabajador = db.execute(
-        select(Trabajador).where(
-            Trabajador.id_empresa == empresa_id
-        )
-    ).scalars().all()
+    # Buscar trabajador por RUT (una sola consulta indexada)
+    encontrado = await find_trabajador_by_rut(db, empresa_id, int(rut))
 
-    # Filtrar por RUT en datos_trabajador
     trabajadores = []
-    for t in trabajador:
-        datos = db.query(DatosTrabajador).filter(
-            DatosTrabajador.id_trabajador == t.id_trabajador,
-            DatosTrabajador.rut == int(rut)
-        ).first()
-
-        if datos:
-            cargo = db.query(Cargo).filter(Cargo.id_cargo == t.id_cargo).first() if t.id_cargo else None
-            afp = db.query(Afp).filter(Afp.id_afp == t.id_afp).first() if t.id_afp else None
-            salud = db.query(Salud).filter(Salud.id_salud == t.id_salud).first() if t.id_salud else None
-
-            trabajadores.append({
-                "id_trabajador": datos.id_trabajador,
-                "nombre": datos.nombre,
-                "apellido_paterno": datos.apellido_paterno,
-                "apellido_materno": datos.apellido_materno,
-                "rut": f"{datos.rut}-{datos.DV_rut}",
-                "fecha_nacimiento": datos.fecha_nacimiento,
-                "nacionalidad": datos.nacionalidad,
-                "direccion_real": datos.direccion_real,
-                "cargo": {
-                    "id_cargo": cargo.id_cargo,
-                    "nombre": cargo.nombre
-                } if cargo else None,
-                "afp": {
-                    "id_afp": afp.id_afp,
-                    "nombre": afp.nombre
-                } if afp else None,
-                "salud": {
-                    "id_salud": salud.id_salud,
-                    "nombre": salud.nombre
-                } if salud else None
-            })
+    if encontrado:
+        trabajadores.append(_trabajador_dict(encontrado.datos, encontrado.cargo, encontrado.afp, encontrado.salud))
 
     return {
         "total": len(trabajadores),
         "trabajadores": trabajadores
     }
 
+@router.post("/import", response_model=TrabajadorImportResponse)
+async def import_trabajadores(
+    archivo: UploadFile = File(..., description="Planilla .xlsx o .csv con una fila por trabajador"),
+    dry_run: bool = Query(False, description="Solo validar, sin insertar"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Importa trabajadores desde una planilla (mismas columnas que POST /trabajadores/:
+    cargo, afp, salud, region, comuna, nombre, apellidos, fecha_nacimiento, rut,
+    DV_rut, nacionalidad, direccion). Las filas válidas se insertan en una sola
+    transacción; las inválidas se informan en `errores` con su número de fila.
+    """
+    if current_user["rol"] not in [1, 2]:
+        raise HTTPException(status_code=403, detail="No tienes permisos")
+
+    empresa_id = current_user["empresa_id"]
+
+    try:
+        resultado = await importar_trabajadores(db, empresa_id, archivo.file, archivo.filename, dry_run)
+    except ArchivoInvalido as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if resultado.insertados and not dry_run:
+        await db.commit()
+        invalidar_indice(empresa_id)
+
+    return {
+        "total": resultado.total,
+        "insertados": resultado.insertados,
+        "dry_run": dry_run,
+        "errores": resultado.errores
+    }
+
+
 @router.post("/", response_model=TrabajadorResponse, status_code=status.HTTP_201_CREATED)
-def create_trabajador(
+async def create_trabajador(
     trabajador: TrabajadorCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -187,31 +245,31 @@ def create_trabajador(
     # ------------------------
     id_cargo = None
     if trabajador.cargo:
-        cargo = db.execute(select(Cargo).where(
+        cargo = (await db.execute(select(Cargo).where(
             Cargo.id_empresa == empresa_id,
             Cargo.nombre.ilike(trabajador.cargo)
-        )).scalar_one_or_none()
+        ))).scalar_one_or_none()
         if not cargo:
             raise HTTPException(404, f"Cargo '{trabajador.cargo}' no encontrado")
         id_cargo = cargo.id_cargo
 
-    afp = db.execute(select(Afp).where(Afp.nombre.ilike(trabajador.afp))).scalar_one_or_none()
+    afp = (await db.execute(select(Afp).where(Afp.nombre.ilike(trabajador.afp)))).scalar_one_or_none()
     if not afp:
         raise HTTPException(404, f"AFP '{trabajador.afp}' no encontrada")
 
     id_salud = None
     if trabajador.salud:
-        salud = db.execute(select(Salud).where(Salud.nombre.ilike(trabajador.salud))).scalar_one_or_none()
+        salud = (await db.execute(select(Salud).where(Salud.nombre.ilike(trabajador.salud)))).scalar_one_or_none()
         if not salud:
             raise HTTPException(404, f"Salud '{trabajador.salud}' no encontrada")
         id_salud = salud.id_salud
 
-    territorial = db.execute(
+    territorial = (await db.execute(
     select(Territorial).where(
         Territorial.region.ilike(trabajador.region),
         Territorial.comuna.ilike(trabajador.comuna)
     )
-    ).scalar_one_or_none()
+    )).scalar_one_or_none()
 
     if not territorial:
         raise HTTPException(404, f"Territorial '{trabajador.region} - {trabajador.comuna}' no encontrado")
@@ -228,7 +286,7 @@ def create_trabajador(
         id_salud=id_salud,
     )
     db.add(nuevo_trabajador)
-    db.flush()
+    await db.flush()
 
     datos = DatosTrabajador(
         id_trabajador=nuevo_trabajador.id_trabajador,
@@ -242,7 +300,9 @@ def create_trabajador(
         direccion_real=trabajador.direccion_real,
     )
     db.add(datos)
-    db.commit()
-    db.refresh(nuevo_trabajador)
+    await db.commit()
+    invalidar_indice(empresa_id)
+    # Cargar las relaciones de la respuesta (en async no hay lazy load)
+    await db.refresh(nuevo_trabajador, attribute_names=["cargo", "afp", "salud"])
 
     return nuevo_trabajador
\ No newline at end of file
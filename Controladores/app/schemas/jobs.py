@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ListadoContratosJobRequest(BaseModel):
+    """El listado de contratos no recibe parámetros: usa la empresa del usuario."""
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    estado: str
+    intentos: int
+    error: Optional[str] = None
+    creado: datetime
+    iniciado: Optional[datetime] = None
+    terminado: Optional[datetime] = None
+    status_url: str
+    result_url: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import date
 
 
@@ -14,6 +14,12 @@ class PDFEppRequest(BaseModel):
     elementos: List[EppElemento]
 
 
+class PDFEppBatchRequest(BaseModel):
+    ruts: List[str] = Field(..., min_length=1, max_length=500, description="RUT (sin DV) de cada trabajador")
+    elementos: List[EppElemento] = Field(..., min_length=1)
+    formato: Literal["pdf", "zip"] = Field("pdf", description="pdf: un solo documento; zip: un PDF por trabajador")
+
+
 class PDFEppResponse(BaseModel):
     message: str
     pdf_path: str
\ No newline at end of file
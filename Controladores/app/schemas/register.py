@@ -1,5 +1,18 @@
+from typing import List, Literal
+
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
+
+def validar_password_segura(v: str) -> str:
+    if not any(c.isupper() for c in v):
+        raise ValueError("La contraseña debe tener al menos una mayúscula")
+    if not any(c.islower() for c in v):
+        raise ValueError("La contraseña debe tener al menos una minúscula")
+    if not any(c.isdigit() for c in v):
+        raise ValueError("La contraseña debe tener al menos un número")
+    return v
+
+
 class Register(BaseModel):
     name: str = Field(..., min_length=2, max_length=50, description="Nombre del usuario")
     paternal_surname: str = Field(..., min_length=2, max_length=50, description="Apellido paterno")
@@ -16,13 +29,7 @@ class Register(BaseModel):
     # Validar password segura
     @field_validator("password")
     def validate_password(cls, v):
-        if not any(c.isupper() for c in v):
-            raise ValueError("La contraseña debe tener al menos una mayúscula")
-        if not any(c.islower() for c in v):
-            raise ValueError("La contraseña debe tener al menos una minúscula")
-        if not any(c.isdigit() for c in v):
-            raise ValueError("La contraseña debe tener al menos un número")
-        return v
+        return validar_password_segura(v)
 
     # Validar que confirm_password coincida con password
     @field_validator("confirm_password")
@@ -31,3 +38,33 @@ class Register(BaseModel):
         if password and v != password:
             raise ValueError("Las contraseñas no coinciden")
         return v
+
+
+class RegisterBulkUser(BaseModel):
+    name: str = Field(..., min_length=2, max_length=50, description="Nombre del usuario")
+    paternal_surname: str = Field(..., min_length=2, max_length=50, description="Apellido paterno")
+    maternal_surname: str = Field(..., min_length=2, max_length=50, description="Apellido materno")
+    email: EmailStr = Field(..., description="Correo electrónico válido")
+    password: str = Field(..., min_length=8, max_length=20, description="Contraseña inicial")
+    rol: Literal[1, 2, 3] = Field(2, description="1 admin, 2 contador, 3 rrhh")
+
+    @field_validator("password")
+    def validate_password(cls, v):
+        return validar_password_segura(v)
+
+
+class RegisterBulk(BaseModel):
+    usuarios: List[RegisterBulkUser] = Field(..., min_length=1, max_length=500)
+
+
+class RegisterBulkCreated(BaseModel):
+    usuario_id: int
+    login_id: int
+    email: str
+
+
+class RegisterBulkResponse(BaseModel):
+    msg: str
+    empresa_id: int
+    total: int
+    usuarios: List[RegisterBulkCreated]
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, constr, field_validator
-from datetime import date
-from typing import Optional
+from pydantic import BaseModel, Field, constr, field_validator, model_validator
+from datetime import date, datetime
+from typing import List, Optional
 from app.services.rut_validation import validar_rut_chileno
 
 # ------------------------
@@ -55,14 +55,12 @@ class DatosTrabajadorBase(BaseModel):
     nacionalidad: constr(min_length=2, max_length=50)
     direccion_real: str
 
-    @field_validator("rut")
-    @classmethod
-    def validar_rut(cls, v):
-        if v is None:
-            return v
-        if not validar_rut_chileno(v):
+    @model_validator(mode="after")
+    def validar_rut(self):
+        # rut viene sin DV: se valida junto con DV_rut
+        if not validar_rut_chileno(f"{self.rut}-{self.DV_rut}"):
             raise ValueError("RUT inválido")
-        return v
+        return self
 
 
 # ------------------------
@@ -87,16 +85,62 @@ class TrabajadorCreate(BaseModel):
     direccion_real: str
 
 
-    @field_validator("rut")
-    @classmethod
-    def validar_rut(cls, v):
-        if v is None:
-            return v
-        if not validar_rut_chileno(v):
+    @model_validator(mode="after")
+    def validar_rut(self):
+        # rut viene sin DV: se valida junto con DV_rut
+        if not validar_rut_chileno(f"{self.rut}-{self.DV_rut}"):
             raise ValueError("RUT inválido")
+        return self
+
+
+class TrabajadorImportRow(BaseModel):
+    """
+    Fila de una planilla de importación (mismos campos que TrabajadorCreate).
+    El RUT se valida por lote con validar_ruts en la importación.
+    """
+    cargo: Optional[str] = None
+    afp: str
+    salud: Optional[str] = None
+    region: str
+    comuna: str
+
+    nombre: constr(min_length=2, max_length=40)
+    apellido_paterno: constr(min_length=2, max_length=40)
+    apellido_materno: constr(min_length=2, max_length=40)
+    fecha_nacimiento: date
+    rut: int
+    DV_rut: constr(min_length=1, max_length=1)
+    nacionalidad: constr(min_length=2, max_length=50)
+    direccion_real: str
+
+    @field_validator("fecha_nacimiento", mode="before")
+    @classmethod
+    def fecha_chilena(cls, v):
+        # Las planillas suelen traer 31-12-1990 o 31/12/1990
+        if isinstance(v, datetime):
+            return v.date()
+        if isinstance(v, str):
+            for formato in ("%d-%m-%Y", "%d/%m/%Y"):
+                try:
+                    return datetime.strptime(v, formato).date()
+                except ValueError:
+                    pass
         return v
 
 
+class TrabajadorImportError(BaseModel):
+    fila: int
+    rut: Optional[str] = None
+    errores: List[str]
+
+
+class TrabajadorImportResponse(BaseModel):
+    total: int
+    insertados: int
+    dry_run: bool
+    errores: List[TrabajadorImportError]
+
+
 class TrabajadorUpdate(BaseModel):
     """Modelo para actualizar parcialmente un trabajador"""
     nombre: Optional[str] = None
@@ -1,12 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from passlib.context import CryptContext
+import asyncio
 import os
 from dotenv import load_dotenv
 
 load_dotenv()  # 👈 cargar variables .env
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Costo de bcrypt (2^rounds iteraciones). Los hashes guardados con otro costo
+# se regeneran en el siguiente login exitoso
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Hilos dedicados a bcrypt (libera el GIL): un pico de logins espera aquí en
+# lugar de ocupar todo el threadpool que usan los endpoints síncronos
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+_hash_executor = ThreadPoolExecutor(max_workers=max(PASSWORD_HASH_WORKERS, 1), thread_name_prefix="password-hash")
 
 # Configuración JWT desde .env
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -22,6 +32,40 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_rehash(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifica la contraseña y, si es correcta pero el hash usa parámetros
+    obsoletos (needs_update: otro costo o esquema), devuelve un hash nuevo
+    para guardar. (False, None) si no coincide.
+    """
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+    return True, None
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, get_password_hash, password)
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Hashes de un lote (altas masivas) sin acaparar el executor: como mucho
+    PASSWORD_HASH_WORKERS en cola a la vez, así un login o refresh que llega
+    en medio espera una ronda de bcrypt y no el lote completo.
+    """
+    semaforo = asyncio.Semaphore(max(PASSWORD_HASH_WORKERS, 1))
+
+    async def _hash(password: str) -> str:
+        async with semaforo:
+            return await hash_password_async(password)
+
+    return await asyncio.gather(*(_hash(p) for p in passwords))
+
+async def verify_and_rehash_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, verify_and_rehash, plain_password, hashed_password
+    )
+
 # --- JWT ---
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -1,11 +1,21 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.services import auth
+from app.services.token_cache import token_cache
 
 bearer_scheme = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+# async: con la caché la validación toma microsegundos y no justifica
+# pasar por el threadpool en cada request
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
     token = credentials.credentials
+
+    # El mismo token llega cientos de veces por sesión: se reutiliza la
+    # verificación hasta min(TTL, exp) en lugar de repetir jwt.decode
+    current_user = token_cache.get(token)
+    if current_user is not None:
+        return current_user
+
     payload = auth.decode_access_token(token)
     if payload is None:
         raise HTTPException(
@@ -13,8 +23,16 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(bearer_
             detail="Token inválido o expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return {
+    current_user = {
         "usuario_id": int(payload.get("sub")),
         "empresa_id": int(payload.get("empresa_id")),
         "rol": int(payload.get("rol"))
     }
+    if token_cache.revocado(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revocado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token_cache.put(token, payload, current_user)
+    return current_user
@@ -0,0 +1,288 @@
+from types import SimpleNamespace
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.generated import Empresa, Epp, Odi
+from app.schemas.pdf_contrato import PDFContratoRequest
+from app.schemas.pdf_epp import PDFEppBatchRequest, PDFEppRequest
+from app.schemas.pdf_odi import PDFOdiRequest
+from app.schemas.pdf_termino_contrato import PDFTerminoContratoRequest
+from app.services.trabajadores import find_trabajador_by_rut, find_trabajadores_by_ruts
+
+# Carga de datos para los generadores PDF. La usan tanto los endpoints
+# síncronos como los jobs en segundo plano; los datos se arman con
+# SimpleNamespace porque viajan por pickle al proceso de renderizado.
+
+
+async def datos_epp(db: AsyncSession, empresa_id: int, pdf_data: PDFEppRequest):
+    """
+    Datos del registro de entrega de EPP: empresa, trabajador (por RUT) y
+    elementos. Lanza HTTPException 400/404 si algo no existe.
+    """
+    # Obtener empresa
+    empresa = await db.get(Empresa, empresa_id)
+    if not empresa:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Empresa no encontrada"
+        )
+
+    # Validar que el RUT contenga solo números
+    if not pdf_data.rut.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El RUT debe contener solo números"
+        )
+
+    # Buscar trabajador por RUT en la empresa (una sola consulta indexada)
+    encontrado = await find_trabajador_by_rut(db, empresa_id, int(pdf_data.rut))
+
+    if not encontrado:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trabajador no encontrado en tu empresa"
+        )
+
+    datos_trabajador = encontrado.datos
+    cargo = encontrado.cargo
+
+    # Obtener datos del trabajador
+    trabajador_nombre = f"{datos_trabajador.nombre} {datos_trabajador.apellido_paterno} {datos_trabajador.apellido_materno}"
+    trabajador_rut = f"{datos_trabajador.rut}-{datos_trabajador.DV_rut}"
+    trabajador_cargo = cargo.nombre if cargo else ""
+
+    # Obtener IDs de los elementos
+    elementos_ids = [e.id_epp for e in pdf_data.elementos]
+
+    # Obtener los elementos EPP por IDs
+    elementos_epp = (await db.execute(
+        select(Epp).where(
+            Epp.id_epp.in_(elementos_ids),
+            Epp.id_empresa == empresa_id
+        )
+    )).scalars().all()
+
+    if len(elementos_epp) != len(elementos_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Algunos elementos EPP no fueron encontrados o no pertenecen a tu empresa"
+        )
+
+    # Crear diccionario para mapear id_epp a objeto Epp
+    epp_dict = {e.id_epp: e for e in elementos_epp}
+
+    # Construir los datos para el PDF
+    pdf_generator_data = SimpleNamespace()
+    pdf_generator_data.nombre = trabajador_nombre
+    pdf_generator_data.rut = trabajador_rut
+    pdf_generator_data.cargo = trabajador_cargo
+    pdf_generator_data.empresa_nombre = empresa.nombre_fantasia
+    pdf_generator_data.empresa_rut = f"{empresa.rut_empresa}-{empresa.DV_rut}"
+    pdf_generator_data.elementos = [
+        SimpleNamespace(
+            elemento_proteccion=epp_dict[e.id_epp].epp,
+            cantidad=e.cantidad,
+            fecha_entrega=e.fecha_entrega
+        )
+        for e in pdf_data.elementos
+    ]
+
+    return pdf_generator_data
+
+
+async def datos_epp_lote(db: AsyncSession, empresa_id: int, pdf_data: PDFEppBatchRequest):
+    """
+    Datos de la entrega de los mismos EPP a varios trabajadores, en dos
+    consultas. Devuelve (ruts sin duplicados, datos por trabajador).
+    """
+    # Validar RUTs (solo números) y quitar duplicados conservando el orden
+    invalidos = [rut for rut in pdf_data.ruts if not rut.isdigit()]
+    if invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Los RUT deben contener solo números: {', '.join(invalidos)}"
+        )
+    ruts = list(dict.fromkeys(int(rut) for rut in pdf_data.ruts))
+
+    # Consulta 1: todos los trabajadores con su cargo
+    trabajadores = await find_trabajadores_by_ruts(db, empresa_id, ruts)
+    faltantes = [str(rut) for rut in ruts if rut not in trabajadores]
+    if faltantes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trabajadores no encontrados en tu empresa: {', '.join(faltantes)}"
+        )
+
+    # Consulta 2: empresa junto con los EPP solicitados
+    elementos_ids = {e.id_epp for e in pdf_data.elementos}
+    filas = (await db.execute(
+        select(Empresa, Epp)
+        .outerjoin(Epp, and_(
+            Epp.id_empresa == Empresa.id_empresa,
+            Epp.id_epp.in_(elementos_ids)
+        ))
+        .where(Empresa.id_empresa == empresa_id)
+    )).all()
+
+    if not filas:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Empresa no encontrada"
+        )
+    empresa = filas[0][0]
+    epp_dict = {epp.id_epp: epp for _, epp in filas if epp is not None}
+
+    if len(epp_dict) != len(elementos_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Algunos elementos EPP no fueron encontrados o no pertenecen a tu empresa"
+        )
+
+    # Elementos y datos de empresa comunes a todos los trabajadores
+    elementos = [
+        SimpleNamespace(
+            elemento_proteccion=epp_dict[e.id_epp].epp,
+            cantidad=e.cantidad,
+            fecha_entrega=e.fecha_entrega
+        )
+        for e in pdf_data.elementos
+    ]
+    empresa_nombre = empresa.nombre_fantasia
+    empresa_rut = f"{empresa.rut_empresa}-{empresa.DV_rut}"
+
+    lote = []
+    for rut in ruts:
+        datos_trabajador, cargo = trabajadores[rut].datos, trabajadores[rut].cargo
+        lote.append(SimpleNamespace(
+            nombre=f"{datos_trabajador.nombre} {datos_trabajador.apellido_paterno} {datos_trabajador.apellido_materno}",
+            rut=f"{datos_trabajador.rut}-{datos_trabajador.DV_rut}",
+            cargo=cargo.nombre if cargo else "",
+            empresa_nombre=empresa_nombre,
+            empresa_rut=empresa_rut,
+            elementos=elementos,
+        ))
+
+    return ruts, lote
+
+
+async def datos_odi(db: AsyncSession, empresa_id: int, pdf_data: PDFOdiRequest):
+    """Datos de la ODI: empresa y elementos ODI seleccionados."""
+    # Obtener empresa
+    empresa = await db.get(Empresa, empresa_id)
+    if not empresa:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Empresa no encontrada"
+        )
+
+    # Obtener los elementos ODI por IDs
+    elementos = (await db.execute(
+        select(Odi).where(
+            Odi.id_odi.in_(pdf_data.elementos),
+            Odi.id_empresa == empresa_id
+        )
+    )).scalars().all()
+    if len(elementos) != len(pdf_data.elementos):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Algunos elementos ODI no fueron encontrados"
+        )
+
+    # Construir los datos para el PDF
+    pdf_generator_data = SimpleNamespace()
+    pdf_generator_data.nombre = pdf_data.nombre
+    pdf_generator_data.rut = pdf_data.rut
+    pdf_generator_data.cargo = pdf_data.cargo
+    pdf_generator_data.empresa_nombre = empresa.nombre_fantasia
+    pdf_generator_data.empresa_rut = f"{empresa.rut_empresa}-{empresa.DV_rut}"
+    pdf_generator_data.elementos = [SimpleNamespace(tarea=e.tarea, riesgo=e.riesgo, consecuencias=e.consecuencias, precaucion=e.precaucion) for e in elementos]
+
+    return pdf_generator_data
+
+
+async def datos_contrato(db: AsyncSession, empresa_id: int, pdf_data: PDFContratoRequest):
+    """Datos del contrato de trabajo: formulario más datos de la empresa."""
+    # Obtener empresa
+    empresa = await db.get(Empresa, empresa_id)
+    if not empresa:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Empresa no encontrada"
+        )
+
+    # Construir los datos para el PDF con información de la empresa
+    pdf_generator_data = SimpleNamespace()
+    pdf_generator_data.ciudad_firma = pdf_data.ciudad_firma
+    pdf_generator_data.fecha_contrato = pdf_data.fecha_contrato
+    pdf_generator_data.empresa_nombre = empresa.nombre_fantasia
+    pdf_generator_data.empresa_rut = f"{empresa.rut_empresa}-{empresa.DV_rut}"
+    pdf_generator_data.representante_legal = pdf_data.representante_legal
+    pdf_generator_data.rut_representante = pdf_data.rut_representante
+    pdf_generator_data.domicilio_representante = pdf_data.domicilio_representante
+    pdf_generator_data.nombre_trabajador = pdf_data.nombre_trabajador
+    pdf_generator_data.nacionalidad_trabajador = pdf_data.nacionalidad_trabajador
+    pdf_generator_data.rut_trabajador = pdf_data.rut_trabajador
+    pdf_generator_data.estado_civil_trabajador = pdf_data.estado_civil_trabajador
+    pdf_generator_data.fecha_nacimiento_trabajador = pdf_data.fecha_nacimiento_trabajador
+    pdf_generator_data.domicilio_trabajador = pdf_data.domicilio_trabajador
+    pdf_generator_data.cargo_trabajador = pdf_data.cargo_trabajador
+    pdf_generator_data.lugar_trabajo = pdf_data.lugar_trabajo
+    pdf_generator_data.sueldo = pdf_data.sueldo
+    pdf_generator_data.jornada = pdf_data.jornada
+    pdf_generator_data.descripcion_jornada = pdf_data.descripcion_jornada
+    pdf_generator_data.clausulas = pdf_data.clausulas
+
+    return pdf_generator_data
+
+
+async def datos_termino_contrato(db: AsyncSession, empresa_id: int, pdf_data: PDFTerminoContratoRequest):
+    """Datos de la carta de término: trabajador (por RUT) con su comuna y empresa."""
+    # Validar que el RUT sea numérico
+    if not pdf_data.rut_trabajador.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El RUT debe contener solo números"
+        )
+
+    # Buscar trabajador por RUT con su territorial (una sola consulta indexada)
+    encontrado = await find_trabajador_by_rut(db, empresa_id, int(pdf_data.rut_trabajador))
+
+    if not encontrado:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trabajador no encontrado"
+        )
+
+    datos_trabajador = encontrado.datos
+    territorial = encontrado.territorial
+
+    comuna_trabajador = territorial.comuna if territorial else "Sin comuna"
+
+    # Obtener empresa
+    empresa = await db.get(Empresa, empresa_id)
+    if not empresa:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Empresa no encontrada"
+        )
+
+    # Construir los datos para el PDF
+    pdf_generator_data = SimpleNamespace()
+    pdf_generator_data.ciudad = pdf_data.ciudad
+    pdf_generator_data.fecha_carta = pdf_data.fecha_carta
+    pdf_generator_data.empresa_nombre = empresa.nombre_fantasia
+    pdf_generator_data.empresa_rut = f"{empresa.rut_empresa}-{empresa.DV_rut}"
+    pdf_generator_data.nombre_trabajador = f"{datos_trabajador.nombre} {datos_trabajador.apellido_paterno} {datos_trabajador.apellido_materno}"
+    pdf_generator_data.rut_trabajador = f"{datos_trabajador.rut}-{datos_trabajador.DV_rut}"
+    pdf_generator_data.direccion_trabajador = datos_trabajador.direccion_real
+    pdf_generator_data.comuna_trabajador = comuna_trabajador
+    pdf_generator_data.fecha_termino = pdf_data.fecha_termino
+    pdf_generator_data.articulo_causal = pdf_data.articulo_causal
+    pdf_generator_data.descripcion_causal = pdf_data.descripcion_causal
+    pdf_generator_data.fundamentacion = pdf_data.fundamentacion
+    pdf_generator_data.lugar_pago_finiquito = pdf_data.lugar_pago_finiquito
+    pdf_generator_data.telefono_notaria = pdf_data.telefono_notaria
+
+    return pdf_generator_data
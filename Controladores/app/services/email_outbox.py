@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, engine
+from app.models.outbox import EMAIL_ENVIADO, EMAIL_ERROR, EMAIL_PENDIENTE, EmailOutbox
+from app.services.email_transport import EmailTransport, Mensaje, crear_transporte
+from app.services.reintentos import backoff
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Dispatcher dentro de la API (0 = otro proceso: `python -m app.services.email_outbox`)
+EMAIL_DISPATCHER_ENABLED = os.getenv("EMAIL_DISPATCHER_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# Correos por lote (un request a SendGrid por plantilla y lote)
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "100"))
+# Segundos entre consultas al outbox cuando está vacío
+EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", "2"))
+# Reintentos: base * 2^(intento - 1) segundos, con tope y ±20 % de jitter
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "3600"))
+EMAIL_MAX_INTENTOS = int(os.getenv("EMAIL_MAX_INTENTOS", "8"))
+
+# Mientras un lote se envía, sus correos quedan reservados por este tiempo;
+# si el proceso muere a mitad de camino, otro dispatcher los retoma al vencer
+_RESERVA = timedelta(minutes=5)
+
+
+def _ahora() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def crear_tabla_outbox(bind=engine) -> None:
+    """Crea la tabla email_outbox si no existe (no forma parte de generated.py)."""
+    EmailOutbox.__table__.create(bind=bind, checkfirst=True)
+
+
+def encolar_email(db: AsyncSession, destinatario: str, asunto: str, texto: str,
+                  html: Optional[str] = None, variables: Optional[dict] = None) -> EmailOutbox:
+    """
+    Agrega el correo a la transacción en curso (sin commit): se envía solo si
+    el cambio que lo origina se confirma. Llamar a email_dispatcher.notificar()
+    después del commit para no esperar al siguiente sondeo.
+    """
+    ahora = _ahora()
+    email = EmailOutbox(
+        destinatario=destinatario,
+        asunto=asunto,
+        texto=texto,
+        html=html,
+        variables=variables,
+        estado=EMAIL_PENDIENTE,
+        intentos=0,
+        proximo_intento=ahora,
+        creado=ahora,
+    )
+    db.add(email)
+    return email
+
+
+async def _reservar_lote(db: AsyncSession, limite: int) -> list:
+    # Mismo patrón que la cola de jobs: SKIP LOCKED reparte entre procesos
+    ahora = _ahora()
+    siguientes = (
+        select(EmailOutbox.id_email)
+        .where(EmailOutbox.estado == EMAIL_PENDIENTE, EmailOutbox.proximo_intento <= ahora)
+        .order_by(EmailOutbox.proximo_intento)
+        .limit(limite)
+        .with_for_update(skip_locked=True)
+    )
+    filas = (await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id_email.in_(siguientes), EmailOutbox.estado == EMAIL_PENDIENTE)
+        .values(proximo_intento=ahora + _RESERVA, intentos=EmailOutbox.intentos + 1)
+        .returning(
+            EmailOutbox.id_email, EmailOutbox.destinatario, EmailOutbox.asunto,
+            EmailOutbox.texto, EmailOutbox.html, EmailOutbox.variables, EmailOutbox.intentos,
+        )
+        .execution_options(synchronize_session=False)
+    )).all()
+    await db.commit()
+    return filas
+
+
+async def despachar_lote(transporte: EmailTransport, limite: int = EMAIL_BATCH_SIZE) -> int:
+    """Envía hasta `limite` correos pendientes. Devuelve cuántos se procesaron."""
+    async with AsyncSessionLocal() as db:
+        filas = await _reservar_lote(db, limite)
+        if not filas:
+            return 0
+
+        mensajes = [Mensaje(f.id_email, f.destinatario, f.asunto, f.texto, f.html, f.variables) for f in filas]
+        try:
+            # Los transportes son bloqueantes (HTTP/SMTP/disco)
+            resultado = await run_in_threadpool(transporte.enviar, mensajes)
+        except Exception as e:
+            logger.exception("Error enviando un lote de %s correos", len(mensajes))
+            resultado = {m.id: repr(e) for m in mensajes}
+
+        ahora = _ahora()
+        enviados = [id_email for id_email, error in resultado.items() if error is None]
+        if enviados:
+            await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id_email.in_(enviados))
+                .values(estado=EMAIL_ENVIADO, enviado=ahora, ultimo_error=None)
+                .execution_options(synchronize_session=False)
+            )
+        for fila in filas:
+            error = resultado.get(fila.id_email, "Sin resultado del transporte")
+            if error is None:
+                continue
+            if fila.intentos >= EMAIL_MAX_INTENTOS:
+                valores = {"estado": EMAIL_ERROR, "ultimo_error": error}
+                logger.error("Correo %s a %s descartado tras %s intentos: %s",
+                             fila.id_email, fila.destinatario, fila.intentos, error)
+            else:
+                valores = {
+                    "proximo_intento": ahora + backoff(fila.intentos, EMAIL_RETRY_BASE_SECONDS, EMAIL_RETRY_MAX_SECONDS),
+                    "ultimo_error": error,
+                }
+            await db.execute(
+                update(EmailOutbox).where(EmailOutbox.id_email == fila.id_email).values(**valores)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+        return len(filas)
+
+
+class EmailDispatcher:
+    """
+    Tarea asyncio que vacía el outbox por lotes con un único transporte
+    (un cliente SendGrid reutilizado). Sondea cada `poll_interval` segundos
+    o antes si se llama a notificar().
+    """
+
+    def __init__(self, batch_size: int = EMAIL_BATCH_SIZE, poll_interval: float = EMAIL_POLL_INTERVAL):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._tarea = None
+        self._aviso: Optional[asyncio.Event] = None
+        self._transporte: Optional[EmailTransport] = None
+
+    def start(self, transporte: Optional[EmailTransport] = None) -> None:
+        if self._tarea is not None:
+            return
+        self._transporte = transporte or crear_transporte()
+        self._aviso = asyncio.Event()
+        self._tarea = asyncio.create_task(self._despachar())
+
+    async def stop(self) -> None:
+        if self._tarea is None:
+            return
+        self._tarea.cancel()
+        await asyncio.gather(self._tarea, return_exceptions=True)
+        self._tarea = None
+        self._transporte.close()
+
+    def notificar(self) -> None:
+        """Despierta al dispatcher de este proceso (correo recién encolado)."""
+        if self._aviso is not None:
+            self._aviso.set()
+
+    async def _despachar(self) -> None:
+        while True:
+            try:
+                procesados = await despachar_lote(self._transporte, self.batch_size)
+            except Exception:
+                logger.exception("Error consultando el outbox de correos")
+                procesados = 0
+            # Lote completo: probablemente queda más, se sigue sin esperar
+            if procesados < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._aviso.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._aviso.clear()
+
+
+email_dispatcher = EmailDispatcher()
+
+
+async def _dispatcher_main() -> None:
+    crear_tabla_outbox()
+    dispatcher = EmailDispatcher()
+    dispatcher.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await dispatcher.stop()
+
+
+if __name__ == "__main__":
+    # Dispatcher dedicado: `python -m app.services.email_outbox` (con EMAIL_DISPATCHER_ENABLED=false en la API)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_dispatcher_main())
+    except KeyboardInterrupt:
+        pass
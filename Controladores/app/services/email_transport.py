@@ -0,0 +1,177 @@
+import os
+import re
+import smtplib
+import threading
+from collections import defaultdict
+from email.message import EmailMessage
+from typing import Dict, List, NamedTuple, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
+MAIL_FROM = os.getenv("MAIL_FROM")
+# sendgrid (producción), smtp (p. ej. un servidor de depuración) o file (.eml en
+# disco, solo desarrollo). Siempre sendgrid salvo que se elija otro explícitamente
+EMAIL_TRANSPORT = os.getenv("EMAIL_TRANSPORT", "sendgrid")
+EMAIL_SMTP_HOST = os.getenv("EMAIL_SMTP_HOST", "localhost")
+EMAIL_SMTP_PORT = int(os.getenv("EMAIL_SMTP_PORT", "1025"))
+EMAIL_SMTP_USER = os.getenv("EMAIL_SMTP_USER")
+EMAIL_SMTP_PASSWORD = os.getenv("EMAIL_SMTP_PASSWORD")
+EMAIL_SMTP_STARTTLS = os.getenv("EMAIL_SMTP_STARTTLS", "false").strip().lower() in ("1", "true", "yes", "on")
+EMAIL_FILE_DIR = os.getenv("EMAIL_FILE_DIR", "outbox_emails")
+
+# Límite de personalizations por request en la API v3 de SendGrid
+_SENDGRID_LOTE = 1000
+
+
+class Mensaje(NamedTuple):
+    id: int
+    destinatario: str
+    asunto: str
+    texto: str
+    html: Optional[str]
+    variables: Optional[dict]
+
+
+def renderizar(plantilla: Optional[str], variables: Optional[dict]) -> Optional[str]:
+    """Aplica los reemplazos (mismo formato que las substitutions de SendGrid)."""
+    if plantilla is None or not variables:
+        return plantilla
+    patron = re.compile("|".join(re.escape(clave) for clave in variables))
+    return patron.sub(lambda m: str(variables[m.group(0)]), plantilla)
+
+
+class EmailTransport:
+    """
+    Envía un lote de mensajes y devuelve {id: error}, con None para los
+    enviados. Se crea una vez y se reutiliza entre lotes.
+    """
+
+    def enviar(self, mensajes: List[Mensaje]) -> Dict[int, Optional[str]]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SendGridTransport(EmailTransport):
+    """
+    Un solo SendGridAPIClient para todo el proceso. Los mensajes con la misma
+    plantilla (asunto, texto, html) salen en un request con una
+    personalization por destinatario y sus substitutions.
+    """
+
+    def __init__(self, api_key: str = SENDGRID_API_KEY, remitente: str = MAIL_FROM):
+        from sendgrid import SendGridAPIClient
+
+        # Sin clave ningún correo saldría: falla al iniciar el dispatcher, no en silencio
+        if not api_key:
+            raise ValueError(
+                "SENDGRID_API_KEY no está definida: configurarla o elegir otro transporte "
+                "con EMAIL_TRANSPORT (smtp | file)"
+            )
+        self._cliente = SendGridAPIClient(api_key)
+        self.remitente = remitente
+
+    def enviar(self, mensajes: List[Mensaje]) -> Dict[int, Optional[str]]:
+        grupos = defaultdict(list)
+        for mensaje in mensajes:
+            grupos[(mensaje.asunto, mensaje.texto, mensaje.html)].append(mensaje)
+
+        resultado = {}
+        for (asunto, texto, html), grupo in grupos.items():
+            contenido = [{"type": "text/plain", "value": texto}]
+            if html:
+                contenido.append({"type": "text/html", "value": html})
+            for i in range(0, len(grupo), _SENDGRID_LOTE):
+                lote = grupo[i:i + _SENDGRID_LOTE]
+                cuerpo = {
+                    "personalizations": [
+                        {"to": [{"email": m.destinatario}], "substitutions": m.variables or {}}
+                        for m in lote
+                    ],
+                    "from": {"email": self.remitente},
+                    "subject": asunto,
+                    "content": contenido,
+                }
+                try:
+                    self._cliente.client.mail.send.post(request_body=cuerpo)
+                    error = None
+                except Exception as e:
+                    error = f"SendGrid: {getattr(e, 'body', None) or e!r}"
+                resultado.update((m.id, error) for m in lote)
+        return resultado
+
+
+def _email_message(mensaje: Mensaje, remitente: Optional[str]) -> EmailMessage:
+    email = EmailMessage()
+    email["From"] = remitente or "no-reply@localhost"
+    email["To"] = mensaje.destinatario
+    email["Subject"] = renderizar(mensaje.asunto, mensaje.variables)
+    email.set_content(renderizar(mensaje.texto, mensaje.variables))
+    if mensaje.html:
+        email.add_alternative(renderizar(mensaje.html, mensaje.variables), subtype="html")
+    return email
+
+
+class SMTPTransport(EmailTransport):
+    """Una conexión SMTP por lote (sirve con `python -m aiosmtpd -n` en desarrollo)."""
+
+    def __init__(self, host: str = EMAIL_SMTP_HOST, port: int = EMAIL_SMTP_PORT, remitente: str = MAIL_FROM):
+        self.host = host
+        self.port = port
+        self.remitente = remitente
+
+    def enviar(self, mensajes: List[Mensaje]) -> Dict[int, Optional[str]]:
+        try:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        except OSError as e:
+            return {m.id: f"SMTP: {e!r}" for m in mensajes}
+        resultado = {}
+        with smtp:
+            if EMAIL_SMTP_STARTTLS:
+                smtp.starttls()
+            if EMAIL_SMTP_USER:
+                smtp.login(EMAIL_SMTP_USER, EMAIL_SMTP_PASSWORD)
+            for mensaje in mensajes:
+                try:
+                    smtp.send_message(_email_message(mensaje, self.remitente))
+                    resultado[mensaje.id] = None
+                except smtplib.SMTPException as e:
+                    resultado[mensaje.id] = f"SMTP: {e!r}"
+        return resultado
+
+
+class FileTransport(EmailTransport):
+    """Escribe cada correo como .eml en un directorio (desarrollo y pruebas)."""
+
+    def __init__(self, directorio: str = EMAIL_FILE_DIR, remitente: str = MAIL_FROM):
+        self.directorio = directorio
+        self.remitente = remitente
+        self._lock = threading.Lock()
+
+    def enviar(self, mensajes: List[Mensaje]) -> Dict[int, Optional[str]]:
+        os.makedirs(self.directorio, exist_ok=True)
+        resultado = {}
+        with self._lock:
+            for mensaje in mensajes:
+                ruta = os.path.join(self.directorio, f"{mensaje.id:08d}.eml")
+                with open(ruta, "wb") as f:
+                    f.write(bytes(_email_message(mensaje, self.remitente)))
+                resultado[mensaje.id] = None
+        return resultado
+
+
+TRANSPORTES = {
+    "sendgrid": SendGridTransport,
+    "smtp": SMTPTransport,
+    "file": FileTransport,
+}
+
+
+def crear_transporte(nombre: str = EMAIL_TRANSPORT) -> EmailTransport:
+    if nombre not in TRANSPORTES:
+        raise ValueError(f"EMAIL_TRANSPORT desconocido: {nombre}. Disponibles: {', '.join(TRANSPORTES)}")
+    return TRANSPORTES[nombre]()
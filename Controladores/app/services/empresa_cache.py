@@ -0,0 +1,65 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Empresas cuya respuesta de GET /empresa/full se guarda por proceso (0 = sin caché)
+EMPRESA_CACHE_SIZE = int(os.getenv("EMPRESA_CACHE_SIZE", "1000"))
+
+
+class RespuestaCache:
+    """
+    Respuesta JSON ya serializada por empresa, junto con la versión (ETag)
+    con que se generó. No se invalida a mano: una entrada sirve solo mientras
+    su ETag coincida con el de version_lista, que sube en la misma
+    transacción que cualquier cambio (y lo ven todos los procesos).
+    """
+
+    def __init__(self, max_entries: int = EMPRESA_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()   # empresa_id → (etag, cuerpo)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, empresa_id: int, etag: str) -> Optional[bytes]:
+        with self._lock:
+            entrada = self._entradas.get(empresa_id)
+            if entrada is None or entrada[0] != etag:
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(empresa_id)
+            self.hits += 1
+            return entrada[1]
+
+    def put(self, empresa_id: int, etag: str, cuerpo: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entradas[empresa_id] = (etag, cuerpo)
+            self._entradas.move_to_end(empresa_id)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def status(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entries,
+                "bytes": sum(len(cuerpo) for _, cuerpo in self._entradas.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 3) if total else None,
+            }
+
+
+empresa_full_cache = RespuestaCache()
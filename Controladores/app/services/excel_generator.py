@@ -0,0 +1,126 @@
+from io import BytesIO
+from typing import Iterable
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill
+from sqlalchemy import case, func, literal, select
+
+from app.models.generated import Contrato, DatosTrabajador, Trabajador
+from app.services.metrics import medir_documento
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def listado_contratos_query(empresa_id: int):
+    """
+    Contratos de la empresa con los datos del trabajador en una sola consulta.
+    El estado (Vigente/Finalizado/Indefinido) se calcula en SQL.
+    """
+    datos = DatosTrabajador.__table__
+    estado = case(
+        (Contrato.fecha_termino.is_(None), literal("Indefinido")),
+        (Contrato.fecha_termino < func.now(), literal("Finalizado")),
+        else_=literal("Vigente"),
+    ).label("estado")
+
+    return (
+        select(
+            Contrato.id_contrato,
+            datos.c.rut,
+            datos.c.DV_rut,
+            datos.c.nombre,
+            datos.c.apellido_paterno,
+            datos.c.apellido_materno,
+            Contrato.direccion_contrato,
+            Contrato.fecha_subida,
+            Contrato.fecha_inicial,
+            Contrato.fecha_termino,
+            estado,
+        )
+        .join(Trabajador, Contrato.id_trabajador == Trabajador.id_trabajador)
+        .outerjoin(datos, datos.c.id_trabajador == Contrato.id_trabajador)
+        .where(Trabajador.id_empresa == empresa_id)
+        .order_by(Contrato.id_contrato)
+    )
+
+
+class ExcelListadoContratosGenerator:
+    headers = [
+        "ID Contrato",
+        "RUT",
+        "Nombre Completo",
+        "Dirección Contrato",
+        "Fecha Subida",
+        "Fecha Inicial",
+        "Fecha Término",
+        "Estado"
+    ]
+    widths = {"A": 12, "B": 15, "C": 35, "D": 40, "E": 18, "F": 15, "G": 15, "H": 12}
+
+    def __init__(self):
+        self.header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        self.header_font = Font(bold=True, color="FFFFFF")
+        self.header_alignment = Alignment(horizontal="center", vertical="center")
+
+    def generate(self, rows: Iterable) -> tuple[BytesIO, int]:
+        """
+        Escribe las filas en un Workbook write-only (las filas no quedan en
+        memoria como celdas) y devuelve el .xlsx en memoria junto con la
+        cantidad de contratos escritos.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Listado de Contratos")
+
+        # Ajustar ancho de columnas (antes de escribir filas en modo write-only)
+        for col, width in self.widths.items():
+            ws.column_dimensions[col].width = width
+
+        header_row = []
+        for header in self.headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.fill = self.header_fill
+            cell.font = self.header_font
+            cell.alignment = self.header_alignment
+            header_row.append(cell)
+        ws.append(header_row)
+
+        total = 0
+        for row in rows:
+            if row.nombre is not None:
+                nombre_completo = f"{row.nombre} {row.apellido_paterno} {row.apellido_materno}"
+                rut = f"{row.rut}-{row.DV_rut}"
+            else:
+                nombre_completo = "Sin datos"
+                rut = "N/A"
+
+            ws.append([
+                row.id_contrato,
+                rut,
+                nombre_completo,
+                row.direccion_contrato or "N/A",
+                row.fecha_subida.strftime('%Y-%m-%d %H:%M') if row.fecha_subida else "N/A",
+                row.fecha_inicial.strftime('%Y-%m-%d') if row.fecha_inicial else "N/A",
+                row.fecha_termino.strftime('%Y-%m-%d') if row.fecha_termino else "N/A",
+                row.estado,
+            ])
+            total += 1
+
+        buffer = BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+        return buffer, total
+
+
+def generar_listado_contratos(db, empresa_id: int) -> tuple[BytesIO, int]:
+    """
+    Listado de contratos de la empresa en .xlsx (sesión síncrona). Lo usan
+    el endpoint /contrato/generate-list-contracts y los jobs en segundo plano.
+    """
+    # Una sola consulta (contratos + datos del trabajador + estado en SQL),
+    # leída por lotes con yield_per para no materializar todas las filas
+    with medir_documento("excel", "listado_contratos"):
+        rows = db.execute(
+            listado_contratos_query(empresa_id).execution_options(yield_per=1000)
+        )
+        return ExcelListadoContratosGenerator().generate(rows)
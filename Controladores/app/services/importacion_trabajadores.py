@@ -0,0 +1,311 @@
+import csv
+import io
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from openpyxl import load_workbook
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.generated import Afp, Cargo, DatosTrabajador, Salud, Territorial, Trabajador
+from app.schemas.workers import TrabajadorImportRow
+from app.services.rut_validation import validar_ruts
+from app.services.worker_search import normalizar
+
+# Filas por lote: se validan, resuelven e insertan juntas
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+# Tope de filas por archivo
+IMPORT_MAX_FILAS = int(os.getenv("IMPORT_MAX_FILAS", "20000"))
+
+# Encabezado normalizado → campo de TrabajadorImportRow
+COLUMNAS = {
+    "nombre": "nombre",
+    "nombres": "nombre",
+    "apellido paterno": "apellido_paterno",
+    "apellido materno": "apellido_materno",
+    "fecha nacimiento": "fecha_nacimiento",
+    "fecha de nacimiento": "fecha_nacimiento",
+    "rut": "rut",
+    "dv": "DV_rut",
+    "dv rut": "DV_rut",
+    "nacionalidad": "nacionalidad",
+    "direccion": "direccion_real",
+    "direccion real": "direccion_real",
+    "cargo": "cargo",
+    "afp": "afp",
+    "salud": "salud",
+    "region": "region",
+    "comuna": "comuna",
+}
+OBLIGATORIAS = {"nombre", "apellido_paterno", "apellido_materno", "fecha_nacimiento", "rut",
+                "nacionalidad", "direccion_real", "afp", "region", "comuna"}
+
+_validador_lote = TypeAdapter(List[TrabajadorImportRow])
+
+
+class ArchivoInvalido(ValueError):
+    """El archivo no se puede leer o le faltan columnas."""
+
+
+@dataclass
+class Catalogos:
+    """Nombres normalizados → id, cargados una vez por importación."""
+    cargos: Dict[str, int]
+    afps: Dict[str, int]
+    salud: Dict[str, int]
+    territorial: Dict[Tuple[str, str], int]
+
+
+@dataclass
+class ResultadoImportacion:
+    total: int = 0
+    insertados: int = 0
+    errores: List[dict] = field(default_factory=list)
+
+    def error(self, fila: int, rut: Optional[str], mensajes: List[str]) -> None:
+        self.errores.append({"fila": fila, "rut": rut, "errores": mensajes})
+
+
+# ==============================================================
+# Lectura streaming de XLSX / CSV
+# ==============================================================
+
+def _celda(valor):
+    # Todo a texto salvo fechas: pydantic no convierte int → str,
+    # y Excel guarda los RUT como 12345678.0
+    if valor is None or isinstance(valor, (date, datetime)):
+        return valor
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    texto = str(valor).strip()
+    return texto or None
+
+
+def _mapear_encabezado(encabezado) -> List[Optional[str]]:
+    campos = [COLUMNAS.get(normalizar(str(c)) if c is not None else "") for c in encabezado]
+    faltantes = OBLIGATORIAS - set(campos)
+    if faltantes:
+        raise ArchivoInvalido(f"Faltan columnas: {', '.join(sorted(faltantes))}")
+    return campos
+
+
+def _filas_xlsx(archivo: BinaryIO) -> Iterator[tuple]:
+    # read_only recorre la hoja como stream, sin cargarla entera en memoria
+    try:
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+    except Exception as e:
+        raise ArchivoInvalido(f"No se pudo leer el XLSX: {e}")
+    try:
+        yield from libro.active.iter_rows(values_only=True)
+    finally:
+        libro.close()
+
+
+def _filas_csv(archivo: BinaryIO) -> Iterator[list]:
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    try:
+        # Excel en español exporta con ';'
+        muestra = texto.read(4096)
+        texto.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        yield from csv.reader(texto, dialecto)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ArchivoInvalido(f"No se pudo leer el CSV: {e}")
+
+
+def leer_filas(archivo: BinaryIO, nombre_archivo: str) -> Iterator[Tuple[int, dict]]:
+    """
+    Recorre la planilla y entrega (número de fila, dict por campo). El número
+    es el de la planilla (el encabezado es la fila 1) para el reporte de errores.
+    """
+    nombre = (nombre_archivo or "").lower()
+    if nombre.endswith(".xlsx"):
+        filas = _filas_xlsx(archivo)
+    elif nombre.endswith(".csv"):
+        filas = _filas_csv(archivo)
+    else:
+        raise ArchivoInvalido("Formato no soportado: se acepta .xlsx o .csv")
+
+    encabezado = next(filas, None)
+    if encabezado is None:
+        raise ArchivoInvalido("El archivo está vacío")
+    campos = _mapear_encabezado(encabezado)
+
+    for numero, valores in enumerate(filas, start=2):
+        fila = {campo: _celda(v) for campo, v in zip(campos, valores) if campo}
+        if not any(v is not None for v in fila.values()):
+            continue  # filas en blanco al final de la hoja
+        # "12.345.678-5" en una sola columna
+        rut = fila.get("rut")
+        if isinstance(rut, str) and "-" in rut and not fila.get("DV_rut"):
+            fila["rut"], fila["DV_rut"] = rut.replace(".", "").rsplit("-", 1)
+        elif isinstance(rut, str):
+            fila["rut"] = rut.replace(".", "")
+        if fila.get("DV_rut"):
+            fila["DV_rut"] = fila["DV_rut"].upper()
+        yield numero, fila
+
+
+# ==============================================================
+# Validación y carga por lotes
+# ==============================================================
+
+async def cargar_catalogos(db: AsyncSession, empresa_id: int) -> Catalogos:
+    """Una consulta por catálogo en lugar de cuatro ILIKE por trabajador."""
+    def indice(filas) -> dict:
+        resultado = {}
+        for clave, id_ in filas:
+            resultado.setdefault(clave, id_)  # ante nombres repetidos gana el primero
+        return resultado
+
+    cargos = (await db.execute(select(Cargo.nombre, Cargo.id_cargo).where(Cargo.id_empresa == empresa_id))).all()
+    afps = (await db.execute(select(Afp.nombre, Afp.id_afp))).all()
+    salud = (await db.execute(select(Salud.nombre, Salud.id_salud))).all()
+    territorial = (await db.execute(
+        select(Territorial.region, Territorial.comuna, Territorial.id_territorial)
+    )).all()
+
+    return Catalogos(
+        cargos=indice((normalizar(n), i) for n, i in cargos),
+        afps=indice((normalizar(n), i) for n, i in afps),
+        salud=indice((normalizar(n), i) for n, i in salud),
+        territorial=indice(((normalizar(r), normalizar(c)), i) for r, c, i in territorial),
+    )
+
+
+def _validar_lote(lote: List[Tuple[int, dict]]) -> Tuple[List[Tuple[int, TrabajadorImportRow]], Dict[int, List[str]]]:
+    # Una sola validación para todo el lote; los errores traen el índice de la fila
+    errores: Dict[int, List[str]] = {}
+    try:
+        modelos = _validador_lote.validate_python([fila for _, fila in lote])
+        validas = [(numero, m) for (numero, _), m in zip(lote, modelos)]
+    except ValidationError as e:
+        for err in e.errors():
+            indice, *campo = err["loc"]
+            mensaje = err["msg"].removeprefix("Value error, ")
+            errores.setdefault(lote[indice][0], []).append(f"{campo[0]}: {mensaje}" if campo else mensaje)
+        validas = [
+            (numero, TrabajadorImportRow.model_validate(fila))
+            for numero, fila in lote if numero not in errores
+        ]
+
+    # Dígitos verificadores de todo el lote en una pasada vectorizada
+    ruts = validar_ruts([f"{m.rut}{m.DV_rut}" for _, m in validas])
+    for (numero, _), valido in zip(validas, ruts.validos):
+        if not valido:
+            errores[numero] = ["RUT inválido"]
+    return [(numero, m) for (numero, m), valido in zip(validas, ruts.validos) if valido], errores
+
+
+def _resolver(modelo: TrabajadorImportRow, catalogos: Catalogos) -> Tuple[dict, List[str]]:
+    errores = []
+    ids = {"id_cargo": None, "id_salud": None}
+
+    if modelo.cargo:
+        ids["id_cargo"] = catalogos.cargos.get(normalizar(modelo.cargo))
+        if ids["id_cargo"] is None:
+            errores.append(f"Cargo '{modelo.cargo}' no encontrado")
+    ids["id_afp"] = catalogos.afps.get(normalizar(modelo.afp))
+    if ids["id_afp"] is None:
+        errores.append(f"AFP '{modelo.afp}' no encontrada")
+    if modelo.salud:
+        ids["id_salud"] = catalogos.salud.get(normalizar(modelo.salud))
+        if ids["id_salud"] is None:
+            errores.append(f"Salud '{modelo.salud}' no encontrada")
+    ids["id_territorial"] = catalogos.territorial.get((normalizar(modelo.region), normalizar(modelo.comuna)))
+    if ids["id_territorial"] is None:
+        errores.append(f"Territorial '{modelo.region} - {modelo.comuna}' no encontrado")
+
+    return ids, errores
+
+
+async def _insertar_lote(db: AsyncSession, empresa_id: int, filas: List[Tuple[TrabajadorImportRow, dict]]) -> None:
+    # INSERT multi-fila en trabajador con RETURNING (en el orden enviado)
+    # y luego datos_trabajador con los ids obtenidos
+    ids = (await db.execute(
+        insert(Trabajador.__table__).returning(Trabajador.__table__.c.id_trabajador, sort_by_parameter_order=True),
+        [{"id_empresa": empresa_id, **ids} for _, ids in filas],
+    )).scalars().all()
+
+    await db.execute(
+        insert(DatosTrabajador.__table__),
+        [
+            {
+                "id_trabajador": id_trabajador,
+                "nombre": m.nombre,
+                "apellido_paterno": m.apellido_paterno,
+                "apellido_materno": m.apellido_materno,
+                "fecha_nacimiento": m.fecha_nacimiento,
+                "rut": m.rut,
+                "DV_rut": m.DV_rut,
+                "nacionalidad": m.nacionalidad,
+                "direccion_real": m.direccion_real,
+            }
+            for id_trabajador, (m, _) in zip(ids, filas)
+        ],
+    )
+
+
+async def importar_trabajadores(db: AsyncSession, empresa_id: int, archivo: BinaryIO,
+                                nombre_archivo: str, dry_run: bool = False) -> ResultadoImportacion:
+    """
+    Importa una planilla de trabajadores por lotes de IMPORT_CHUNK_SIZE filas.
+    Las filas válidas se insertan en una sola transacción (sin commit: lo hace
+    quien llama); las inválidas quedan en el reporte con su número de fila.
+    """
+    filas = leer_filas(archivo, nombre_archivo)
+    catalogos = await cargar_catalogos(db, empresa_id)
+    resultado = ResultadoImportacion()
+    ruts_archivo: Dict[int, int] = {}
+
+    while True:
+        # Parsear la planilla es CPU: el lote se lee en el threadpool
+        lote = await run_in_threadpool(lambda: list(islice(filas, IMPORT_CHUNK_SIZE)))
+        if not lote:
+            break
+        resultado.total += len(lote)
+        if resultado.total > IMPORT_MAX_FILAS:
+            raise ArchivoInvalido(f"El archivo supera el máximo de {IMPORT_MAX_FILAS} filas")
+
+        validas, errores = _validar_lote(lote)
+        for numero, fila in lote:
+            if numero in errores:
+                rut = fila.get("rut")
+                resultado.error(numero, f"{rut}-{fila.get('DV_rut')}" if rut else None, errores[numero])
+
+        # RUT ya registrados en la empresa: una consulta por lote
+        existentes = set((await db.execute(
+            select(DatosTrabajador.rut).where(
+                DatosTrabajador.id_empresa == empresa_id,
+                DatosTrabajador.rut.in_([m.rut for _, m in validas])
+            )
+        )).scalars().all()) if validas else set()
+
+        a_insertar = []
+        for numero, modelo in validas:
+            ids, mensajes = _resolver(modelo, catalogos)
+            if modelo.rut in existentes:
+                mensajes.append("El RUT ya está registrado en la empresa")
+            elif modelo.rut in ruts_archivo:
+                mensajes.append(f"RUT repetido en el archivo (fila {ruts_archivo[modelo.rut]})")
+            else:
+                ruts_archivo[modelo.rut] = numero
+            if mensajes:
+                resultado.error(numero, f"{modelo.rut}-{modelo.DV_rut}", mensajes)
+            else:
+                a_insertar.append((modelo, ids))
+
+        if a_insertar and not dry_run:
+            await _insertar_lote(db, empresa_id, a_insertar)
+        resultado.insertados += len(a_insertar)
+
+    resultado.errores.sort(key=lambda e: e["fila"])
+    return resultado
@@ -0,0 +1,361 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, NamedTuple, Optional, Tuple, Type
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy import delete, inspect, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal, SessionLocal, engine
+from app.models.jobs import JOB_COMPLETADO, JOB_EN_PROCESO, JOB_ERROR, JOB_PENDIENTE, Job
+from app.schemas.jobs import ListadoContratosJobRequest
+from app.schemas.pdf_contrato import PDFContratoRequest
+from app.schemas.pdf_epp import PDFEppBatchRequest, PDFEppRequest
+from app.schemas.pdf_odi import PDFOdiRequest
+from app.schemas.pdf_termino_contrato import PDFTerminoContratoRequest
+from app.services.documentos import datos_contrato, datos_epp, datos_epp_lote, datos_odi, datos_termino_contrato
+from app.services.excel_generator import XLSX_MEDIA_TYPE, generar_listado_contratos
+from app.services.pdf_render import PDFRenderBusy, pdf_render_service
+from app.services.reintentos import backoff
+from app.services.zip_stream import iter_zip
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Jobs que esta instancia procesa a la vez (0 = la API solo encola y otro
+# proceso, `python -m app.services.jobs`, los ejecuta)
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "2"))
+# Segundos entre consultas a la cola cuando no hay trabajo
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1"))
+# Segundos máximos de renderizado por job (más holgado que el de los endpoints)
+JOBS_TIMEOUT = float(os.getenv("JOBS_TIMEOUT", "600"))
+# Intentos ante errores inesperados antes de marcar el job como fallido
+JOBS_MAX_INTENTOS = int(os.getenv("JOBS_MAX_INTENTOS", "3"))
+# Espera entre intentos: base * 2^(intento - 1) segundos, con tope y ±20 % de jitter
+JOBS_RETRY_BASE_SECONDS = float(os.getenv("JOBS_RETRY_BASE_SECONDS", "10"))
+JOBS_RETRY_MAX_SECONDS = float(os.getenv("JOBS_RETRY_MAX_SECONDS", "300"))
+# Horas que se conservan los resultados (y errores) antes de borrarlos
+JOBS_RESULT_TTL_HOURS = float(os.getenv("JOBS_RESULT_TTL_HOURS", "24"))
+
+PDF_MEDIA_TYPE = "application/pdf"
+
+# Cada cuántos segundos se borran resultados vencidos y se recuperan jobs
+# abandonados (worker caído a mitad de un documento)
+_MANTENCION_INTERVALO = 300
+
+# (contenido, media_type, filename)
+Resultado = Tuple[bytes, str, str]
+
+
+class TipoJob(NamedTuple):
+    schema: Type[BaseModel]
+    ejecutar: Callable[[AsyncSession, int, BaseModel], Awaitable[Resultado]]
+
+
+# ==============================================================
+# Tipos de job: mismos datos y generadores que los endpoints síncronos
+# ==============================================================
+
+async def _render(tipo: str, data):
+    return await pdf_render_service.render(tipo, data, timeout=JOBS_TIMEOUT)
+
+
+async def _epp(db: AsyncSession, empresa_id: int, datos: PDFEppRequest) -> Resultado:
+    pdf = await _render("epp", await datos_epp(db, empresa_id, datos))
+    return pdf, PDF_MEDIA_TYPE, f"entrega_epp_{datos.rut}.pdf"
+
+
+async def _epp_lote(db: AsyncSession, empresa_id: int, datos: PDFEppBatchRequest) -> Resultado:
+    ruts, lote = await datos_epp_lote(db, empresa_id, datos)
+    if datos.formato == "zip":
+        pdfs = await _render("epp_lote_separado", lote)
+        archivos = ((f"entrega_epp_{rut}.pdf", pdf) for rut, pdf in zip(ruts, pdfs))
+        return b"".join(iter_zip(archivos)), "application/zip", "entrega_epp_lote.zip"
+    return await _render("epp_lote", lote), PDF_MEDIA_TYPE, "entrega_epp_lote.pdf"
+
+
+async def _odi(db: AsyncSession, empresa_id: int, datos: PDFOdiRequest) -> Resultado:
+    pdf = await _render("odi", await datos_odi(db, empresa_id, datos))
+    return pdf, PDF_MEDIA_TYPE, f"entrega_odi_{datos.rut}.pdf"
+
+
+async def _contrato(db: AsyncSession, empresa_id: int, datos: PDFContratoRequest) -> Resultado:
+    pdf = await _render("contrato", await datos_contrato(db, empresa_id, datos))
+    return pdf, PDF_MEDIA_TYPE, f"contrato_{datos.rut_trabajador}.pdf"
+
+
+async def _termino_contrato(db: AsyncSession, empresa_id: int, datos: PDFTerminoContratoRequest) -> Resultado:
+    pdf = await _render("termino_contrato", await datos_termino_contrato(db, empresa_id, datos))
+    return pdf, PDF_MEDIA_TYPE, f"termino_contrato_{datos.rut_trabajador}.pdf"
+
+
+def _listado_contratos_sync(empresa_id: int) -> Resultado:
+    # openpyxl es CPU + sesión síncrona: corre en el threadpool
+    with SessionLocal() as db:
+        buffer, total = generar_listado_contratos(db, empresa_id)
+    if total == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No se encontraron contratos para esta empresa"
+        )
+    filename = f"listado_contratos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return buffer.getvalue(), XLSX_MEDIA_TYPE, filename
+
+
+async def _listado_contratos(db: AsyncSession, empresa_id: int, datos: ListadoContratosJobRequest) -> Resultado:
+    return await run_in_threadpool(_listado_contratos_sync, empresa_id)
+
+
+TIPOS_JOB = {
+    "epp": TipoJob(PDFEppRequest, _epp),
+    "epp_lote": TipoJob(PDFEppBatchRequest, _epp_lote),
+    "odi": TipoJob(PDFOdiRequest, _odi),
+    "contrato": TipoJob(PDFContratoRequest, _contrato),
+    "termino_contrato": TipoJob(PDFTerminoContratoRequest, _termino_contrato),
+    "listado_contratos": TipoJob(ListadoContratosJobRequest, _listado_contratos),
+}
+
+
+# ==============================================================
+# Cola (tabla job)
+# ==============================================================
+
+def _ahora() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def crear_tabla_jobs(bind=engine) -> None:
+    """Crea la tabla job si no existe (no forma parte de generated.py)."""
+    Job.__table__.create(bind=bind, checkfirst=True)
+    # Tablas creadas antes de los reintentos con backoff no tienen proximo_intento
+    if "proximo_intento" not in {c["name"] for c in inspect(bind).get_columns(Job.__tablename__)}:
+        tipo = Job.__table__.c.proximo_intento.type.compile(dialect=bind.dialect)
+        with bind.begin() as conn:
+            conn.exec_driver_sql(f"ALTER TABLE {Job.__tablename__} ADD COLUMN proximo_intento {tipo}")
+
+
+async def encolar_job(db: AsyncSession, kind: str, empresa_id: int, usuario_id: Optional[int], datos: BaseModel) -> Job:
+    job = Job(
+        id_job=str(uuid.uuid4()),
+        kind=kind,
+        estado=JOB_PENDIENTE,
+        id_empresa=empresa_id,
+        id_usuario=usuario_id,
+        payload=datos.model_dump(mode="json"),
+        intentos=0,
+        creado=_ahora(),
+    )
+    db.add(job)
+    await db.commit()
+    job_runner.notificar()
+    return job
+
+
+async def _tomar_siguiente(db: AsyncSession) -> Optional[str]:
+    """
+    Marca como en_proceso el pendiente más antiguo cuya espera tras un
+    error ya venció, y devuelve su id.
+    FOR UPDATE SKIP LOCKED reparte la cola entre workers de distintos
+    procesos sin que dos tomen el mismo job (SQLite lo ignora: ahí el
+    UPDATE ya se serializa con el bloqueo de la base).
+    """
+    siguiente = (
+        select(Job.id_job)
+        .where(Job.estado == JOB_PENDIENTE,
+               or_(Job.proximo_intento.is_(None), Job.proximo_intento <= _ahora()))
+        .order_by(Job.creado)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    id_job = (await db.execute(
+        update(Job)
+        .where(Job.id_job == siguiente, Job.estado == JOB_PENDIENTE)
+        .values(estado=JOB_EN_PROCESO, iniciado=_ahora(), intentos=Job.intentos + 1)
+        .returning(Job.id_job)
+        .execution_options(synchronize_session=False)
+    )).scalar()
+    await db.commit()
+    return id_job
+
+
+async def _terminar(db: AsyncSession, id_job: str, **valores) -> None:
+    await db.execute(
+        update(Job).where(Job.id_job == id_job).values(**valores)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def procesar_siguiente() -> bool:
+    """Ejecuta un job pendiente. Devuelve False si la cola estaba vacía."""
+    async with AsyncSessionLocal() as db:
+        id_job = await _tomar_siguiente(db)
+        if id_job is None:
+            return False
+
+        job = await db.get(Job, id_job)
+        # Copias: tras un rollback el objeto expira y no se puede recargar en async
+        kind, intentos = job.kind, job.intentos
+        tipo = TIPOS_JOB[kind]
+        try:
+            contenido, media_type, filename = await tipo.ejecutar(
+                db, job.id_empresa, tipo.schema.model_validate(job.payload)
+            )
+        except PDFRenderBusy:
+            # Pool de renderizado lleno por los endpoints síncronos: el job
+            # vuelve a la cola sin gastar un intento
+            await db.rollback()
+            await _terminar(db, id_job, estado=JOB_PENDIENTE, iniciado=None, intentos=Job.intentos - 1)
+            return False
+        except HTTPException as e:
+            # Errores de negocio (trabajador inexistente, RUT inválido...): no se reintentan
+            await db.rollback()
+            await _terminar(db, id_job, estado=JOB_ERROR, error=str(e.detail), terminado=_ahora())
+            return True
+        except Exception as e:
+            await db.rollback()
+            logger.exception("Job %s (%s) falló en el intento %s", id_job, kind, intentos)
+            if intentos < JOBS_MAX_INTENTOS:
+                # Sin espera, un fallo transitorio (base caída, disco lleno) gasta
+                # todos los intentos en segundos
+                await _terminar(
+                    db, id_job, estado=JOB_PENDIENTE, iniciado=None, error=repr(e),
+                    proximo_intento=_ahora() + backoff(intentos, JOBS_RETRY_BASE_SECONDS, JOBS_RETRY_MAX_SECONDS),
+                )
+            else:
+                await _terminar(db, id_job, estado=JOB_ERROR, error=f"Error al generar el documento: {e!r}", terminado=_ahora())
+            return True
+
+        await _terminar(
+            db, id_job,
+            estado=JOB_COMPLETADO,
+            resultado=contenido,
+            media_type=media_type,
+            filename=filename,
+            error=None,
+            terminado=_ahora(),
+        )
+        return True
+
+
+async def mantencion() -> None:
+    """Borra resultados vencidos y devuelve a la cola los jobs abandonados."""
+    ahora = _ahora()
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(Job)
+            .where(Job.estado.in_([JOB_COMPLETADO, JOB_ERROR]),
+                   Job.terminado < ahora - timedelta(hours=JOBS_RESULT_TTL_HOURS))
+            .execution_options(synchronize_session=False)
+        )
+        # Un job en_proceso por más del doble del timeout quedó huérfano
+        # (proceso reiniciado o caído): se reintenta o se da por fallido
+        abandonado = (Job.estado == JOB_EN_PROCESO) & (Job.iniciado < ahora - timedelta(seconds=2 * JOBS_TIMEOUT))
+        await db.execute(
+            update(Job)
+            .where(abandonado, Job.intentos < JOBS_MAX_INTENTOS)
+            .values(estado=JOB_PENDIENTE, iniciado=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            update(Job)
+            .where(abandonado)
+            .values(estado=JOB_ERROR, error="El job no terminó (worker interrumpido)", terminado=ahora)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+# ==============================================================
+# Runner: tareas asyncio que consumen la cola
+# ==============================================================
+
+class JobRunner:
+    """
+    `workers` tareas asyncio que toman jobs de la tabla. El trabajo pesado no
+    corre en el event loop: los PDF van al pool de procesos de pdf_render y
+    el Excel al threadpool, así que los jobs comparten la capacidad de
+    renderizado con los endpoints síncronos sin bloquear la API.
+    """
+
+    def __init__(self, workers: int = JOBS_WORKERS, poll_interval: float = JOBS_POLL_INTERVAL):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tareas = []
+        self._aviso: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        if self.workers <= 0 or self._tareas:
+            return
+        self._aviso = asyncio.Event()
+        self._tareas = [asyncio.create_task(self._consumir()) for _ in range(self.workers)]
+        self._tareas.append(asyncio.create_task(self._mantener()))
+
+    async def stop(self) -> None:
+        # Un job interrumpido queda en_proceso y mantencion() lo reencola
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._tareas = []
+
+    def notificar(self) -> None:
+        """Despierta a los workers de este proceso (job recién encolado)."""
+        if self._aviso is not None:
+            self._aviso.set()
+
+    async def _esperar(self) -> None:
+        try:
+            await asyncio.wait_for(self._aviso.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._aviso.clear()
+
+    async def _consumir(self) -> None:
+        while True:
+            try:
+                procesado = await procesar_siguiente()
+            except Exception:
+                logger.exception("Error consultando la cola de jobs")
+                procesado = False
+            if not procesado:
+                await self._esperar()
+
+    async def _mantener(self) -> None:
+        while True:
+            try:
+                await mantencion()
+            except Exception:
+                logger.exception("Error en la mantención de jobs")
+            await asyncio.sleep(_MANTENCION_INTERVALO)
+
+
+job_runner = JobRunner()
+
+
+async def _worker_main(workers: int) -> None:
+    crear_tabla_jobs()
+    pdf_render_service.start()
+    runner = JobRunner(workers=workers)
+    runner.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.stop()
+        pdf_render_service.shutdown()
+
+
+if __name__ == "__main__":
+    # Worker dedicado: `python -m app.services.jobs` (usar con JOBS_WORKERS=0 en la API)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_worker_main(max(JOBS_WORKERS, 1)))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,301 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Request
+from sqlalchemy import event
+from starlette.routing import Match
+
+load_dotenv()
+
+# Middleware de métricas por request (false = solo quedan las métricas de documentos)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# Si se define, /metrics exige "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BUCKETS_SENTENCIAS = (1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+BUCKETS_DOCUMENTOS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+# ==============================================================
+# Registro en formato de exposición de texto de Prometheus
+# ==============================================================
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(nombres: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    partes = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+def _numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _clave(self, etiquetas: dict) -> Tuple[str, ...]:
+        return tuple(str(etiquetas[n]) for n in self.etiquetas)
+
+    def exportar(self) -> List[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for clave, valor in series:
+            lineas.extend(self._lineas(clave, valor))
+        return lineas
+
+    def _lineas(self, clave, valor) -> Iterable[str]:
+        yield f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {_numero(valor)}"
+
+
+class Counter(_Metrica):
+    tipo = "counter"
+
+    def inc(self, cantidad: float = 1, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + cantidad
+
+
+class Gauge(_Metrica):
+    tipo = "gauge"
+
+    def inc(self, cantidad: float = 1, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        with self._lock:
+            self._series[clave] = self._series.get(clave, 0) + cantidad
+
+    def dec(self, cantidad: float = 1, **etiquetas) -> None:
+        self.inc(-cantidad, **etiquetas)
+
+    def set(self, valor: float, **etiquetas) -> None:
+        with self._lock:
+            self._series[self._clave(etiquetas)] = valor
+
+
+class Histogram(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (), buckets: Sequence[float] = BUCKETS_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, valor: float, **etiquetas) -> None:
+        clave = self._clave(etiquetas)
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                # [conteo por bucket (no acumulado)..., +Inf, suma]
+                serie = self._series[clave] = [0] * (len(self.buckets) + 1) + [0.0]
+            serie[indice] += 1
+            serie[-1] += valor
+
+    def _lineas(self, clave, serie) -> Iterable[str]:
+        acumulado = 0
+        for limite, conteo in zip(self.buckets + (float("inf"),), serie[:-1]):
+            acumulado += conteo
+            le = 'le="' + _numero(limite) + '"'
+            yield f"{self.nombre}_bucket{_etiquetas(self.etiquetas, clave, le)} {acumulado}"
+        yield f"{self.nombre}_sum{_etiquetas(self.etiquetas, clave)} {_numero(serie[-1])}"
+        yield f"{self.nombre}_count{_etiquetas(self.etiquetas, clave)} {acumulado}"
+
+
+class Registro:
+    def __init__(self):
+        self._metricas: List[_Metrica] = []
+
+    def registrar(self, metrica: _Metrica) -> _Metrica:
+        self._metricas.append(metrica)
+        return metrica
+
+    def exportar(self) -> str:
+        lineas = []
+        for metrica in self._metricas:
+            lineas.extend(metrica.exportar())
+        return "\n".join(lineas) + "\n"
+
+
+registro = Registro()
+
+http_requests = registro.registrar(Counter(
+    "http_requests_total", "Requests atendidos por ruta y status.", ("method", "route", "status")))
+http_duracion = registro.registrar(Histogram(
+    "http_request_duration_seconds", "Latencia de los requests por ruta.", ("method", "route")))
+http_en_curso = registro.registrar(Gauge(
+    "http_requests_in_progress", "Requests en curso por ruta.", ("method", "route")))
+sql_por_request = registro.registrar(Histogram(
+    "db_statements_per_request", "Sentencias SQL ejecutadas por request (detecta N+1).",
+    ("method", "route"), BUCKETS_SENTENCIAS))
+sql_segundos_por_request = registro.registrar(Histogram(
+    "db_statement_seconds_per_request", "Tiempo en la base de datos por request.", ("method", "route")))
+sql_total = registro.registrar(Counter(
+    "db_statements_total", "Sentencias SQL ejecutadas (incluye jobs y tareas en segundo plano)."))
+sql_segundos_total = registro.registrar(Counter(
+    "db_statement_seconds_total", "Tiempo total en sentencias SQL."))
+documento_duracion = registro.registrar(Histogram(
+    "document_render_seconds", "Duración de la generación de documentos (PDF / Excel).",
+    ("formato", "tipo"), BUCKETS_DOCUMENTOS))
+
+
+@contextmanager
+def medir_documento(formato: str, tipo: str):
+    """Registra la duración de un documento generado sin errores."""
+    inicio = time.perf_counter()
+    yield
+    documento_duracion.observe(time.perf_counter() - inicio, formato=formato, tipo=tipo)
+
+
+# ==============================================================
+# Sentencias SQL por request
+# ==============================================================
+
+class EstadisticasSQL:
+    __slots__ = ("sentencias", "segundos", "formas")
+
+    def __init__(self):
+        self.sentencias = 0
+        self.segundos = 0.0
+        # Conteo por forma de sentencia (presupuesto_sql.ConteoSQL), solo si
+        # el detector de N+1 está activo
+        self.formas = None
+
+
+# Los middlewares comparten un acumulador por request; los eventos del engine
+# lo encuentran por contextvar (también desde el threadpool y el greenlet async)
+_sql_request: ContextVar[Optional[EstadisticasSQL]] = ContextVar("metrics_sql_request", default=None)
+# Conteos abiertos para todo el proceso (presupuesto_sql en tests: TestClient
+# corre la app en otro hilo, fuera del contextvar del test)
+_conteos_proceso: List = []
+_conteos_lock = threading.Lock()
+
+
+@contextmanager
+def sql_del_request():
+    """
+    Acumulador SQL del request en curso. El primer middleware que lo pide lo
+    crea y los siguientes reutilizan el mismo.
+    """
+    estadisticas = _sql_request.get()
+    if estadisticas is not None:
+        yield estadisticas
+        return
+    estadisticas = EstadisticasSQL()
+    token = _sql_request.set(estadisticas)
+    try:
+        yield estadisticas
+    finally:
+        _sql_request.reset(token)
+
+
+@contextmanager
+def contar_sentencias_proceso(conteo):
+    """Registra en `conteo` cada sentencia que se ejecute en el proceso mientras dure el bloque."""
+    with _conteos_lock:
+        _conteos_proceso.append(conteo)
+    try:
+        yield conteo
+    finally:
+        with _conteos_lock:
+            _conteos_proceso.remove(conteo)
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_inicio", []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    duracion = time.perf_counter() - conn.info["metrics_inicio"].pop()
+    sql_total.inc()
+    sql_segundos_total.inc(duracion)
+    estadisticas = _sql_request.get()
+    if estadisticas is not None:
+        estadisticas.sentencias += 1
+        estadisticas.segundos += duracion
+        if estadisticas.formas is not None:
+            estadisticas.formas.registrar(statement)
+    if _conteos_proceso:
+        with _conteos_lock:
+            abiertos = list(_conteos_proceso)
+        for conteo in abiertos:
+            conteo.registrar(statement)
+
+
+def instrumentar_engine(engine) -> None:
+    """
+    Cuenta y cronometra las sentencias de un engine síncrono (o
+    `async_engine.sync_engine`) para /metrics, el detector de N+1 y
+    presupuesto_sql. Idempotente.
+    """
+    if not event.contains(engine, "before_cursor_execute", _antes_de_ejecutar):
+        event.listen(engine, "before_cursor_execute", _antes_de_ejecutar)
+        event.listen(engine, "after_cursor_execute", _despues_de_ejecutar)
+
+
+# ==============================================================
+# Middleware HTTP
+# ==============================================================
+
+def _rutas(rutas) -> Iterable:
+    # include_router deja cada router incluido envuelto; sus rutas ya tienen el prefijo
+    for ruta in rutas:
+        incluido = getattr(ruta, "original_router", None)
+        if incluido is not None:
+            yield from _rutas(incluido.routes)
+        else:
+            yield ruta
+
+
+def plantilla_ruta(request: Request) -> str:
+    # La plantilla (/trabajadores/{id}) y no la URL: acota la cardinalidad
+    parcial = None
+    for ruta in _rutas(request.app.router.routes):
+        coincidencia, _ = ruta.matches(request.scope)
+        if coincidencia == Match.FULL:
+            return getattr(ruta, "path", "sin_ruta")
+        if coincidencia == Match.PARTIAL and parcial is None:
+            parcial = getattr(ruta, "path", None)
+    return parcial or "sin_ruta"
+
+
+async def metrics_middleware(request: Request, call_next):
+    metodo = request.method
+    ruta = plantilla_ruta(request)
+    http_en_curso.inc(method=metodo, route=ruta)
+    inicio = time.perf_counter()
+    status_code = 500
+    with sql_del_request() as estadisticas:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            duracion = time.perf_counter() - inicio
+            http_en_curso.dec(method=metodo, route=ruta)
+            http_requests.inc(method=metodo, route=ruta, status=status_code)
+            http_duracion.observe(duracion, method=metodo, route=ruta)
+            sql_por_request.observe(estadisticas.sentencias, method=metodo, route=ruta)
+            sql_segundos_por_request.observe(estadisticas.segundos, method=metodo, route=ruta)
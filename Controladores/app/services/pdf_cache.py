@@ -0,0 +1,259 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Memoria máxima (MB) para documentos recientes en este proceso (0 = sin caché en memoria)
+PDF_CACHE_MEMORY_MB = float(os.getenv("PDF_CACHE_MEMORY_MB", "32"))
+# Disco máximo (MB) en PDF_CACHE_DIR, compartido entre procesos (0 = sin caché en disco)
+PDF_CACHE_DISK_MB = float(os.getenv("PDF_CACHE_DISK_MB", "256"))
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "pdf_cache")
+
+# Documentos individuales de los endpoints /generate-pdf*
+TIPOS_CACHEABLES = {"epp", "odi", "contrato", "termino_contrato"}
+
+
+def _version_generadores() -> str:
+    # Un cambio en el código de los generadores invalida lo que quedó en disco
+    # (sin importar ReportLab en el proceso principal)
+    origen = importlib.util.find_spec("app.services.pdf_generator").origin
+    with open(origen, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+_VERSION = _version_generadores()
+
+
+def _normalizar(valor):
+    if isinstance(valor, SimpleNamespace):
+        return {k: _normalizar(v) for k, v in vars(valor).items()}
+    if isinstance(valor, BaseModel):
+        return _normalizar(valor.model_dump())
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return valor
+    raise TypeError(f"Tipo no soportado en la clave de caché: {type(valor).__name__}")
+
+
+def clave_documento(tipo: str, data) -> str:
+    """
+    sha256 de los datos ya resueltos que recibe el generador: empresa,
+    trabajador, elementos EPP/ODI, cláusulas y fechas. Como esos datos se
+    leen de la base en cada request, cualquier cambio en Empresa,
+    DatosTrabajador, Epp u Odi que afecte al documento produce otra clave.
+    Incluye la fecha de hoy porque ODI y contrato imprimen la fecha actual.
+    """
+    contenido = json.dumps(
+        [_VERSION, tipo, date.today().isoformat(), _normalizar(data)],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+class DocumentCache:
+    """
+    Caché LRU de documentos por clave de contenido, en dos niveles:
+    memoria del proceso y archivos en disco (compartidos entre procesos
+    uvicorn y que sobreviven a un reinicio). Ambos niveles se acotan en
+    bytes y desalojan lo menos usado. Thread-safe.
+
+    La caché nunca hace fallar un request: un error de disco (sin espacio,
+    solo lectura, permisos) se registra y cuenta, y se sigue como si fuera
+    un fallo de caché.
+    """
+
+    def __init__(self, memoria_bytes: int, disco_bytes: int, directorio: str):
+        self.memoria_bytes = memoria_bytes
+        self.disco_bytes = disco_bytes
+        self.directorio = directorio
+        self._lock = threading.Lock()
+        self._memoria = OrderedDict()
+        self._en_memoria = 0
+        self._disco = None  # OrderedDict clave → tamaño, se carga al primer uso
+        self._en_disco = 0
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+        self.desalojos = 0
+        self.errores_disco = 0
+
+    @property
+    def habilitado(self) -> bool:
+        return self.memoria_bytes > 0 or self.disco_bytes > 0
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.pdf")
+
+    # ---------- memoria ----------
+
+    def get_memoria(self, clave: str) -> Optional[bytes]:
+        with self._lock:
+            contenido = self._memoria.get(clave)
+            if contenido is not None:
+                self._memoria.move_to_end(clave)
+                self.hits_memoria += 1
+            return contenido
+
+    def _put_memoria(self, clave: str, contenido: bytes) -> None:
+        if len(contenido) > self.memoria_bytes:
+            return
+        with self._lock:
+            anterior = self._memoria.pop(clave, None)
+            if anterior is not None:
+                self._en_memoria -= len(anterior)
+            self._memoria[clave] = contenido
+            self._en_memoria += len(contenido)
+            while self._en_memoria > self.memoria_bytes:
+                _, desalojado = self._memoria.popitem(last=False)
+                self._en_memoria -= len(desalojado)
+                self.desalojos += 1
+
+    # ---------- disco ----------
+
+    def _error_disco(self, operacion: str, error: OSError) -> None:
+        with self._lock:
+            self.errores_disco += 1
+        logger.warning("Caché de PDF: no se pudo %s en %s: %r", operacion, self.directorio, error)
+
+    def _indice_disco(self) -> OrderedDict:
+        # Llamar con el lock tomado. Orden LRU inicial según mtime de los archivos
+        if self._disco is None:
+            os.makedirs(self.directorio, exist_ok=True)
+            archivos = []
+            for entrada in os.scandir(self.directorio):
+                if entrada.name.endswith(".pdf"):
+                    stat = entrada.stat()
+                    archivos.append((stat.st_mtime, entrada.name[:-4], stat.st_size))
+            self._disco = OrderedDict((clave, tam) for _, clave, tam in sorted(archivos))
+            self._en_disco = sum(self._disco.values())
+        return self._disco
+
+    def get_disco(self, clave: str) -> Optional[bytes]:
+        """Lectura en disco (bloqueante: llamar desde el threadpool)."""
+        if self.disco_bytes <= 0:
+            with self._lock:
+                self.misses += 1
+            return None
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+        except OSError as e:
+            if not isinstance(e, FileNotFoundError):
+                self._error_disco("leer", e)
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(ruta)  # mtime = último uso, para el orden LRU tras un reinicio
+        except OSError:
+            pass
+        try:
+            with self._lock:
+                self.hits_disco += 1
+                indice = self._indice_disco()
+                if clave not in indice:
+                    # Escrito por otro proceso
+                    indice[clave] = len(contenido)
+                    self._en_disco += len(contenido)
+                indice.move_to_end(clave)
+        except OSError as e:
+            self._error_disco("listar", e)
+        if self.memoria_bytes > 0:
+            self._put_memoria(clave, contenido)
+        return contenido
+
+    def _put_disco(self, clave: str, contenido: bytes) -> None:
+        if len(contenido) > self.disco_bytes:
+            return
+        with self._lock:
+            indice = self._indice_disco()
+        # Escritura atómica: un lector concurrente nunca ve un PDF a medias
+        temporal = f"{self._ruta(clave)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporal, "wb") as f:
+                f.write(contenido)
+            os.replace(temporal, self._ruta(clave))
+        except OSError:
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            raise
+
+        desalojar = []
+        with self._lock:
+            self._en_disco -= indice.pop(clave, 0)
+            indice[clave] = len(contenido)
+            self._en_disco += len(contenido)
+            while self._en_disco > self.disco_bytes:
+                desalojada, tam = indice.popitem(last=False)
+                self._en_disco -= tam
+                self.desalojos += 1
+                desalojar.append(desalojada)
+        for desalojada in desalojar:
+            try:
+                os.remove(self._ruta(desalojada))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._error_disco("desalojar", e)
+
+    def put(self, clave: str, contenido: bytes) -> None:
+        """
+        Guarda en ambos niveles (bloqueante por el disco: usar el threadpool).
+        Un error de disco solo deja el documento fuera de ese nivel.
+        """
+        if self.memoria_bytes > 0:
+            self._put_memoria(clave, contenido)
+        if self.disco_bytes > 0:
+            try:
+                self._put_disco(clave, contenido)
+            except OSError as e:
+                self._error_disco("escribir", e)
+
+    def status(self) -> dict:
+        with self._lock:
+            consultas = self.hits_memoria + self.hits_disco + self.misses
+            return {
+                "hits_memory": self.hits_memoria,
+                "hits_disk": self.hits_disco,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits_memoria + self.hits_disco) / consultas, 4) if consultas else 0.0,
+                "evictions": self.desalojos,
+                "disk_errors": self.errores_disco,
+                "memory_entries": len(self._memoria),
+                "memory_bytes": self._en_memoria,
+                "memory_limit_bytes": self.memoria_bytes,
+                "disk_entries": len(self._disco) if self._disco is not None else None,
+                "disk_bytes": self._en_disco if self._disco is not None else None,
+                "disk_limit_bytes": self.disco_bytes,
+            }
+
+
+pdf_cache = DocumentCache(
+    memoria_bytes=int(PDF_CACHE_MEMORY_MB * 1024 * 1024),
+    disco_bytes=int(PDF_CACHE_DISK_MB * 1024 * 1024),
+    directorio=PDF_CACHE_DIR,
+)
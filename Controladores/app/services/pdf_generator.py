@@ -1,5 +1,6 @@
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether
+from reportlab.platypus.flowables import Flowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
@@ -7,9 +8,12 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
 from reportlab.platypus.frames import Frame
 from datetime import datetime
+from types import MappingProxyType
 from typing import List
 from collections import defaultdict
-import os
+from xml.sax.saxutils import escape as xml_escape
+from abc import ABC, abstractmethod
+from io import BytesIO
 
 
 from app.schemas.pdf_epp import PDFEppRequest
@@ -18,121 +22,322 @@ from app.schemas.pdf_contrato import PDFContratoRequest
 from app.schemas.pdf_termino_contrato import PDFTerminoContratoRequest
 
 
-class PDFEppGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.create_custom_styles()
-
-    def create_custom_styles(self):
-        # Estilo para el título principal
-        self.title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            alignment=TA_CENTER,
-            spaceAfter=18,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Estilo para el encabezado (más pequeño)
-        self.header_style = ParagraphStyle(
-            'HeaderStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_LEFT,
-            spaceAfter=3
-        )
-        
-        # Estilo para el texto legal
-        self.legal_style = ParagraphStyle(
-            'LegalStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12
-        )
-        
-        # Estilo para certificación
-        self.cert_style = ParagraphStyle(
-            'CertStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceBefore=12,
-            spaceAfter=20
-        )
-        
-        # Estilo para firmas
-        self.signature_style = ParagraphStyle(
-            'SignatureStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=6
-        )
-
-    def generate_pdf(self, data: PDFEppRequest) -> str:
-        # Crear directorio para PDFs si no existe
-        pdf_dir = "generated_pdfs"
-        os.makedirs(pdf_dir, exist_ok=True)
-        
-        # Nombre del archivo
+# ==============================================================
+# Registro de estilos compartido (se construye una vez por proceso)
+# ==============================================================
+
+class EstiloInmutable(ParagraphStyle):
+    """ParagraphStyle de solo lectura: se comparte entre hilos y documentos."""
+
+    def __init__(self, name, parent=None, **kw):
+        super().__init__(name, parent, **kw)
+        object.__setattr__(self, "_congelado", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_congelado", False):
+            raise AttributeError(f"El estilo '{self.name}' es compartido y no se puede modificar")
+        super().__setattr__(name, value)
+
+
+def construir_estilos() -> dict:
+    """Crea todos los estilos de los documentos a partir del 'Normal' de ReportLab."""
+    # ReportLab exige que padre e hijo sean de la misma clase
+    base = getSampleStyleSheet()['Normal']
+    normal = EstiloInmutable('Normal', **{k: v for k, v in vars(base).items() if k not in ('name', 'parent')})
+    return {
+        # Títulos
+        'titulo': EstiloInmutable('TitleStyle', parent=normal, fontSize=16, alignment=TA_CENTER,
+                                  spaceAfter=18, fontName='Helvetica-Bold'),
+        'titulo_contrato': EstiloInmutable('TitleStyle', parent=normal, fontSize=14, alignment=TA_CENTER,
+                                           spaceAfter=12, fontName='Helvetica-Bold'),
+        'titulo_tabla': EstiloInmutable('TableTitleStyle', parent=normal, fontSize=12, alignment=TA_JUSTIFY,
+                                        spaceAfter=6),
+        'empresa': EstiloInmutable('EmpresaStyle', parent=normal, fontSize=12, alignment=TA_CENTER,
+                                   spaceAfter=18, fontName='Helvetica-Bold'),
+        # Encabezado y fecha
+        'encabezado': EstiloInmutable('HeaderStyle', parent=normal, fontSize=10, alignment=TA_LEFT,
+                                      spaceAfter=3),
+        'fecha': EstiloInmutable('FechaStyle', parent=normal, fontSize=10, alignment=TA_CENTER,
+                                 spaceAfter=12),
+        # Cuerpo
+        'legal': EstiloInmutable('LegalStyle', parent=normal, fontSize=10, alignment=TA_JUSTIFY,
+                                 spaceAfter=12),
+        'certificacion': EstiloInmutable('CertStyle', parent=normal, fontSize=10, alignment=TA_JUSTIFY,
+                                         spaceBefore=12, spaceAfter=20),
+        'contrato': EstiloInmutable('ContratoStyle', parent=normal, fontSize=10, alignment=TA_JUSTIFY,
+                                    spaceAfter=12, leading=14),
+        'normal': EstiloInmutable('NormalStyle', parent=normal, fontSize=10, alignment=TA_LEFT,
+                                  spaceAfter=6),
+        'justificado': EstiloInmutable('JustifyStyle', parent=normal, fontSize=10, alignment=TA_JUSTIFY,
+                                       spaceAfter=6),
+        # Celdas de tabla (texto envuelve)
+        'celda_tabla': EstiloInmutable('TableCell', parent=normal, fontSize=9, leading=11, alignment=TA_LEFT,
+                                       spaceBefore=0, spaceAfter=0),
+        # Firmas
+        'firma': EstiloInmutable('SignatureStyle', parent=normal, fontSize=10, alignment=TA_CENTER,
+                                 spaceAfter=6),
+    }
+
+
+# Solo lectura: los generadores toman sus estilos de aquí
+ESTILOS = MappingProxyType(construir_estilos())
+
+
+class ParrafoFijo:
+    """
+    Texto estático (cláusulas legales, certificaciones) parseado una sola vez.
+    Cada documento recibe su propio Paragraph, porque ReportLab guarda el
+    estado del layout (wrap/split) en la instancia.
+    """
+
+    def __init__(self, texto: str, estilo: ParagraphStyle):
+        self._base = Paragraph(texto, estilo)
+        # Un layout de prueba completa los cachés internos de los fragmentos
+        # (p. ej. _fkind); desde aquí los fragmentos son de solo lectura
+        self.nuevo().wrap(*A4)
+
+    def nuevo(self) -> Paragraph:
+        base = self._base
+        return Paragraph(base.text, base.style, bulletText=base.bulletText, frags=base.frags)
+
+
+class BasePDFGenerator(ABC):
+    """
+    Salida en memoria común a todos los generadores (generate_pdf_bytes).
+    Cada generador implementa render(data, destino), donde destino es un
+    objeto file-like, y _filename(data) con el nombre sugerido del archivo.
+    """
+
+    @abstractmethod
+    def _filename(self, data) -> str:
+        ...
+
+    @abstractmethod
+    def render(self, data, destino) -> None:
+        ...
+
+    def generate_pdf_bytes(self, data) -> BytesIO:
+        # Renderiza en memoria: sin escritura a disco ni colisiones de nombre
+        buffer = BytesIO()
+        self.render(data, buffer)
+        buffer.seek(0)
+        return buffer
+
+
+# Bloques de firma al final de contrato y carta de término (definidos una
+# sola vez a nivel de módulo en lugar de en cada render)
+class ContratoSignatureBlock(Flowable):
+    def __init__(self, empresa_nombre, empresa_rut, trabajador_nombre, trabajador_rut):
+        Flowable.__init__(self)
+        self.empresa_nombre = empresa_nombre
+        self.empresa_rut = empresa_rut
+        self.trabajador_nombre = trabajador_nombre
+        self.trabajador_rut = trabajador_rut
+        self.width = 450
+        self.height = 80
+
+    def draw(self):
+        canvas = self.canv
+
+        # Líneas para firmas (alineadas igual que EPP)
+        canvas.line(28, 60, 208, 60)  # Línea empresa
+        canvas.line(248, 60, 428, 60)  # Línea trabajador
+
+        # Textos de firma - empresa
+        canvas.setFont("Helvetica-Bold", 10)
+        canvas.drawCentredString(118, 45, self.empresa_nombre)
+        canvas.drawCentredString(118, 33, self.empresa_rut)
+        canvas.drawCentredString(118, 21, "EMPLEADOR")
+
+        # Textos de firma - trabajador
+        canvas.drawCentredString(338, 45, self.trabajador_nombre)
+        canvas.drawCentredString(338, 33, self.trabajador_rut)
+        canvas.drawCentredString(338, 21, "TRABAJADOR")
+
+
+class TerminoSignatureBlock(Flowable):
+    def __init__(self, empresa_nombre, empresa_rut, trabajador_nombre, trabajador_rut):
+        Flowable.__init__(self)
+        self.empresa_nombre = empresa_nombre
+        self.empresa_rut = empresa_rut
+        self.trabajador_nombre = trabajador_nombre
+        self.trabajador_rut = trabajador_rut
+        self.width = 450
+        self.height = 100
+
+    def draw(self):
+        canvas = self.canv
+
+        # Líneas para firmas
+        canvas.line(28, 60, 208, 60)  # Línea empresa
+        canvas.line(248, 60, 428, 60)  # Línea trabajador
+
+        # Textos de firma - empresa
+        canvas.setFont("Helvetica-Bold", 9)
+        canvas.drawCentredString(118, 45, self.empresa_nombre.upper())
+        canvas.setFont("Helvetica", 9)
+        canvas.drawCentredString(118, 33, self.empresa_rut)
+        canvas.drawCentredString(118, 21, "EMPLEADOR")
+
+        # Textos de firma - trabajador
+        canvas.setFont("Helvetica-Bold", 9)
+        canvas.drawCentredString(338, 45, self.trabajador_nombre.upper())
+        canvas.setFont("Helvetica", 9)
+        canvas.drawCentredString(338, 33, self.trabajador_rut)
+        canvas.drawCentredString(338, 21, "TRABAJADOR")
+        canvas.setFont("Helvetica", 8)
+        canvas.drawCentredString(338, 9, "Recibí Copia de la presente carta")
+
+
+class _InicioTrabajador(Flowable):
+    """Marca invisible: desde aquí las páginas pertenecen a `data`."""
+
+    def __init__(self, data):
+        Flowable.__init__(self)
+        self.data = data
+        self.width = self.height = 0
+
+    def draw(self):
+        pass
+
+
+class _DocumentoLote(SimpleDocTemplate):
+    """
+    Documento con varios trabajadores. El pie se dibuja al cerrar cada página
+    con el trabajador vigente, que cambia al pasar por un _InicioTrabajador.
+    """
+
+    def __init__(self, destino, footer, **kwargs):
+        super().__init__(destino, **kwargs)
+        self._footer = footer
+        self.trabajador_actual = None
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, _InicioTrabajador):
+            self.trabajador_actual = flowable.data
+
+    def afterPage(self):
+        if self.trabajador_actual is not None:
+            self._footer(self.canv, self.trabajador_actual)
+
+
+class PDFEppGenerator(BasePDFGenerator):
+    # Estilos compartidos entre instancias; el generador no guarda estado por
+    # documento, así que una misma instancia sirve a todos los hilos
+    title_style = ESTILOS['titulo']
+    header_style = ESTILOS['encabezado']
+    legal_style = ESTILOS['legal']
+    cert_style = ESTILOS['certificacion']
+    signature_style = ESTILOS['firma']
+
+    LEGAL = ParrafoFijo(
+        """Con el propósito de promover y mantener el nivel de seguridad y cumplimiento en lo establecido en la Ley Nº 16.744.- y sus Decretos Reglamentarios en lo relacionado al suministro de equipos de protección personal, por intermedio de la presente, se deja constancia de la provisión u entrega de los siguientes elementos de protección personal:""",
+        legal_style,
+    )
+    CERTIFICACION = ParrafoFijo(
+        """Certifico haber recibido los elementos de protección personal, como así también instrucciones para su correcto uso y reconozco la OBLIGACIÓN DE USAR, conservar y cuidar los mismos, e informar del deterioro o extravío, conforme a lo indicado anteriormente.""",
+        cert_style,
+    )
+
+    TABLE_STYLE = TableStyle([
+        # Header
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+
+        # Body
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+
+        # Altura de filas
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
+    ])
+
+    def _filename(self, data: PDFEppRequest) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"epp_delivery_{data.rut}_{timestamp}.pdf"
-        filepath = os.path.join(pdf_dir, filename)
-        
-        # Crear el documento
-        doc = SimpleDocTemplate(filepath, pagesize=A4, 
-                              rightMargin=72, leftMargin=72, 
-                              topMargin=72, bottomMargin=72)
-        
-        def create_footer(canvas, doc, data):
-            # Footer con firmas en la parte inferior
-            canvas.saveState()
-            
-            # Posición del footer (desde abajo)
-            footer_y = 120
-            
-            # Líneas para firmas
-            canvas.line(100, footer_y + 20, 280, footer_y + 20)  # Línea empresa
-            canvas.line(320, footer_y + 20, 500, footer_y + 20)  # Línea trabajador
-            
-            # Textos de firma - empresa
-            canvas.setFont("Helvetica-Bold", 10)
-            canvas.drawCentredString(190, footer_y, data.empresa_nombre)
-            canvas.drawCentredString(190, footer_y - 12, f"RUT: {data.empresa_rut}")
-            canvas.drawCentredString(190, footer_y - 24, "EMPLEADOR")
-            
-            # Textos de firma - trabajador  
-            canvas.drawCentredString(410, footer_y, data.nombre)
-            canvas.drawCentredString(410, footer_y - 12, f"RUT: {data.rut}")
-            canvas.drawCentredString(410, footer_y - 24, "TRABAJADOR")
-            
-            canvas.restoreState()
-        
+        return f"epp_delivery_{data.rut}_{timestamp}.pdf"
+
+    def _doc(self, destino, doc_class=SimpleDocTemplate, **kwargs):
+        return doc_class(destino, pagesize=A4,
+                         rightMargin=72, leftMargin=72,
+                         topMargin=72, bottomMargin=72, **kwargs)
+
+    def _create_footer(self, canvas, data) -> None:
+        # Footer con firmas en la parte inferior
+        canvas.saveState()
+
+        # Posición del footer (desde abajo)
+        footer_y = 120
+
+        # Líneas para firmas
+        canvas.line(100, footer_y + 20, 280, footer_y + 20)  # Línea empresa
+        canvas.line(320, footer_y + 20, 500, footer_y + 20)  # Línea trabajador
+
+        # Textos de firma - empresa
+        canvas.setFont("Helvetica-Bold", 10)
+        canvas.drawCentredString(190, footer_y, data.empresa_nombre)
+        canvas.drawCentredString(190, footer_y - 12, f"RUT: {data.empresa_rut}")
+        canvas.drawCentredString(190, footer_y - 24, "EMPLEADOR")
+
+        # Textos de firma - trabajador
+        canvas.drawCentredString(410, footer_y, data.nombre)
+        canvas.drawCentredString(410, footer_y - 12, f"RUT: {data.rut}")
+        canvas.drawCentredString(410, footer_y - 24, "TRABAJADOR")
+
+        canvas.restoreState()
+
+    def _story(self, data: PDFEppRequest) -> List:
         story = []
-        
+
         # Título principal
         story.append(Paragraph("REGISTRO DE ENTREGA", self.title_style))
         story.append(Paragraph("ELEMENTOS DE PROTECCIÓN PERSONAL", self.title_style))
-        
+
         # Encabezado
         story.extend(self._create_header(data))
-        
+
         # Texto legal
         story.extend(self._create_legal_text())
-        
+
         # Tabla de elementos
         story.extend(self._create_table(data.elementos))
-        
+
         # Certificación
         story.extend(self._create_certification())
-        
+        return story
+
+    def render(self, data: PDFEppRequest, destino) -> None:
+        # Crear el documento
+        doc = self._doc(destino)
+
         # Construir el PDF con footer personalizado
-        doc.build(story, onFirstPage=lambda c, d: create_footer(c, d, data), 
-                 onLaterPages=lambda c, d: create_footer(c, d, data))
-        
-        return filepath
+        doc.build(self._story(data), onFirstPage=lambda c, d: self._create_footer(c, data),
+                  onLaterPages=lambda c, d: self._create_footer(c, data))
+
+    def generate_lote_bytes(self, lista: List) -> BytesIO:
+        """
+        Un solo PDF con la entrega de varios trabajadores, cada uno desde una
+        página nueva y con su propio pie de firmas.
+        """
+        buffer = BytesIO()
+        doc = self._doc(buffer, doc_class=_DocumentoLote, footer=self._create_footer)
+        story = []
+        for i, data in enumerate(lista):
+            if i:
+                story.append(PageBreak())
+            story.append(_InicioTrabajador(data))
+            story.extend(self._story(data))
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
+
+    def generate_lote_pdfs(self, lista: List) -> List[bytes]:
+        """Un PDF por trabajador, con la misma instancia del generador."""
+        return [self.generate_pdf_bytes(data).getvalue() for data in lista]
 
     def _create_header(self, data: PDFEppRequest) -> List:
         elements = []
@@ -147,10 +352,8 @@ class PDFEppGenerator:
         return elements
 
     def _create_legal_text(self) -> List:
-        legal_text = """Con el propósito de promover y mantener el nivel de seguridad y cumplimiento en lo establecido en la Ley Nº 16.744.- y sus Decretos Reglamentarios en lo relacionado al suministro de equipos de protección personal, por intermedio de la presente, se deja constancia de la provisión u entrega de los siguientes elementos de protección personal:"""
-        
         return [
-            Paragraph(legal_text, self.legal_style),
+            self.LEGAL.nuevo(),
             Spacer(1, 12)
         ]
 
@@ -168,124 +371,77 @@ class PDFEppGenerator:
         table = Table(data, colWidths=[0.5*inch, 3.5*inch, 1*inch, 1.5*inch])
         
         # Estilo de la tabla
-        table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            
-            # Body
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            
-            # Altura de filas
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
-        ]))
+        table.setStyle(self.TABLE_STYLE)
         
         return [table, Spacer(1, 20)]
 
     def _create_certification(self) -> List:
-        cert_text = """Certifico haber recibido los elementos de protección personal, como así también instrucciones para su correcto uso y reconozco la OBLIGACIÓN DE USAR, conservar y cuidar los mismos, e informar del deterioro o extravío, conforme a lo indicado anteriormente."""
-        
         return [
-            Paragraph(cert_text, self.cert_style),
+            self.CERTIFICACION.nuevo(),
             Spacer(1, 30)
         ]
 
-class PDFOdiGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.create_custom_styles()
-
-    def create_custom_styles(self):
-        # Estilo para el título principal
-        self.title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=self.styles['Normal'],
-            fontSize=16,
-            alignment=TA_CENTER,
-            spaceAfter=18,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Estilo para el encabezado (más pequeño)
-        self.header_style = ParagraphStyle(
-            'HeaderStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_LEFT,
-            spaceAfter=3
-        )
-        
-        # Estilo para el texto legal
-        self.legal_style = ParagraphStyle(
-            'LegalStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12
-        )
-        
-        # Estilo para Titulo de tabla (tabla tarea)
-        self.table_title_style = ParagraphStyle(
-            'TableTitleStyle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            alignment=TA_JUSTIFY,
-            spaceAfter=6
-        )
-
-        # Estilo para celdas de tabla (texto envuelve)
-        self.table_cell_style = ParagraphStyle(
-            'TableCell',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            leading=11,
-            alignment=TA_LEFT,
-            spaceBefore=0,
-            spaceAfter=0
-        )
-
-        # Estilo para certificación
-        self.cert_style = ParagraphStyle(
-            'CertStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceBefore=12,
-            spaceAfter=20
-        )
-        
-        # Estilo para firmas
-        self.signature_style = ParagraphStyle(
-            'SignatureStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=6
-        )
+class PDFOdiGenerator(BasePDFGenerator):
+    title_style = ESTILOS['titulo']
+    header_style = ESTILOS['encabezado']
+    legal_style = ESTILOS['legal']
+    table_title_style = ESTILOS['titulo_tabla']
+    table_cell_style = ESTILOS['celda_tabla']
+    cert_style = ESTILOS['certificacion']
+    signature_style = ESTILOS['firma']
+
+    LEGAL = (
+        ParrafoFijo(
+            """De acuerdo a lo establecido en el artículo 8 del Decreto N°18, de 23 de abril de 2020, se informa sobre el riesgo que entrañan las actividades asociadas a su trabajo, indicando las instrucciones, métodos de trabajo y medidas preventivas necesarias para evitar los potenciales accidentes del trabajo y/o enfermedades profesionales, las cuales se le solicita leer y cumplir con todo esmero en beneficio de su propia salud.""",
+            legal_style,
+        ),
+        ParrafoFijo(
+            """Los trabajadores tienen el derecho a desistir realizar un trabajo, si éste pone en peligro su vida, por falta de medidas de seguridad. A su vez los trabajadores se comprometen a informar toda acción o condición subestándar y cumplir todas las instrucciones recibidas para evitar accidentes en el trabajo y disminuir o evitar los impactos al medio ambiente.""",
+            legal_style,
+        ),
+    )
+    CERTIFICACION = ParrafoFijo(
+        """Declaro que he sido informado y he comprendido acerca de todos los riesgos asociados a mi área de trabajo, cómo también de las medidas preventivas y procedimientos de trabajo seguro que deberé aplicar y respetar en el desempeño de mis funciones.""",
+        cert_style,
+    )
+
+    TABLE_STYLE = TableStyle([
+        # Header
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+
+        # Body
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+
+        # Padding para que el texto no pegue al borde
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
+
+        ('WORDWRAP', (0, 1), (-1, -1), 'CJK'),
+    ])
 
     def _p(self, text: str) -> Paragraph:
         # Envuelve texto en Paragraph y escapa HTML para evitar errores con '<', '&', etc.
-        from xml.sax.saxutils import escape as xml_escape
         return Paragraph(xml_escape(text or ""), self.table_cell_style)
 
-    def generate_pdf(self, data: PDFOdiRequest) -> str:
-        # Crear directorio para PDFs si no existe
-        pdf_dir = "generated_pdfs"
-        os.makedirs(pdf_dir, exist_ok=True)
-        
-        # Nombre del archivo
+    def _filename(self, data: PDFOdiRequest) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"odi_{data.cargo}_{data.rut}_{timestamp}.pdf"
-        filepath = os.path.join(pdf_dir, filename)
-        
+        return f"odi_{data.cargo}_{data.rut}_{timestamp}.pdf"
+
+    def render(self, data: PDFOdiRequest, destino) -> None:
         # Crear el documento
-        doc = SimpleDocTemplate(filepath, pagesize=A4, 
+        doc = SimpleDocTemplate(destino, pagesize=A4, 
                                 rightMargin=72, leftMargin=72, 
                                 topMargin=72, bottomMargin=72)
         content_width = doc.width  # ancho disponible dentro de márgenes
@@ -314,7 +470,6 @@ class PDFOdiGenerator:
         
         doc.build(story, onFirstPage=lambda c, d: create_footer(c, d, data), 
                   onLaterPages=lambda c, d: create_footer(c, d, data))
-        return filepath
 
     def _create_header(self, data: PDFOdiRequest) -> List:
         elements = []
@@ -327,11 +482,8 @@ class PDFOdiGenerator:
         return elements
 
     def _create_legal_text(self) -> List:
-        legal_text = """De acuerdo a lo establecido en el artículo 8 del Decreto N°18, de 23 de abril de 2020, se informa sobre el riesgo que entrañan las actividades asociadas a su trabajo, indicando las instrucciones, métodos de trabajo y medidas preventivas necesarias para evitar los potenciales accidentes del trabajo y/o enfermedades profesionales, las cuales se le solicita leer y cumplir con todo esmero en beneficio de su propia salud."""
-        legal_text2 = """Los trabajadores tienen el derecho a desistir realizar un trabajo, si éste pone en peligro su vida, por falta de medidas de seguridad. A su vez los trabajadores se comprometen a informar toda acción o condición subestándar y cumplir todas las instrucciones recibidas para evitar accidentes en el trabajo y disminuir o evitar los impactos al medio ambiente."""
         return [
-            Paragraph(legal_text, self.legal_style),
-            Paragraph(legal_text2, self.legal_style),
+            *(parrafo.nuevo() for parrafo in self.LEGAL),
             Spacer(1, 12)
         ]
 
@@ -351,36 +503,11 @@ class PDFOdiGenerator:
         w3 = content_width * 0.34
         table = Table(data, colWidths=[w1, w2, w3], repeatRows=1)
 
-        table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-
-            # Body
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-
-            # Padding para que el texto no pegue al borde
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.beige, colors.white]),
-
-            ('WORDWRAP', (0, 1), (-1, -1), 'CJK'),
-        ]))
+        table.setStyle(self.TABLE_STYLE)
 
         return table
 
     def _create_table_by_task(self, elementos: List, content_width: float):
-        from collections import defaultdict
         groups = defaultdict(list)
         for e in elementos:
             groups[e.tarea].append(e)
@@ -395,60 +522,58 @@ class PDFOdiGenerator:
         return story
 
     def _create_certification(self) -> List:
-        cert_text = """Declaro que he sido informado y he comprendido acerca de todos los riesgos asociados a mi área de trabajo, cómo también de las medidas preventivas y procedimientos de trabajo seguro que deberé aplicar y respetar en el desempeño de mis funciones."""
         return [
-            Paragraph(cert_text, self.cert_style),
+            self.CERTIFICACION.nuevo(),
             Spacer(1, 30)
         ]
 
 
-class PDFContratoGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.create_custom_styles()
-
-    def create_custom_styles(self):
-        # Estilo para el título principal
-        self.title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=self.styles['Normal'],
-            fontSize=14,
-            alignment=TA_CENTER,
-            spaceAfter=12,
-            fontName='Helvetica-Bold'
-        )
-
-        # Estilo para texto del contrato
-        self.contrato_style = ParagraphStyle(
-            'ContratoStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-            leading=14
-        )
-
-        # Estilo para firmas
-        self.signature_style = ParagraphStyle(
-            'SignatureStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=6
-        )
-
-    def generate_pdf(self, data: PDFContratoRequest) -> str:
-        # Crear directorio para PDFs si no existe
-        pdf_dir = "generated_pdfs"
-        os.makedirs(pdf_dir, exist_ok=True)
-
-        # Nombre del archivo
+class PDFContratoGenerator(BasePDFGenerator):
+    title_style = ESTILOS['titulo_contrato']
+    contrato_style = ESTILOS['contrato']
+    signature_style = ESTILOS['firma']
+
+    # Cláusulas que no dependen de los datos del contrato
+    ALTERACION = ParrafoFijo(
+        """Con todo, el empleador podrá alterar la naturaleza de los servicios o el sitio o recinto en que ellos deban prestarse, a condición de que se trate de labores similares, que el nuevo sitio o recinto quede dentro del territorio nacional, sin que ello importe un menoscabo para el trabajador.""",
+        contrato_style,
+    )
+    CLAUSULA_5 = ParrafoFijo(
+        """<b>QUINTO:</b> El presente contrato tendrá una duración hasta una vez concluidos los trabajos que dieron origen al contrato y podrá ponérsele término cuando concurran para ello causas justificadas que, en conformidad a la Ley, puedan producir su caducidad, quedando permitido dar al trabajador el aviso de Desahucio que establece la Ley.""",
+        contrato_style,
+    )
+    CLAUSULA_6 = ParrafoFijo(
+        """<b>SEXTO:</b> Son obligaciones esenciales del Trabajador, cuya infracción las partes entienden como causa justificada de terminación del presente contrato, las siguientes: 1) Cumplir íntegramente la jornada de trabajo; 2) Cuidar y mantener en perfecto estado de conservación, las máquinas, útiles y otros bienes de la empresa; 3) Cumplir las instrucciones y ordenes que le impartan sus superiores directos, técnicos y ejecutivos del Empleador; 4) En caso de inasistencia al trabajo por enfermedad, el Trabajador deberá justificarla únicamente, con el correspondiente certificado médico, otorgado por un Facultativo especializado dentro del plazo de 24 horas, desde aquel que dejó de asistir al trabajo; 5) Utilizar los implementos de seguridad que correspondan dada la naturaleza del trabajo que se encuentre desempeñando, dando estricto cumplimiento a las normas de seguridad de aplicación general de la Empresa; 6) Mantener con el resto de los trabajadores, y en general con todo el personal, jefes y ejecutivos de la Empresa, relaciones de convivencia y respeto mutuos, que permita a cada uno el normal desempeño de sus labores: 7) El trabajador queda obligado a cumplir leal y correctamente con todos los deberes que le imponga este instrumento o aquéllos que se deriven de las funciones y cargo, debiendo ejecutar las instrucciones que le confieran sus superiores. Del mismo modo el trabajador se obliga a desempeñar en forma eficaz, las funciones y el cargo para el cual ha sido contratado, empleando para ello la mayor diligencia y dedicación.""",
+        contrato_style,
+    )
+    CLAUSULA_7 = ParrafoFijo(
+        """<b>SÉPTIMO:</b> El Trabajador se obliga a desarrollar su trabajo con el debido cuidado, evitando comprometer la seguridad y la salud del resto de los trabajadores y el Medio Ambiente. La infracción o el incumplimiento grave de las obligaciones que impone el presente contrato y, cuando proceda, faculta a la empresa para poner término al contrato sin derecho a indemnización alguna.""",
+        contrato_style,
+    )
+    CLAUSULA_8 = ParrafoFijo(
+        """<b>OCTAVO:</b> Las partes pueden ponerle término al presente contrato de común acuerdo, y cualquiera de ellas, en la forma, condiciones y por las causales previstas y sancionadas por los artículos 159, 160 y 161 del Código del Trabajo, las que en el futuro se establezcan, y las que a continuación se indican, las que tendrán el carácter de esenciales y determinantes, configurando por sí mismas causales de terminación del contrato: 1) Presentarse al trabajo en estado de ebriedad, ingerir bebidas alcohólicas durante las horas de trabajo o introducirlas al establecimiento, obras, faenas o lugar de trabajo; 2) Ejecutar, durante las horas de trabajo, y en el desempeño de sus funciones, actividades ajenas a su labor, o dedicarse a atender asuntos particulares; 3) Promover o provocar juegos de azar, riñas o alteraciones de cualquier especie con sus compañeros o jefes durante la jornada de trabajo y dentro del recinto de la obra, establecimiento o lugar de trabajo; 4) Fumar dentro de los lugares o recintos en donde exista prohibición expresa para ello, de acuerdo a las normas de seguridad implantadas previamente por la Gerencia; 5) Vender o enajenar elementos de seguridad proporcionados por la Empresa; 6) Ocultar inasistencias que no sean propias.""",
+        contrato_style,
+    )
+    CLAUSULA_9 = ParrafoFijo(
+        """<b>NOVENO:</b> Las partes convienen que la remuneración pactada y los demás beneficios que el trabajador tenga derecho a percibir en virtud del presente contrato, serán pagados en dinero en efectivo a más tardar dentro de los primeros 5 días del mes siguiente a cada periodo.""",
+        contrato_style,
+    )
+    CLAUSULA_11 = ParrafoFijo(
+        """<b>DÉCIMO PRIMERO:</b> "El Trabajador no podrá divulgar, publicar, hacer comentarios ni, en general, traspasar de cualquier forma, total o parcialmente, por cuenta propia o a través de terceros, durante la vigencia del presente contrato y aún después de expirado el mismo por cualquier causa, informaciones o antecedentes relativos a las materias sobre las cuales se ha obligado a guardar secreto y mantener reserva. Asimismo, el Trabajador se compromete a guardar absoluta reserva y confidencialidad acerca de toda la información, proyectos, ideas, creaciones, invenciones, diseños, procesos de venta, información comercial, derechos de autor, marcas o nombres comerciales, desarrollo de software o presentación de mercaderías y, en general de todo asuntos y negocios que haya tomado conocimiento en virtud del trabajo desarrollado para el Empleador. La obligación de guardar secreto y mantener reserva tiene el carácter de esencial para la formación del consentimiento del presente contrato." """,
+        contrato_style,
+    )
+    CLAUSULA_13 = ParrafoFijo(
+        """<b>DÉCIMO TERCERO:</b> El presente contrato se firma en triplicado de igual fecha y tenor, de tres páginas cada uno, quedando dos en poder del Empleador y uno en poder del Trabajador.""",
+        contrato_style,
+    )
+
+    def _filename(self, data: PDFContratoRequest) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"contrato_{data.rut_trabajador}_{timestamp}.pdf"
-        filepath = os.path.join(pdf_dir, filename)
+        return f"contrato_{data.rut_trabajador}_{timestamp}.pdf"
 
+    def render(self, data: PDFContratoRequest, destino) -> None:
         # Crear el documento
-        doc = SimpleDocTemplate(filepath, pagesize=A4,
+        doc = SimpleDocTemplate(destino, pagesize=A4,
                               rightMargin=72, leftMargin=72,
                               topMargin=72, bottomMargin=120)
 
@@ -512,8 +637,7 @@ class PDFContratoGenerator:
         clausula1_text = f"""<b>PRIMERO:</b> {data.empresa_nombre}, representada del modo indicado en la comparecencia, contrata a don {data.nombre_trabajador}, quien se compromete y obliga a ejecutar el trabajo de {data.cargo_trabajador}, prestando estos servicios en {data.lugar_trabajo}."""
         story.append(Paragraph(clausula1_text, self.contrato_style))
 
-        alteracion_text = """Con todo, el empleador podrá alterar la naturaleza de los servicios o el sitio o recinto en que ellos deban prestarse, a condición de que se trate de labores similares, que el nuevo sitio o recinto quede dentro del territorio nacional, sin que ello importe un menoscabo para el trabajador."""
-        story.append(Paragraph(alteracion_text, self.contrato_style))
+        story.append(self.ALTERACION.nuevo())
         story.append(Spacer(1, 12))
 
         # SEGUNDA CLÁUSULA
@@ -535,28 +659,23 @@ class PDFContratoGenerator:
         story.append(PageBreak())
 
         # QUINTA CLÁUSULA
-        clausula5_text = """<b>QUINTO:</b> El presente contrato tendrá una duración hasta una vez concluidos los trabajos que dieron origen al contrato y podrá ponérsele término cuando concurran para ello causas justificadas que, en conformidad a la Ley, puedan producir su caducidad, quedando permitido dar al trabajador el aviso de Desahucio que establece la Ley."""
-        story.append(Paragraph(clausula5_text, self.contrato_style))
+        story.append(self.CLAUSULA_5.nuevo())
         story.append(Spacer(1, 12))
 
         # SEXTA CLÁUSULA
-        clausula6_text = """<b>SEXTO:</b> Son obligaciones esenciales del Trabajador, cuya infracción las partes entienden como causa justificada de terminación del presente contrato, las siguientes: 1) Cumplir íntegramente la jornada de trabajo; 2) Cuidar y mantener en perfecto estado de conservación, las máquinas, útiles y otros bienes de la empresa; 3) Cumplir las instrucciones y ordenes que le impartan sus superiores directos, técnicos y ejecutivos del Empleador; 4) En caso de inasistencia al trabajo por enfermedad, el Trabajador deberá justificarla únicamente, con el correspondiente certificado médico, otorgado por un Facultativo especializado dentro del plazo de 24 horas, desde aquel que dejó de asistir al trabajo; 5) Utilizar los implementos de seguridad que correspondan dada la naturaleza del trabajo que se encuentre desempeñando, dando estricto cumplimiento a las normas de seguridad de aplicación general de la Empresa; 6) Mantener con el resto de los trabajadores, y en general con todo el personal, jefes y ejecutivos de la Empresa, relaciones de convivencia y respeto mutuos, que permita a cada uno el normal desempeño de sus labores: 7) El trabajador queda obligado a cumplir leal y correctamente con todos los deberes que le imponga este instrumento o aquéllos que se deriven de las funciones y cargo, debiendo ejecutar las instrucciones que le confieran sus superiores. Del mismo modo el trabajador se obliga a desempeñar en forma eficaz, las funciones y el cargo para el cual ha sido contratado, empleando para ello la mayor diligencia y dedicación."""
-        story.append(Paragraph(clausula6_text, self.contrato_style))
+        story.append(self.CLAUSULA_6.nuevo())
         story.append(Spacer(1, 12))
 
         # SÉPTIMA CLÁUSULA
-        clausula7_text = """<b>SÉPTIMO:</b> El Trabajador se obliga a desarrollar su trabajo con el debido cuidado, evitando comprometer la seguridad y la salud del resto de los trabajadores y el Medio Ambiente. La infracción o el incumplimiento grave de las obligaciones que impone el presente contrato y, cuando proceda, faculta a la empresa para poner término al contrato sin derecho a indemnización alguna."""
-        story.append(Paragraph(clausula7_text, self.contrato_style))
+        story.append(self.CLAUSULA_7.nuevo())
         story.append(Spacer(1, 12))
 
         # OCTAVA CLÁUSULA
-        clausula8_text = """<b>OCTAVO:</b> Las partes pueden ponerle término al presente contrato de común acuerdo, y cualquiera de ellas, en la forma, condiciones y por las causales previstas y sancionadas por los artículos 159, 160 y 161 del Código del Trabajo, las que en el futuro se establezcan, y las que a continuación se indican, las que tendrán el carácter de esenciales y determinantes, configurando por sí mismas causales de terminación del contrato: 1) Presentarse al trabajo en estado de ebriedad, ingerir bebidas alcohólicas durante las horas de trabajo o introducirlas al establecimiento, obras, faenas o lugar de trabajo; 2) Ejecutar, durante las horas de trabajo, y en el desempeño de sus funciones, actividades ajenas a su labor, o dedicarse a atender asuntos particulares; 3) Promover o provocar juegos de azar, riñas o alteraciones de cualquier especie con sus compañeros o jefes durante la jornada de trabajo y dentro del recinto de la obra, establecimiento o lugar de trabajo; 4) Fumar dentro de los lugares o recintos en donde exista prohibición expresa para ello, de acuerdo a las normas de seguridad implantadas previamente por la Gerencia; 5) Vender o enajenar elementos de seguridad proporcionados por la Empresa; 6) Ocultar inasistencias que no sean propias."""
-        story.append(Paragraph(clausula8_text, self.contrato_style))
+        story.append(self.CLAUSULA_8.nuevo())
         story.append(Spacer(1, 12))
 
         # NOVENA CLÁUSULA
-        clausula9_text = """<b>NOVENO:</b> Las partes convienen que la remuneración pactada y los demás beneficios que el trabajador tenga derecho a percibir en virtud del presente contrato, serán pagados en dinero en efectivo a más tardar dentro de los primeros 5 días del mes siguiente a cada periodo."""
-        story.append(Paragraph(clausula9_text, self.contrato_style))
+        story.append(self.CLAUSULA_9.nuevo())
         story.append(Spacer(1, 12))
 
         # DÉCIMA CLÁUSULA
@@ -572,8 +691,7 @@ class PDFContratoGenerator:
         story.append(PageBreak())
 
         # DÉCIMA PRIMERA CLÁUSULA
-        clausula11_text = """<b>DÉCIMO PRIMERO:</b> "El Trabajador no podrá divulgar, publicar, hacer comentarios ni, en general, traspasar de cualquier forma, total o parcialmente, por cuenta propia o a través de terceros, durante la vigencia del presente contrato y aún después de expirado el mismo por cualquier causa, informaciones o antecedentes relativos a las materias sobre las cuales se ha obligado a guardar secreto y mantener reserva. Asimismo, el Trabajador se compromete a guardar absoluta reserva y confidencialidad acerca de toda la información, proyectos, ideas, creaciones, invenciones, diseños, procesos de venta, información comercial, derechos de autor, marcas o nombres comerciales, desarrollo de software o presentación de mercaderías y, en general de todo asuntos y negocios que haya tomado conocimiento en virtud del trabajo desarrollado para el Empleador. La obligación de guardar secreto y mantener reserva tiene el carácter de esencial para la formación del consentimiento del presente contrato." """
-        story.append(Paragraph(clausula11_text, self.contrato_style))
+        story.append(self.CLAUSULA_11.nuevo())
         story.append(Spacer(1, 12))
 
         # DÉCIMA SEGUNDA CLÁUSULA
@@ -582,8 +700,7 @@ class PDFContratoGenerator:
         story.append(Spacer(1, 12))
 
         # DÉCIMA TERCERA CLÁUSULA
-        clausula13_text = """<b>DÉCIMO TERCERO:</b> El presente contrato se firma en triplicado de igual fecha y tenor, de tres páginas cada uno, quedando dos en poder del Empleador y uno en poder del Trabajador."""
-        story.append(Paragraph(clausula13_text, self.contrato_style))
+        story.append(self.CLAUSULA_13.nuevo())
         story.append(Spacer(1, 30))
 
         # Agregar cláusulas adicionales si existen
@@ -597,37 +714,7 @@ class PDFContratoGenerator:
         story.append(Spacer(1, 80))
 
         # Agregar las firmas directamente en el story
-        from reportlab.platypus import Flowable
-
-        class SignatureBlock(Flowable):
-            def __init__(self, empresa_nombre, empresa_rut, trabajador_nombre, trabajador_rut):
-                Flowable.__init__(self)
-                self.empresa_nombre = empresa_nombre
-                self.empresa_rut = empresa_rut
-                self.trabajador_nombre = trabajador_nombre
-                self.trabajador_rut = trabajador_rut
-                self.width = 450
-                self.height = 80
-
-            def draw(self):
-                canvas = self.canv
-
-                # Líneas para firmas (alineadas igual que EPP)
-                canvas.line(28, 60, 208, 60)  # Línea empresa
-                canvas.line(248, 60, 428, 60)  # Línea trabajador
-
-                # Textos de firma - empresa
-                canvas.setFont("Helvetica-Bold", 10)
-                canvas.drawCentredString(118, 45, self.empresa_nombre)
-                canvas.drawCentredString(118, 33, self.empresa_rut)
-                canvas.drawCentredString(118, 21, "EMPLEADOR")
-
-                # Textos de firma - trabajador
-                canvas.drawCentredString(338, 45, self.trabajador_nombre)
-                canvas.drawCentredString(338, 33, self.trabajador_rut)
-                canvas.drawCentredString(338, 21, "TRABAJADOR")
-
-        signature_block = SignatureBlock(
+        signature_block = ContratoSignatureBlock(
             data.empresa_nombre,
             data.empresa_rut,
             data.nombre_trabajador,
@@ -638,8 +725,6 @@ class PDFContratoGenerator:
         # Construir el PDF
         doc.build(story)
 
-        return filepath
-
     def _numero_a_palabras(self, numero: int) -> str:
         """Convierte un número a palabras (simplificado)"""
         # Simplificación básica
@@ -672,58 +757,17 @@ class PDFContratoGenerator:
         return f"DÉCIMO {resultado}" if resultado else "DÉCIMO"
 
 
-class PDFTerminoContratoGenerator:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.create_custom_styles()
-
-    def create_custom_styles(self):
-        # Estilo para el título
-        self.title_style = ParagraphStyle(
-            'TitleStyle',
-            parent=self.styles['Normal'],
-            fontSize=14,
-            alignment=TA_CENTER,
-            spaceAfter=12,
-            fontName='Helvetica-Bold'
-        )
-
-        # Estilo para el nombre de empresa
-        self.empresa_style = ParagraphStyle(
-            'EmpresaStyle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            alignment=TA_CENTER,
-            spaceAfter=18,
-            fontName='Helvetica-Bold'
-        )
-
-        # Estilo para fecha y lugar
-        self.fecha_style = ParagraphStyle(
-            'FechaStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=12
-        )
-
-        # Estilo normal
-        self.normal_style = ParagraphStyle(
-            'NormalStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_LEFT,
-            spaceAfter=6
-        )
+class PDFTerminoContratoGenerator(BasePDFGenerator):
+    title_style = ESTILOS['titulo_contrato']
+    empresa_style = ESTILOS['empresa']
+    fecha_style = ESTILOS['fecha']
+    normal_style = ESTILOS['normal']
+    justify_style = ESTILOS['justificado']
 
-        # Estilo justificado
-        self.justify_style = ParagraphStyle(
-            'JustifyStyle',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceAfter=6
-        )
+    IMPOSICIONES = ParrafoFijo(
+        "Asi Mismo informamos a usted que sus imposiciones se encuentran canceladas oportuna y debidamente en las Instituciones Previsionales correspondientes. Además,  adjuntamos a la siguiente carta,  Certificado de la empresa Previred que da cuenta que las cotizaciones previsionales, de los meses trabajados, se encuentran pagadas.",
+        justify_style,
+    )
 
     def _format_date(self, date_obj):
         """Formatea la fecha en español"""
@@ -736,19 +780,14 @@ class PDFTerminoContratoGenerator:
 
         return f"{day_name} {date_obj.day} de {month_name} del {date_obj.year}"
 
-    def generate_pdf(self, data):
-        """Genera el PDF de carta de término de contrato"""
-        # Crear directorio para PDFs si no existe
-        pdf_dir = "generated_pdfs"
-        os.makedirs(pdf_dir, exist_ok=True)
-
-        # Nombre del archivo PDF
-        filename = f"termino_contrato_{data.rut_trabajador.replace('-', '')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join(pdf_dir, filename)
+    def _filename(self, data) -> str:
+        return f"termino_contrato_{data.rut_trabajador.replace('-', '')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
+    def render(self, data, destino) -> None:
+        """Genera el PDF de carta de término de contrato"""
         # Crear el documento PDF
         doc = SimpleDocTemplate(
-            filepath,
+            destino,
             pagesize=letter,
             rightMargin=72,
             leftMargin=72,
@@ -798,8 +837,7 @@ class PDFTerminoContratoGenerator:
         story.append(Spacer(1, 12))
 
         # Imposiciones
-        texto_imposiciones = "Asi Mismo informamos a usted que sus imposiciones se encuentran canceladas oportuna y debidamente en las Instituciones Previsionales correspondientes. Además,  adjuntamos a la siguiente carta,  Certificado de la empresa Previred que da cuenta que las cotizaciones previsionales, de los meses trabajados, se encuentran pagadas."
-        story.append(Paragraph(texto_imposiciones, self.justify_style))
+        story.append(self.IMPOSICIONES.nuevo())
         story.append(Spacer(1, 12))
 
         # Información de pago
@@ -812,42 +850,7 @@ class PDFTerminoContratoGenerator:
         story.append(Spacer(1, 36))
 
         # Firmas
-        from reportlab.platypus.flowables import Flowable
-
-        class SignatureBlock(Flowable):
-            def __init__(self, empresa_nombre, empresa_rut, trabajador_nombre, trabajador_rut):
-                Flowable.__init__(self)
-                self.empresa_nombre = empresa_nombre
-                self.empresa_rut = empresa_rut
-                self.trabajador_nombre = trabajador_nombre
-                self.trabajador_rut = trabajador_rut
-                self.width = 450
-                self.height = 100
-
-            def draw(self):
-                canvas = self.canv
-
-                # Líneas para firmas
-                canvas.line(28, 60, 208, 60)  # Línea empresa
-                canvas.line(248, 60, 428, 60)  # Línea trabajador
-
-                # Textos de firma - empresa
-                canvas.setFont("Helvetica-Bold", 9)
-                canvas.drawCentredString(118, 45, self.empresa_nombre.upper())
-                canvas.setFont("Helvetica", 9)
-                canvas.drawCentredString(118, 33, self.empresa_rut)
-                canvas.drawCentredString(118, 21, "EMPLEADOR")
-
-                # Textos de firma - trabajador
-                canvas.setFont("Helvetica-Bold", 9)
-                canvas.drawCentredString(338, 45, self.trabajador_nombre.upper())
-                canvas.setFont("Helvetica", 9)
-                canvas.drawCentredString(338, 33, self.trabajador_rut)
-                canvas.drawCentredString(338, 21, "TRABAJADOR")
-                canvas.setFont("Helvetica", 8)
-                canvas.drawCentredString(338, 9, "Recibí Copia de la presente carta")
-
-        signature_block = SignatureBlock(
+        signature_block = TerminoSignatureBlock(
             data.empresa_nombre,
             data.empresa_rut,
             data.nombre_trabajador,
@@ -858,4 +861,10 @@ class PDFTerminoContratoGenerator:
         # Construir el PDF
         doc.build(story)
 
-        return filepath
+
+# Instancias compartidas por todo el proceso: los generadores no guardan estado
+# por documento, así que una sola instancia atiende a todos los hilos
+epp_pdf_generator = PDFEppGenerator()
+odi_pdf_generator = PDFOdiGenerator()
+contrato_pdf_generator = PDFContratoGenerator()
+termino_contrato_pdf_generator = PDFTerminoContratoGenerator()
@@ -0,0 +1,213 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.metrics import medir_documento
+from app.services.pdf_cache import TIPOS_CACHEABLES, clave_documento, pdf_cache
+
+load_dotenv()
+
+# Procesos dedicados a ReportLab (0 = renderizar en el threadpool, sin procesos)
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+# Documentos que pueden esperar turno además de los que se están renderizando
+PDF_RENDER_QUEUE_DEPTH = int(os.getenv("PDF_RENDER_QUEUE_DEPTH", "16"))
+# Segundos máximos que un request espera su documento
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+
+# Tipo de documento → (instancia compartida en app.services.pdf_generator, método)
+GENERADORES = {
+    "epp": ("epp_pdf_generator", "generate_pdf_bytes"),
+    "epp_lote": ("epp_pdf_generator", "generate_lote_bytes"),
+    "epp_lote_separado": ("epp_pdf_generator", "generate_lote_pdfs"),
+    "odi": ("odi_pdf_generator", "generate_pdf_bytes"),
+    "contrato": ("contrato_pdf_generator", "generate_pdf_bytes"),
+    "termino_contrato": ("termino_contrato_pdf_generator", "generate_pdf_bytes"),
+}
+
+
+class PDFRenderBusy(Exception):
+    """La cola de renderizado está llena; el cliente debe reintentar."""
+
+
+# ==============================================================
+# Código que corre dentro de los procesos worker
+# ==============================================================
+
+def _init_worker() -> None:
+    # Precarga generadores (estilos y textos fijos) y métricas de las fuentes
+    # estándar para que el primer documento no pague ese costo
+    from reportlab.pdfbase import pdfmetrics
+    from app.services import pdf_generator  # noqa: F401
+
+    for fuente in ("Helvetica", "Helvetica-Bold"):
+        pdfmetrics.getFont(fuente)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _render(tipo: str, data):
+    from app.services import pdf_generator
+
+    instancia, metodo = GENERADORES[tipo]
+    resultado = getattr(getattr(pdf_generator, instancia), metodo)(data)
+    # BytesIO → bytes para que el resultado cruce el límite del proceso
+    return resultado.getvalue() if isinstance(resultado, BytesIO) else resultado
+
+
+# ==============================================================
+# Servicio (proceso principal)
+# ==============================================================
+
+class PDFRenderService:
+    """
+    Envía el layout de ReportLab (CPU puro) a un ProcessPoolExecutor acotado,
+    para que un ODI largo no compita por el GIL con el resto de la API.
+    Si ya hay workers + queue_depth documentos en curso, rechaza de inmediato
+    con PDFRenderBusy en lugar de encolar sin límite.
+    """
+
+    def __init__(self, workers: int = PDF_RENDER_WORKERS, queue_depth: int = PDF_RENDER_QUEUE_DEPTH,
+                 timeout: float = PDF_RENDER_TIMEOUT):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._en_curso = 0
+
+    @property
+    def capacidad(self) -> int:
+        return max(self.workers, 1) + self.queue_depth
+
+    def start(self) -> None:
+        """Levanta los procesos y los precalienta (idempotente)."""
+        if self.workers > 0:
+            self._get_executor()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is not None:
+                return self._executor
+            # spawn: los workers no heredan el event loop ni conexiones abiertas
+            executor = self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        for _ in range(self.workers):
+            executor.submit(_ping)
+        return executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _reservar(self) -> None:
+        with self._lock:
+            if self._en_curso >= self.capacidad:
+                raise PDFRenderBusy()
+            self._en_curso += 1
+
+    def _liberar(self, *_) -> None:
+        with self._lock:
+            self._en_curso -= 1
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "in_flight": self._en_curso,
+                "started": self._executor is not None,
+            }
+
+    async def render(self, tipo: str, data, timeout: Optional[float] = None):
+        """
+        Renderiza el documento `tipo`. Devuelve bytes (un PDF) o una lista
+        de bytes (lotes separados), según el método del generador.
+        `timeout` reemplaza al del servicio (p. ej. jobs en segundo plano).
+        """
+        if tipo not in GENERADORES:
+            raise ValueError(f"Tipo de documento desconocido: {tipo}")
+
+        # Incluye la espera por un worker libre: es lo que percibe el request
+        with medir_documento("pdf", tipo):
+            return await self._render_en_pool(tipo, data, timeout)
+
+    async def _render_en_pool(self, tipo: str, data, timeout: Optional[float]):
+        self._reservar()
+        if self.workers <= 0:
+            try:
+                return await run_in_threadpool(_render, tipo, data)
+            finally:
+                self._liberar()
+
+        try:
+            executor = self._get_executor()
+            futuro = executor.submit(_render, tipo, data)
+        except BaseException:
+            self._liberar()
+            raise
+        # El cupo se libera cuando el worker termina, aunque el request
+        # haya expirado antes: así la cola refleja el trabajo real
+        futuro.add_done_callback(self._liberar)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(futuro), timeout or self.timeout)
+        except BrokenProcessPool:
+            # Un worker murió (p. ej. OOM): se recrea el pool en el próximo render
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+pdf_render_service = PDFRenderService()
+
+
+async def render_pdf(tipo: str, data):
+    """
+    Atajo para los routers: renderiza con el servicio compartido (un PDF
+    llega como BytesIO) y traduce la cola llena a 503 y el tiempo agotado a 504.
+    Los documentos individuales pasan antes por la caché por contenido.
+    """
+    clave = None
+    if tipo in TIPOS_CACHEABLES and pdf_cache.habilitado:
+        clave = clave_documento(tipo, data)
+        contenido = pdf_cache.get_memoria(clave)
+        if contenido is None:
+            contenido = await run_in_threadpool(pdf_cache.get_disco, clave)
+        if contenido is not None:
+            return BytesIO(contenido)
+
+    try:
+        resultado = await pdf_render_service.render(tipo, data)
+    except PDFRenderBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Hay demasiados documentos en generación, intenta nuevamente en unos segundos",
+            headers={"Retry-After": "5"},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="La generación del PDF excedió el tiempo máximo",
+        )
+    # Fuera del try: la caché es best-effort y no puede descartar un PDF ya generado
+    if clave is not None:
+        await run_in_threadpool(pdf_cache.put, clave, resultado)
+    return BytesIO(resultado) if isinstance(resultado, bytes) else resultado
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolWaitStats:
+    """
+    Acumula el tiempo que se espera por una conexión del pool (checkout).
+    Thread-safe: se actualiza desde los hilos del threadpool y desde el event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.errors = 0
+
+    def record(self, wait: float, timeout: bool = False, error: bool = False):
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+                return
+            if error:
+                self.errors += 1
+                return
+            self.checkouts += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            promedio = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_errors": self.errors,
+                "checkout_wait_avg_ms": round(promedio * 1000, 3),
+                "checkout_wait_max_ms": round(self.max_wait * 1000, 3),
+                "checkout_wait_total_s": round(self.total_wait, 3),
+            }
+
+
+class _TimedPoolMixin:
+    # Mide cuánto tarda el pool en entregar una conexión (incluye la espera
+    # cuando el pool está agotado, que antes se veía como un "cuelgue")
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            # Pool agotado: se superó pool_timeout esperando una conexión
+            self.wait_stats.record(time.perf_counter() - inicio, timeout=True)
+            raise
+        except Exception:
+            self.wait_stats.record(time.perf_counter() - inicio, error=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - inicio)
+        return conn
+
+    def recreate(self):
+        # Conserva las métricas si el motor recrea el pool (dispose/reconexión)
+        nuevo = super().recreate()
+        nuevo.wait_stats = self.wait_stats
+        return nuevo
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine) -> dict:
+    """
+    Estado actual del pool de un motor: conexiones en uso, libres,
+    overflow y tiempos de espera de checkout.
+    """
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status.update(wait_stats.snapshot())
+    return status
@@ -0,0 +1,126 @@
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from fastapi import Request
+
+from app.services.metrics import contar_sentencias_proceso, instrumentar_engine, plantilla_ruta, sql_del_request
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Middleware de desarrollo que avisa de consultas N+1 (no activar en producción)
+QUERY_GUARD_ENABLED = os.getenv("QUERY_GUARD_ENABLED", "false").strip().lower() in ("1", "true", "yes", "on")
+# Veces que la misma sentencia puede repetirse en un request antes del aviso
+QUERY_GUARD_MAX_REPETICIONES = int(os.getenv("QUERY_GUARD_MAX_REPETICIONES", "10"))
+
+# Largo máximo de la sentencia en avisos y errores
+_LARGO_FORMA = 300
+
+_ESPACIOS = re.compile(r"\s+")
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETROS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_LISTAS = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def forma_sql(sentencia: str) -> str:
+    """
+    Sentencia sin valores: parámetros y literales pasan a `?` y las listas
+    de un IN se colapsan, así la misma consulta con otro id cuenta igual.
+    """
+    forma = _ESPACIOS.sub(" ", sentencia).strip()
+    # Parámetros primero: con los literales antes, el número de `$1` pasaría
+    # a `?` y quedaría `$?`
+    forma = _PARAMETROS.sub("?", forma)
+    forma = _LITERALES.sub("?", forma)
+    return _LISTAS.sub("?, ...", forma)
+
+
+def _recortar(forma: str) -> str:
+    return forma if len(forma) <= _LARGO_FORMA else forma[:_LARGO_FORMA] + "…"
+
+
+class ConteoSQL:
+    """Sentencias ejecutadas, agrupadas por forma."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.formas: Counter = Counter()
+
+    def registrar(self, sentencia: str) -> None:
+        forma = forma_sql(sentencia)
+        with self._lock:
+            self.formas[forma] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.formas.values())
+
+    def repetidas(self, umbral: int) -> List[Tuple[str, int]]:
+        """Formas ejecutadas más de `umbral` veces, de la más repetida a la menos."""
+        return [(forma, veces) for forma, veces in self.formas.most_common() if veces > umbral]
+
+    def resumen(self, limite: int = 5) -> str:
+        return "\n".join(f"  {veces}× {_recortar(forma)}" for forma, veces in self.formas.most_common(limite))
+
+
+class PresupuestoExcedido(AssertionError):
+    pass
+
+
+def _engines_app() -> Sequence:
+    from app.database import async_engine, engine
+    return engine, async_engine.sync_engine
+
+
+@contextmanager
+def presupuesto_sql(max_sentencias: int, engines: Optional[Sequence] = None):
+    """
+    Falla con PresupuestoExcedido si el bloque ejecuta más de `max_sentencias`
+    sentencias SQL. Pensado para tests de endpoints:
+
+        with presupuesto_sql(3):
+            client.get("/trabajadores/search", params={"q": "juan"})
+
+    Sin `engines` vigila los dos engines de app.database. Cuenta todo lo que
+    se ejecuta en el proceso, también en el hilo donde TestClient corre la
+    app. El conteo queda en la variable del `as` para revisar las formas si
+    se quiere algo más fino.
+    """
+    for engine in engines if engines is not None else _engines_app():
+        instrumentar_engine(engine)
+    with contar_sentencias_proceso(ConteoSQL()) as conteo:
+        yield conteo
+    if conteo.total > max_sentencias:
+        raise PresupuestoExcedido(
+            f"{conteo.total} sentencias SQL, presupuesto {max_sentencias}. Más repetidas:\n{conteo.resumen()}"
+        )
+
+
+async def query_guard_middleware(request: Request, call_next):
+    # Mismo acumulador que metrics_middleware: un solo listener por engine
+    with sql_del_request() as estadisticas:
+        if estadisticas.formas is None:
+            estadisticas.formas = ConteoSQL()
+        conteo = estadisticas.formas
+        try:
+            return await call_next(request)
+        finally:
+            _avisar_repetidas(request, conteo)
+
+
+def _avisar_repetidas(request: Request, conteo: ConteoSQL) -> None:
+    repetidas = conteo.repetidas(QUERY_GUARD_MAX_REPETICIONES)
+    if repetidas:
+        ruta = plantilla_ruta(request)
+        for forma, veces in repetidas:
+            logger.warning(
+                "Posible N+1 en %s %s: la misma sentencia se ejecutó %d veces (%d en total): %s",
+                request.method, ruta, veces, conteo.total, _recortar(forma),
+            )
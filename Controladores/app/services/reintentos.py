@@ -0,0 +1,12 @@
+import random
+from datetime import timedelta
+
+
+def backoff(intentos: int, base: float, tope: float) -> timedelta:
+    """
+    Espera antes del siguiente intento: base * 2^(intentos - 1) segundos, con
+    tope y ±20 % de jitter para que los fallos simultáneos no se reintenten
+    todos a la vez. La usan el outbox de correos y la cola de jobs.
+    """
+    segundos = min(base * 2 ** (intentos - 1), tope)
+    return timedelta(seconds=segundos * random.uniform(0.8, 1.2))
@@ -1,22 +1,107 @@
 import re
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+# [0-9] y no \d: \d acepta dígitos Unicode (p. ej. de ancho completo) que
+# int() convierte sin reclamar, y validar_ruts los rechaza
+_RUT_RE = re.compile(r"^([0-9]{7,8})([0-9K])$")
+
+# Caracteres como code points: la versión por lotes trabaja sobre la matriz
+# de code points de los RUT, sin crear strings intermedios
+_CERO, _NUEVE, _K, _K_MIN = ord("0"), ord("9"), ord("K"), ord("k")
+# Sin puntos ni guion un RUT válido tiene a lo más 8 dígitos de cuerpo y el
+# DV: un texto más largo no puede serlo
+_ANCHO_MAX = 9
+# Factor y potencia de 10 según la distancia del dígito al DV
+_FACTORES = np.array([2 + i % 6 for i in range(_ANCHO_MAX)], dtype=np.int16)
+_POTENCIAS = 10 ** np.arange(_ANCHO_MAX, dtype=np.int64)
+
+
+def digito_verificador(cuerpo: int) -> str:
+    """DV (módulo 11) de un RUT sin dígito verificador."""
+    suma = 0
+    factor = 2
+    while cuerpo:
+        cuerpo, digito = divmod(cuerpo, 10)
+        suma += digito * factor
+        factor = 2 if factor == 7 else factor + 1  # ciclo 2→7
+    resto = 11 - suma % 11
+    return "0" if resto == 11 else ("K" if resto == 10 else str(resto))
+
 
 def validar_rut_chileno(rut: str) -> bool:
     """
     Valida un RUT chileno en formato 12345678-5 o 12.345.678-K
     """
     rut = rut.upper().replace(".", "").replace("-", "")
-    if not re.match(r"^\d{7,8}[0-9K]$", rut):
+    coincidencia = _RUT_RE.match(rut)
+    if not coincidencia:
         return False
 
-    cuerpo, dv = rut[:-1], rut[-1]
+    cuerpo, dv = coincidencia.groups()
+    return dv == digito_verificador(int(cuerpo))
 
-    # Calcular DV
-    suma = 0
-    factor = 2
-    for c in reversed(cuerpo):
-        suma += int(c) * factor
-        factor = 9 if factor == 7 else factor + 1  # ciclo 2→7
-    resto = suma % 11
-    dv_calculado = str(11 - resto) if resto > 1 else ("K" if resto == 1 else "0")
 
-    return dv == dv_calculado
+class RutsValidados(NamedTuple):
+    validos: np.ndarray   # bool, un elemento por RUT recibido
+    cuerpos: np.ndarray   # int64, 0 donde el RUT no es válido
+    dvs: np.ndarray       # '<U1' en mayúscula, '' donde el RUT no es válido
+
+
+def validar_ruts(ruts: Sequence[str]) -> RutsValidados:
+    """
+    Versión por lotes de validar_rut_chileno para importaciones y chequeos
+    masivos: mismas reglas, pero el DV de todos los RUT se calcula con
+    aritmética de arreglos NumPy en vez de un ciclo Python por RUT.
+    """
+    texto = np.asarray(ruts, dtype=str).reshape(-1)
+    n = len(texto)
+    if n == 0:
+        return RutsValidados(np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64), np.zeros(0, dtype="<U1"))
+
+    # Igual que validar_rut_chileno, los puntos y el guion se quitan antes de
+    # medir: "1.2.3.4.5.6.7.8-5" es largo, pero solo tiene 9 dígitos
+    texto = np.strings.replace(np.strings.replace(texto, ".", ""), "-", "")
+    largos = np.strings.str_len(texto)
+    largo_ok = largos <= _ANCHO_MAX
+    ancho = min(max(texto.dtype.itemsize // 4, 1), _ANCHO_MAX)
+    # Matriz de code points con una fila por posición y una columna por RUT
+    # (relleno con 0): así cada operación recorre vectores largos y contiguos.
+    # Todo lo que no es ASCII es inválido, así que basta un byte por carácter
+    puntos = np.ascontiguousarray(texto.astype(f"<U{ancho}")).view(np.uint32).reshape(n, ancho)
+    codigos = np.ascontiguousarray(np.minimum(puntos, 255).astype(np.uint8).T)
+    codigos[codigos == _K_MIN] = _K
+
+    es_digito = (codigos >= _CERO) & (codigos <= _NUEVE)
+    es_k = codigos == _K
+    significativo = es_digito | es_k
+    # Relleno por posición y no por code point 0: un NUL dentro del RUT es inválido
+    relleno = np.arange(ancho)[:, None] >= largos
+
+    # Posición de cada dígito contando desde la derecha:
+    # 1 = DV, 2 = último dígito del cuerpo, ...
+    desde_derecha = np.cumsum(significativo[::-1], axis=0, dtype=np.int8)[::-1] * significativo
+    cantidad = desde_derecha.max(axis=0)
+
+    formato_ok = (
+        largo_ok
+        & np.all(significativo | relleno, axis=0)
+        & (cantidad >= 8) & (cantidad <= 9)
+        & ~np.any(es_k & (desde_derecha > 1), axis=0)  # K solo como DV
+    )
+
+    dv = np.where(desde_derecha == 1, codigos, 0).max(axis=0)
+    en_cuerpo = desde_derecha >= 2
+    distancia = np.where(en_cuerpo, desde_derecha - 2, 0)
+    digitos = np.where(en_cuerpo, codigos - _CERO, 0).astype(np.int16)
+
+    # Módulo 11 con factores 2..7 repetidos desde la derecha
+    suma = (digitos * _FACTORES[distancia]).sum(axis=0, dtype=np.int32)
+    resto = 11 - suma % 11
+    dv_calculado = np.where(resto == 11, _CERO, np.where(resto == 10, _K, _CERO + resto))
+    cuerpos = (digitos * _POTENCIAS[distancia]).sum(axis=0)
+
+    validos = formato_ok & (dv == dv_calculado)
+    dvs = np.where(validos, dv, 0).astype(np.uint32).view("<U1")
+    return RutsValidados(validos, np.where(validos, cuerpos, 0), dvs)
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Tokens verificados que se recuerdan por proceso (0 = sin caché)
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+# Segundos máximos que una verificación se reutiliza (nunca más allá del exp del token)
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+
+
+def _digest(token: str) -> bytes:
+    # La clave no guarda el token: un volcado de memoria no sirve para autenticarse
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """
+    Claims de access tokens ya verificados (firma + exp), por digest del token.
+    LRU acotado en entradas; cada entrada vence en min(ahora + ttl, exp).
+
+    Revocación: revocar_token descarta la entrada y rechaza el token hasta su
+    exp, solo en el proceso que la recibe (cada worker tiene su propia caché).
+    """
+
+    def __init__(self, max_entries: int = AUTH_TOKEN_CACHE_SIZE, ttl: float = AUTH_TOKEN_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()   # digest → (vence, claims)
+        self._revocados = {}             # digest → exp
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        if self.max_entries <= 0:
+            return None
+        clave = _digest(token)
+        ahora = time.time()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+            if entrada[0] <= ahora:
+                del self._entradas[clave]
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            # Copia: un endpoint que modifique current_user no altera la caché
+            return dict(entrada[1])
+
+    def put(self, token: str, payload: dict, claims: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        clave = _digest(token)
+        vence = min(time.time() + self.ttl, float(payload.get("exp", 0)))
+        with self._lock:
+            if clave in self._revocados:
+                return
+            self._entradas[clave] = (vence, dict(claims))
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+
+    def revocado(self, token: str) -> bool:
+        """True si el token (ya verificado) fue revocado en este proceso."""
+        with self._lock:
+            return _digest(token) in self._revocados
+
+    def revocar_token(self, token: str, exp: float) -> None:
+        ahora = time.time()
+        with self._lock:
+            self._entradas.pop(_digest(token), None)
+            self._revocados[_digest(token)] = float(exp)
+            # La lista de revocados solo guarda tokens que aún no expiran
+            for clave in [c for c, e in self._revocados.items() if e <= ahora]:
+                del self._revocados[clave]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def status(self) -> dict:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entries": len(self._entradas),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / consultas, 4) if consultas else 0.0,
+                "revoked_tokens": len(self._revocados),
+            }
+
+
+token_cache = TokenCache()
@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.generated import Afp, Cargo, DatosTrabajador, Salud, Territorial
+
+
+class TrabajadorPorRut(NamedTuple):
+    datos: DatosTrabajador
+    cargo: Optional[Cargo]
+    territorial: Optional[Territorial]
+    afp: Optional[Afp]
+    salud: Optional[Salud]
+
+
+# id_empresa vive en trabajador y rut en datos_trabajador (herencia joined),
+# así que no cabe un índice compuesto en una sola tabla: el planner combina
+# el índice por rut con el de (id_empresa, id_trabajador).
+TRABAJADOR_RUT_INDEX_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_datos_trabajador_rut ON datos_trabajador (rut)",
+    "CREATE INDEX IF NOT EXISTS ix_trabajador_empresa ON trabajador (id_empresa, id_trabajador)",
+]
+
+
+def crear_indices_trabajador(engine) -> None:
+    """Crea los índices usados por find_trabajador_by_rut (idempotente)."""
+    with engine.begin() as conn:
+        for ddl in TRABAJADOR_RUT_INDEX_DDL:
+            conn.execute(text(ddl))
+
+
+def _trabajador_select():
+    return (
+        select(DatosTrabajador, Cargo, Territorial, Afp, Salud)
+        .outerjoin(Cargo, Cargo.id_cargo == DatosTrabajador.id_cargo)
+        .outerjoin(Territorial, Territorial.id_territorial == DatosTrabajador.id_territorial)
+        .outerjoin(Afp, Afp.id_afp == DatosTrabajador.id_afp)
+        .outerjoin(Salud, Salud.id_salud == DatosTrabajador.id_salud)
+    )
+
+
+def _trabajador_por_rut_query(empresa_id: int, rut: int):
+    return (
+        _trabajador_select()
+        .where(
+            DatosTrabajador.id_empresa == empresa_id,
+            DatosTrabajador.rut == rut
+        )
+        .limit(1)
+    )
+
+
+async def find_trabajador_by_rut(db: AsyncSession, empresa_id: int, rut: int) -> Optional[TrabajadorPorRut]:
+    """
+    Busca un trabajador de la empresa por RUT (sin DV) en una sola consulta,
+    junto con su cargo, territorial, AFP y salud.
+    """
+    row = (await db.execute(_trabajador_por_rut_query(empresa_id, rut))).first()
+    return TrabajadorPorRut(*row) if row else None
+
+
+async def find_trabajadores_by_ruts(db: AsyncSession, empresa_id: int, ruts: Iterable[int]) -> Dict[int, TrabajadorPorRut]:
+    """
+    Varios trabajadores de la empresa por RUT en una sola consulta (rut IN ...).
+    Devuelve {rut: TrabajadorPorRut}; los RUT no encontrados no aparecen.
+    """
+    rows = (await db.execute(
+        _trabajador_select().where(
+            DatosTrabajador.id_empresa == empresa_id,
+            DatosTrabajador.rut.in_(list(ruts))
+        )
+    )).all()
+    return {row[0].rut: TrabajadorPorRut(*row) for row in rows}
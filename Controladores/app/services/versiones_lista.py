@@ -0,0 +1,151 @@
+import hashlib
+from datetime import datetime, timezone
+
+from fastapi import Request, Response, status
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models.generated import EmpresaSocio, Usuario
+from app.models.versiones import VersionLista
+
+# Tablas con ETag en su endpoint /list. Las que no tienen id_empresa son
+# catálogos globales y se versionan con id_empresa = 0
+TABLAS_VERSIONADAS = {"clausulas", "epp", "odi", "nacionalidad"}
+EMPRESA_GLOBAL = 0
+
+# GET /empresa/full se versiona como una sola "tabla" por empresa: un cambio
+# en cualquiera de las tablas que arma la respuesta sube su versión. Las de
+# TABLAS_EMPRESA_FULL tienen id_empresa propio; pago_acciones y login_usuario
+# cuelgan de un socio o de un usuario y la empresa se busca en la fila padre
+EMPRESA_FULL = "empresa_full"
+TABLAS_EMPRESA_FULL = {
+    "empresa", "empresa_socio", "empresa_parametros", "empresa_representante",
+    "empresa_seguridad", "empresa_tipo", "usuario",
+}
+# tabla hija -> (atributo con la FK, modelo padre)
+TABLAS_HIJAS_EMPRESA_FULL = {
+    "pago_acciones": ("id_socio", EmpresaSocio),
+    "login_usuario": ("id_usuario", Usuario),
+}
+
+
+def crear_tabla_versiones(bind=engine) -> None:
+    """Crea la tabla version_lista si no existe (no forma parte de generated.py)."""
+    VersionLista.__table__.create(bind=bind, checkfirst=True)
+
+
+def _tabla_empresa(objeto):
+    tabla = getattr(objeto, "__tablename__", None)
+    if tabla in TABLAS_EMPRESA_FULL:
+        empresa_id = getattr(objeto, "id_empresa", None)
+        return (EMPRESA_FULL, empresa_id) if empresa_id else None
+    if tabla not in TABLAS_VERSIONADAS:
+        return None
+    return tabla, getattr(objeto, "id_empresa", None) or EMPRESA_GLOBAL
+
+
+def _padres_empresa_full(objeto) -> set[tuple[str, int]]:
+    """
+    (tabla hija, id del padre) de una fila de pago_acciones o login_usuario.
+    Si la fila cambia de padre se devuelven el anterior y el nuevo: ambas
+    empresas cambian.
+    """
+    tabla = getattr(objeto, "__tablename__", None)
+    if tabla not in TABLAS_HIJAS_EMPRESA_FULL:
+        return set()
+    fk, _ = TABLAS_HIJAS_EMPRESA_FULL[tabla]
+    historia = inspect(objeto).attrs[fk].history
+    ids = {getattr(objeto, fk), *historia.deleted}
+    return {(tabla, id_padre) for id_padre in ids if id_padre}
+
+
+def _empresas_de_padres(conn, padres: set[tuple[str, int]]) -> set[int]:
+    # Una consulta por tabla padre, no una por fila hija
+    empresas = set()
+    for tabla, (fk, modelo) in TABLAS_HIJAS_EMPRESA_FULL.items():
+        ids = sorted(id_padre for t, id_padre in padres if t == tabla)
+        if ids:
+            pk = getattr(modelo, fk)
+            empresas.update(conn.execute(select(modelo.id_empresa).where(pk.in_(ids))).scalars())
+    empresas.discard(None)
+    return empresas
+
+
+def _subir_version(dialecto: str, tabla: str, empresa_id: int):
+    insert = pg_insert if dialecto == "postgresql" else sqlite_insert
+    ahora = datetime.now(timezone.utc)
+    stmt = insert(VersionLista).values(tabla=tabla, id_empresa=empresa_id, version=1, actualizado=ahora)
+    return stmt.on_conflict_do_update(
+        index_elements=["tabla", "id_empresa"],
+        set_={"version": VersionLista.version + 1, "actualizado": ahora},
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _incrementar_versiones(session, flush_context):
+    # Cualquier alta, cambio o baja por el ORM sobre una tabla versionada sube
+    # su versión dentro de la misma transacción: si hay rollback, no cambia
+    cambios = set()
+    padres = set()
+    modificados = [o for o in session.dirty if session.is_modified(o)]
+    for objeto in [*session.new, *session.deleted, *modificados]:
+        cambios.add(_tabla_empresa(objeto))
+        padres |= _padres_empresa_full(objeto)
+    cambios.discard(None)
+    if not cambios and not padres:
+        return
+
+    conn = session.connection()
+    if padres:
+        cambios.update((EMPRESA_FULL, empresa_id) for empresa_id in _empresas_de_padres(conn, padres))
+    for tabla, empresa_id in sorted(cambios):
+        conn.execute(_subir_version(conn.dialect.name, tabla, empresa_id))
+
+
+async def subir_version(db: AsyncSession, tabla: str, empresa_id: int = EMPRESA_GLOBAL) -> None:
+    """
+    Sube la versión dentro de la transacción de `db`. Solo hace falta para
+    escrituras que no pasan por el flush del ORM (INSERT masivos de Core).
+    """
+    await db.execute(_subir_version(db.get_bind().dialect.name, tabla, empresa_id))
+
+
+async def etag_lista(db: AsyncSession, tabla: str, empresa_id: int = EMPRESA_GLOBAL) -> str:
+    """
+    ETag fuerte del listado sin leer el listado: una consulta por PK a
+    version_lista. La fecha de la última versión entra en el hash para que
+    recrear la tabla (versiones desde 1) no reutilice ETags antiguos.
+    """
+    fila = (await db.execute(
+        select(VersionLista.version, VersionLista.actualizado)
+        .where(VersionLista.tabla == tabla, VersionLista.id_empresa == empresa_id)
+    )).first()
+    version = f"{fila.version}:{fila.actualizado.isoformat()}" if fila else "0"
+    digest = hashlib.sha256(f"{tabla}:{empresa_id}:{version}".encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _coincide(if_none_match: str, etag: str) -> bool:
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    if if_none_match.strip() == "*":
+        return True
+    candidatos = (c.strip() for c in if_none_match.split(","))
+    return any(c.removeprefix("W/") == etag for c in candidatos)
+
+
+def respuesta_condicional(request: Request, response: Response, etag: str):
+    """
+    Devuelve una respuesta 304 si el cliente ya tiene esta versión; si no,
+    deja el ETag en `response` y devuelve None para que el endpoint siga.
+    """
+    # private: el listado depende de la empresa del token; no-cache: revalidar siempre
+    cabeceras = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _coincide(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabeceras)
+    response.headers.update(cabeceras)
+    return None
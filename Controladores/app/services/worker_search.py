@@ -0,0 +1,295 @@
+import asyncio
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, Text, cast, func, literal, literal_column, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.generated import Cargo, DatosTrabajador, Trabajador
+
+# Backend de búsqueda: "auto" (según el motor), "postgres" o "ngram"
+WORKER_SEARCH_BACKEND = os.getenv("WORKER_SEARCH_BACKEND", "auto")
+# Similitud mínima (0-1) para considerar un resultado
+WORKER_SEARCH_THRESHOLD = float(os.getenv("WORKER_SEARCH_THRESHOLD", "0.3"))
+# Segundos que vive un índice en memoria antes de reconstruirse
+WORKER_SEARCH_INDEX_TTL = int(os.getenv("WORKER_SEARCH_INDEX_TTL", "300"))
+
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas, sin tildes ni signos: 'González' → 'gonzalez'."""
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", sin_tildes.lower()).strip()
+
+
+def trigramas(texto: str) -> set:
+    """Trigramas por palabra, con el mismo relleno que usa pg_trgm."""
+    grams = set()
+    for palabra in texto.split():
+        rellena = f"  {palabra} "
+        for i in range(len(rellena) - 2):
+            grams.add(rellena[i:i + 3])
+    return grams
+
+
+def _rut_prefijo(query: str) -> Optional[str]:
+    # "12.345" o "12345678-" se tratan como prefijo de RUT
+    limpio = query.replace(".", "").replace("-", "").strip()
+    return limpio if limpio.isdigit() else None
+
+
+# ==============================================================
+# Índice n-gram en memoria (fallback para SQLite / desarrollo)
+# ==============================================================
+
+class NgramIndex:
+    """
+    Índice invertido trigrama → trabajadores. Una búsqueda solo recorre las
+    listas de los trigramas de la consulta, nunca todos los documentos.
+    """
+
+    def __init__(self):
+        self._postings = defaultdict(set)
+        self._docs = {}
+        self._ruts: List[Tuple[str, int]] = []
+        self._lock = threading.Lock()
+        self.creado = time.monotonic()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, id_trabajador: int, campos: Iterable[str], rut) -> None:
+        grams = set()
+        for campo in campos:
+            grams |= trigramas(normalizar(campo))
+        rut_str = str(rut) if rut is not None else ""
+        with self._lock:
+            self._docs[id_trabajador] = (grams, rut_str)
+            for g in grams:
+                self._postings[g].add(id_trabajador)
+            if rut_str:
+                bisect.insort(self._ruts, (rut_str, id_trabajador))
+
+    def search(self, query: str, limit: int = 10, umbral: float = WORKER_SEARCH_THRESHOLD) -> List[Tuple[int, float]]:
+        """Top-k (id_trabajador, score) ordenados por score descendente."""
+        scores = {}
+
+        prefijo = _rut_prefijo(query)
+        if prefijo:
+            with self._lock:
+                i = bisect.bisect_left(self._ruts, (prefijo, -1))
+                while i < len(self._ruts) and self._ruts[i][0].startswith(prefijo):
+                    scores[self._ruts[i][1]] = 1.0
+                    i += 1
+
+        q_grams = trigramas(normalizar(query))
+        if q_grams:
+            total = len(q_grams)
+            # Filtro por prefijo: para llegar al umbral un documento debe tener al
+            # menos `minimo` trigramas de la consulta, así que necesariamente
+            # aparece en alguna de las (total - minimo + 1) listas más cortas.
+            minimo = max(1, math.ceil(umbral * total))
+            with self._lock:
+                listas = sorted((self._postings.get(g, ()) for g in q_grams), key=len)
+                candidatos = set().union(*listas[:total - minimo + 1])
+                for id_trabajador in candidatos:
+                    # Igual que word_similarity de pg_trgm: fracción de trigramas
+                    # de la consulta presentes en el documento
+                    score = len(q_grams & self._docs[id_trabajador][0]) / total
+                    if score >= umbral and score > scores.get(id_trabajador, 0.0):
+                        scores[id_trabajador] = score
+
+        mejores = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(id_trabajador, round(score, 4)) for id_trabajador, score in mejores]
+
+
+_indices = {}
+_indices_lock = threading.Lock()
+# Sube con cada invalidación: una construcción que empezó antes no guarda su índice
+_generaciones = defaultdict(int)
+# Un lock por empresa: las búsquedas concurrentes con el índice vencido esperan
+# la misma reconstrucción en vez de leer la tabla y armar el índice cada una
+_construcciones = defaultdict(asyncio.Lock)
+
+
+def invalidar_indice(empresa_id: int) -> None:
+    """Descarta el índice en memoria de la empresa (p. ej. al crear trabajadores)."""
+    with _indices_lock:
+        _indices.pop(empresa_id, None)
+        _generaciones[empresa_id] += 1
+
+
+def _indice_vigente(empresa_id: int) -> Optional[NgramIndex]:
+    with _indices_lock:
+        indice = _indices.get(empresa_id)
+    if indice is not None and time.monotonic() - indice.creado < WORKER_SEARCH_INDEX_TTL:
+        return indice
+    return None
+
+
+def _construir_indice(rows) -> NgramIndex:
+    indice = NgramIndex()
+    for id_trabajador, nombre, apellido_paterno, apellido_materno, rut, cargo in rows:
+        indice.add(id_trabajador, (nombre, apellido_paterno, apellido_materno, cargo), rut)
+    return indice
+
+
+async def _indice_empresa(db: AsyncSession, empresa_id: int) -> NgramIndex:
+    indice = _indice_vigente(empresa_id)
+    if indice is not None:
+        return indice
+
+    async with _construcciones[empresa_id]:
+        # Otra búsqueda pudo reconstruirlo mientras se esperaba el lock
+        indice = _indice_vigente(empresa_id)
+        if indice is not None:
+            return indice
+
+        with _indices_lock:
+            generacion = _generaciones[empresa_id]
+        # Construcción en una sola consulta con solo las columnas necesarias
+        rows = (await db.execute(
+            select(
+                DatosTrabajador.id_trabajador,
+                DatosTrabajador.nombre,
+                DatosTrabajador.apellido_paterno,
+                DatosTrabajador.apellido_materno,
+                DatosTrabajador.rut,
+                Cargo.nombre,
+            )
+            .outerjoin(Cargo, Cargo.id_cargo == DatosTrabajador.id_cargo)
+            .where(DatosTrabajador.id_empresa == empresa_id)
+        )).all()
+
+        # Normalizar y armar los trigramas de miles de trabajadores es CPU puro:
+        # fuera del event loop para no frenar las demás peticiones
+        indice = await run_in_threadpool(_construir_indice, rows)
+
+        with _indices_lock:
+            if _generaciones[empresa_id] == generacion:
+                _indices[empresa_id] = indice
+    return indice
+
+
+# ==============================================================
+# Backend PostgreSQL (pg_trgm + unaccent)
+# ==============================================================
+
+# DDL requerido por el backend PostgreSQL. unaccent() no es IMMUTABLE,
+# por eso se envuelve en f_unaccent para poder indexarla.
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS
+    $$ SELECT public.unaccent('public.unaccent', $1) $$
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_datos_trabajador_nombre_trgm ON datos_trabajador
+    USING gin (f_unaccent(lower(nombre || ' ' || apellido_paterno || ' ' || apellido_materno)) gin_trgm_ops)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_cargo_nombre_trgm ON cargo
+    USING gin (f_unaccent(lower(nombre)) gin_trgm_ops)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_datos_trabajador_rut_text ON datos_trabajador
+    ((rut::text) text_pattern_ops)
+    """,
+]
+
+
+def crear_indices_postgres(engine) -> None:
+    """Crea extensiones, función e índices trigram (idempotente)."""
+    with engine.begin() as conn:
+        for ddl in POSTGRES_SEARCH_DDL:
+            conn.execute(text(ddl))
+
+
+def consulta_postgres(empresa_id: int, query: str, limit: int) -> Select:
+    """
+    Consulta del backend PostgreSQL. Cada criterio va en su propia subconsulta
+    con la misma expresión que su índice (nombre completo y RUT sobre
+    datos_trabajador, nombre del cargo sobre cargo), así el planner usa un
+    índice por rama; la UNION se agrupa por trabajador con el mejor score.
+    """
+    dt = DatosTrabajador.__table__
+    tr = Trabajador.__table__
+    ca = Cargo.__table__
+    espacio = literal_column("' '")
+    q = func.f_unaccent(func.lower(literal(query)))
+    # Mismas expresiones que POSTGRES_SEARCH_DDL, literal ' ' incluido: con un
+    # parámetro en su lugar la expresión ya no coincide con la del índice
+    nombre_expr = func.f_unaccent(func.lower(
+        dt.c.nombre.op("||")(espacio).op("||")(dt.c.apellido_paterno).op("||")(espacio).op("||")(dt.c.apellido_materno)
+    ))
+    cargo_expr = func.f_unaccent(func.lower(ca.c.nombre))
+
+    ramas = [
+        select(dt.c.id_trabajador, func.word_similarity(q, nombre_expr).label("score"))
+        .join(tr, tr.c.id_trabajador == dt.c.id_trabajador)
+        .where(tr.c.id_empresa == empresa_id, q.op("<%")(nombre_expr)),
+        select(dt.c.id_trabajador, func.word_similarity(q, cargo_expr).label("score"))
+        .select_from(ca)
+        .join(tr, tr.c.id_cargo == ca.c.id_cargo)
+        .join(dt, dt.c.id_trabajador == tr.c.id_trabajador)
+        .where(tr.c.id_empresa == empresa_id, q.op("<%")(cargo_expr)),
+    ]
+    prefijo = _rut_prefijo(query)
+    if prefijo:
+        ramas.append(
+            select(dt.c.id_trabajador, literal(1.0).label("score"))
+            .join(tr, tr.c.id_trabajador == dt.c.id_trabajador)
+            .where(tr.c.id_empresa == empresa_id, cast(dt.c.rut, Text).like(f"{prefijo}%"))
+        )
+
+    coincidencias = union_all(*ramas).subquery("coincidencias")
+    score = func.max(coincidencias.c.score).label("score")
+    return (
+        select(coincidencias.c.id_trabajador, score)
+        .group_by(coincidencias.c.id_trabajador)
+        .order_by(score.desc(), coincidencias.c.id_trabajador)
+        .limit(limit)
+    )
+
+
+async def _buscar_postgres(db: AsyncSession, empresa_id: int, query: str, limit: int) -> List[Tuple[int, float]]:
+    await db.execute(
+        text("SELECT set_config('pg_trgm.word_similarity_threshold', :umbral, true)"),
+        {"umbral": str(WORKER_SEARCH_THRESHOLD)},
+    )
+    rows = (await db.execute(consulta_postgres(empresa_id, query, limit))).all()
+    return [(id_trabajador, round(float(s), 4)) for id_trabajador, s in rows]
+
+
+def _usar_postgres(db: AsyncSession) -> bool:
+    if WORKER_SEARCH_BACKEND == "postgres":
+        return True
+    if WORKER_SEARCH_BACKEND == "ngram":
+        return False
+    return db.bind.dialect.name == "postgresql"
+
+
+async def buscar_trabajadores_fuzzy(db: AsyncSession, empresa_id: int, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+    """
+    Búsqueda difusa e insensible a tildes sobre nombre completo, prefijo de RUT
+    y cargo. Devuelve hasta `limit` pares (id_trabajador, score).
+    """
+    if _usar_postgres(db):
+        return await _buscar_postgres(db, empresa_id, query, limit)
+    indice = await _indice_empresa(db, empresa_id)
+    return indice.search(query, limit=limit)
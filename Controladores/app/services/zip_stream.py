@@ -0,0 +1,44 @@
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+
+class _SalidaSecuencial:
+    """
+    Destino de solo escritura para ZipFile: sin seek(), así zipfile escribe
+    cada entrada con data descriptor y lo ya escrito se puede enviar de inmediato.
+    """
+
+    def __init__(self):
+        self._partes = []
+        self._posicion = 0
+
+    def write(self, datos) -> int:
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self) -> int:
+        return self._posicion
+
+    def flush(self) -> None:
+        pass
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def iter_zip(archivos: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """
+    Genera un ZIP por partes a partir de pares (nombre, contenido), para
+    usar con StreamingResponse. Los PDF ya vienen comprimidos, por eso se
+    guardan sin volver a comprimir (ZIP_STORED).
+    """
+    salida = _SalidaSecuencial()
+    with zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_STORED) as zf:
+        for nombre, contenido in archivos:
+            zf.writestr(nombre, contenido)
+            yield salida.vaciar()
+    # Directorio central
+    yield salida.vaciar()
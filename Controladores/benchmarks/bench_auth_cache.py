@@ -0,0 +1,91 @@
+"""
+Benchmark del costo de autenticación por request en get_current_user.
+
+"sin caché" verifica el JWT (firma HMAC + exp) en cada llamada, como antes;
+"con caché" reutiliza los claims ya verificados del mismo token. Se mide la
+dependencia sola y también un request completo con TestClient contra un
+endpoint mínimo que solo depende de get_current_user, para ver qué fracción
+del request representa la autenticación.
+
+Uso:
+    poetry run python -m benchmarks.bench_auth_cache --repeat 20000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+# La app lee la configuración JWT al importarse
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.services import auth  # noqa: E402
+from app.services.dependencies import get_current_user  # noqa: E402
+from app.services.token_cache import token_cache  # noqa: E402
+
+
+def medir(fn, repeticiones: int):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1_000_000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = auth.create_access_token({"sub": "1", "empresa_id": "1", "rol": "1"})
+    credenciales = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    loop = asyncio.new_event_loop()
+    tamano_original = token_cache.max_entries
+
+    def dependencia():
+        loop.run_until_complete(get_current_user(credenciales))
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping(current_user: dict = Depends(get_current_user)):
+        return current_user
+
+    cliente = TestClient(app)
+    cabeceras = {"Authorization": f"Bearer {token}"}
+
+    def request():
+        cliente.get("/ping", headers=cabeceras)
+
+    resultados = {}
+    for nombre, tamano in (("sin caché", 0), ("con caché", tamano_original or 10000)):
+        token_cache.max_entries = tamano
+        token_cache.clear()
+        resultados[nombre] = (
+            medir(dependencia, args.repeat),
+            medir(request, max(1, args.repeat // 10)),
+        )
+    token_cache.max_entries = tamano_original
+
+    print(f"{'':<12}{'dependencia p50':>17}{'p95':>10}{'request p50':>14}{'p95':>10}")
+    for nombre, ((d50, d95), (r50, r95)) in resultados.items():
+        print(f"{nombre:<12}{d50:>15.1f}µs{d95:>8.1f}µs{r50:>12.1f}µs{r95:>8.1f}µs")
+
+    (s50, _), (sr50, _) = resultados["sin caché"]
+    (c50, _), (cr50, _) = resultados["con caché"]
+    print(f"\nAhorro por request: {s50 - c50:.1f}µs en la dependencia ({s50 / c50:.1f}x), "
+          f"{sr50 - cr50:.1f}µs en el request completo")
+    print(f"Caché: {token_cache.status()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Benchmark de los endpoints de la API con empresas sintéticas.
+
+Siembra una base (SQLite temporal por defecto, o la de --database-url) con
+N empresas, cada una con su usuario admin, trabajadores con RUT válidos,
+contratos, EPP, ODI y cláusulas, y recorre los routers con TestClient
+(la app completa, con middlewares, pool de renderizado PDF y caches). Por
+endpoint reporta requests por segundo y latencia p50/p95/p99, y guarda los
+resultados en JSON para comparar corridas entre commits.
+
+Los requests se reparten entre las empresas y cambian de trabajador en cada
+iteración, así los PDF no salen de la caché de documentos. Los endpoints que
+crean registros (create, register, import) no se miden para que las corridas
+sean comparables; login y refresh sí. Con --database-url usar una base de
+pruebas: se agregan empresas nuevas y nunca se borra nada.
+
+Uso:
+    poetry run python -m benchmarks.bench_endpoints --empresas 3 --trabajadores 10000
+    poetry run python -m benchmarks.bench_endpoints --trabajadores 100000 --solo trabajadores
+    poetry run python -m benchmarks.bench_endpoints --comparar benchmarks/resultados/endpoints_1a6d91a_20250101_120000.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import secrets
+import shutil
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+NOMBRES = ["José", "María", "Juan", "Ana", "Pedro", "Camila", "Ignacio", "Valentina", "Andrés", "Sofía"]
+APELLIDOS = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez", "Sepúlveda",
+             "Morales", "Rodríguez", "López", "Fuentes", "Hernández", "Torres", "Araya", "Flores", "Espinoza", "Valenzuela"]
+CARGOS = ["Soldador", "Jornal", "Capataz", "Operador de grúa", "Administrativo", "Bodeguero", "Electricista", "Prevencionista"]
+ELEMENTOS_EPP = ["Casco", "Guantes", "Lentes de seguridad", "Zapatos de seguridad", "Arnés", "Protector auditivo",
+                 "Chaleco reflectante", "Mascarilla", "Careta de soldar", "Overol"]
+CONSULTAS_FUZZY = ["Gonzalez", "munoz rojas", "Sepulbeda", "jose diaz", "operador grua", "electrisista"]
+PASSWORD = "Bench1234"
+LOTE = 10_000
+
+
+@dataclass
+class Tenant:
+    id_empresa: int
+    correo: str
+    token: str = ""
+    refresh_token: str = ""
+    ruts: List[int] = field(default_factory=list)
+    epp: List[int] = field(default_factory=list)
+    odi: List[int] = field(default_factory=list)
+    clausulas: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Caso:
+    nombre: str
+    # kwargs de client.request para la iteración i contra una empresa
+    preparar: Callable[[Tenant, int], dict]
+    # genera documentos: usa --requests-pesados en vez de --requests
+    pesado: bool = False
+    esperado: int = 200
+    # lee la respuesta, p. ej. para rotar el refresh token
+    despues: Optional[Callable[[Tenant, object], None]] = None
+
+
+# ==============================================================
+# Base de datos sintética
+# ==============================================================
+
+def preparar_sqlite(*engines) -> None:
+    """
+    SQLite no tiene ARRAY (tipo_actividad) ni now(), que usa el listado de
+    contratos, y solo autoincrementa claves INTEGER (odi usa BIGINT): se
+    ajustan aquí, sin tocar los modelos.
+    """
+    from sqlalchemy import ARRAY, BigInteger, event
+    from sqlalchemy.ext.compiler import compiles
+
+    @compiles(ARRAY, "sqlite")
+    def _array_sqlite(tipo, compiler, **kw):
+        return "JSON"
+
+    @compiles(BigInteger, "sqlite")
+    def _bigint_sqlite(tipo, compiler, **kw):
+        return "INTEGER"
+
+    def _now(conexion, _):
+        conexion.create_function("now", 0, lambda: datetime.now(timezone.utc).isoformat(" "))
+
+    for engine in engines:
+        event.listen(engine, "connect", _now)
+
+
+def sembrar(engine, args, rnd: random.Random) -> List[Tenant]:
+    from sqlalchemy import insert, select
+
+    from app.models.generated import (
+        Afp, Base, Cargo, Clausulas, Contrato, DatosTrabajador, Empresa, Epp, LoginUsuario,
+        Nacionalidad, Odi, Salud, Territorial, Trabajador, Usuario,
+    )
+    from app.services.auth import get_password_hash
+    from app.services.rut_validation import digito_verificador
+    from app.services.trabajadores import crear_indices_trabajador
+
+    Base.metadata.create_all(engine)
+    # Los índices de consulta no están en los modelos generados
+    crear_indices_trabajador(engine)
+    # Identifica las filas de esta corrida en una base compartida (nombres de EPP y tareas de ODI son únicos)
+    corrida = secrets.token_hex(3)
+    password_hash = get_password_hash(PASSWORD)
+    hoy = date.today()
+    tenants = []
+
+    with engine.begin() as conn:
+        def uno(tabla, **valores):
+            columna_id = list(tabla.__table__.primary_key)[0]
+            return conn.execute(insert(tabla).values(**valores).returning(columna_id)).scalar_one()
+
+        id_afp = uno(Afp, nombre="Modelo", porcentaje_descuento=10.58)
+        id_salud = uno(Salud, nombre="Fonasa", tipo=True)
+        id_territorial = uno(Territorial, region="Metropolitana", provincia="Santiago", comuna="Ñuñoa")
+        conn.execute(insert(Nacionalidad), [{"nacionalidad": n} for n in ("Chilena", "Peruana", "Venezolana", "Haitiana")])
+
+        siguiente_rut = 10_000_000 + rnd.randrange(1_000_000)
+        for e in range(args.empresas):
+            rut_empresa = 76_000_000 + rnd.randrange(1_000_000)
+            id_empresa = uno(
+                Empresa, nombre_fantasia=f"Empresa bench {e + 1}", razon_social=f"Empresa bench {e + 1} SpA",
+                rut_empresa=rut_empresa, DV_rut=digito_verificador(rut_empresa), id_territorial=id_territorial,
+                giro="Construcción", direccion_fisica="Av. Siempre Viva 123", estado_suscripcion=1,
+            )
+            tenant = Tenant(id_empresa=id_empresa, correo=f"bench_{corrida}_{id_empresa}@example.com")
+
+            id_usuario = uno(Usuario, id_empresa=id_empresa, id_territorial=id_territorial, nombre="Admin",
+                             apellido_paterno="Bench", apellido_materno="Bench")
+            conn.execute(insert(LoginUsuario), [{
+                "telefono": "+56911111111", "correo": tenant.correo, "password": password_hash,
+                "id_usuario": id_usuario, "tipo_usuario": 1, "email_verificado_at": datetime.now(timezone.utc),
+            }])
+
+            cargos = [uno(Cargo, nombre=n, descripcion=n, id_empresa=id_empresa) for n in CARGOS]
+            tenant.epp = [uno(Epp, epp=f"{ELEMENTOS_EPP[i % len(ELEMENTOS_EPP)]} {corrida}-{id_empresa}-{i + 1}",
+                              descripcion=f"{ELEMENTOS_EPP[i % len(ELEMENTOS_EPP)]} certificado {corrida}-{id_empresa}-{i + 1}",
+                              id_empresa=id_empresa) for i in range(args.epp)]
+            tenant.odi = [uno(Odi, tarea=f"Tarea {i + 1} {corrida}-{id_empresa}", riesgo="Caída de altura",
+                              consecuencias="Lesiones, fracturas", precaucion="Uso de arnés y línea de vida",
+                              id_empresa=id_empresa) for i in range(args.odi)]
+            tenant.clausulas = [f"Cláusula {i + 1}: el trabajador se obliga a cumplir el reglamento interno."
+                                for i in range(args.clausulas)]
+            conn.execute(insert(Clausulas), [{"id_empresa": id_empresa, "titulo": f"Cláusula {i + 1}", "clausula": texto}
+                                             for i, texto in enumerate(tenant.clausulas)])
+
+            # Trabajadores: primero la tabla base y luego datos_trabajador con
+            # los id asignados (en el mismo orden, dentro de la transacción)
+            for inicio in range(0, args.trabajadores, LOTE):
+                cantidad = min(LOTE, args.trabajadores - inicio)
+                conn.execute(insert(Trabajador.__table__), [
+                    {"id_empresa": id_empresa, "id_afp": id_afp, "id_territorial": id_territorial,
+                     "id_cargo": rnd.choice(cargos), "id_salud": id_salud} for _ in range(cantidad)
+                ])
+            ids = conn.execute(
+                select(Trabajador.id_trabajador).where(Trabajador.id_empresa == id_empresa).order_by(Trabajador.id_trabajador)
+            ).scalars().all()
+            tenant.ruts = list(range(siguiente_rut, siguiente_rut + len(ids)))
+            siguiente_rut += len(ids)
+            for inicio in range(0, len(ids), LOTE):
+                lote = list(zip(ids[inicio:inicio + LOTE], tenant.ruts[inicio:inicio + LOTE]))
+                conn.execute(insert(DatosTrabajador.__table__), [
+                    {"id_trabajador": id_trabajador, "nombre": rnd.choice(NOMBRES),
+                     "apellido_paterno": rnd.choice(APELLIDOS), "apellido_materno": rnd.choice(APELLIDOS),
+                     "fecha_nacimiento": date(1960 + rnd.randrange(45), 1 + rnd.randrange(12), 1 + rnd.randrange(28)),
+                     "rut": rut, "DV_rut": digito_verificador(rut), "nacionalidad": "Chilena",
+                     "direccion_real": f"Calle {rnd.randrange(1, 5000)}"} for id_trabajador, rut in lote
+                ])
+                contratados = [id_trabajador for id_trabajador, _ in lote if rnd.random() < args.contratos]
+                if contratados:
+                    conn.execute(insert(Contrato), [
+                        {"id_trabajador": id_trabajador, "direccion_contrato": "Obra Los Andes",
+                         "fecha_subida": datetime.now(timezone.utc),
+                         "fecha_inicial": datetime.combine(hoy - timedelta(days=rnd.randrange(1, 1500)), datetime.min.time()),
+                         "fecha_termino": None if rnd.random() < 0.3 else
+                         datetime.combine(hoy + timedelta(days=rnd.randrange(-700, 700)), datetime.min.time())}
+                        for id_trabajador in contratados
+                    ])
+            tenants.append(tenant)
+    return tenants
+
+
+# ==============================================================
+# Casos por router
+# ==============================================================
+
+def _auth(tenant: Tenant) -> dict:
+    return {"Authorization": f"Bearer {tenant.token}"}
+
+
+def _rut(tenant: Tenant, i: int) -> int:
+    # Paso primo: recorre los trabajadores sin repetir en las primeras iteraciones
+    return tenant.ruts[(i * 7919) % len(tenant.ruts)]
+
+
+def _rotar_refresh(tenant: Tenant, respuesta) -> None:
+    if respuesta.status_code == 200:
+        tenant.refresh_token = respuesta.json()["refresh_token"]
+
+
+def casos() -> List[Caso]:
+    def get(ruta, **params):
+        return lambda t, i: {"method": "GET", "url": ruta, "params": params, "headers": _auth(t)}
+
+    def epp_pdf(t, i):
+        elementos = [{"id_epp": id_epp, "cantidad": 1 + i % 3} for id_epp in t.epp[:1 + i % len(t.epp)]]
+        return {"method": "POST", "url": "/epp/generate-pdf", "headers": _auth(t),
+                "json": {"rut": str(_rut(t, i)), "elementos": elementos}}
+
+    def epp_lote(t, i):
+        ruts = [str(_rut(t, i * 10 + k)) for k in range(10)]
+        return {"method": "POST", "url": "/epp/generate-pdf-batch", "headers": _auth(t),
+                "json": {"ruts": ruts, "elementos": [{"id_epp": id_epp} for id_epp in t.epp[:5]]}}
+
+    def odi_pdf(t, i):
+        rut = _rut(t, i)
+        return {"method": "POST", "url": "/odi/generate-pdf", "headers": _auth(t),
+                "json": {"nombre": "Trabajador Bench", "rut": str(rut), "cargo": "Soldador",
+                         "empresa_nombre": "Empresa bench", "empresa_rut": "76000000-0", "elementos": t.odi}}
+
+    def contrato_pdf(t, i):
+        rut = _rut(t, i)
+        return {"method": "POST", "url": "/contrato/generate-pdf", "headers": _auth(t), "json": {
+            "ciudad_firma": "Santiago", "fecha_contrato": str(date.today()), "representante_legal": "Ana Soto",
+            "rut_representante": "12345678-5", "domicilio_representante": "Av. Siempre Viva 123",
+            "nombre_trabajador": "Trabajador Bench", "nacionalidad_trabajador": "Chilena",
+            "rut_trabajador": str(rut), "estado_civil_trabajador": "Soltero",
+            "fecha_nacimiento_trabajador": "1990-01-01", "domicilio_trabajador": "Calle 1",
+            "cargo_trabajador": "Soldador", "lugar_trabajo": "Obra Los Andes", "sueldo": 650000 + i,
+            "jornada": "Completa", "descripcion_jornada": "Lunes a viernes de 08:00 a 18:00",
+            "clausulas": t.clausulas,
+        }}
+
+    def termino_pdf(t, i):
+        return {"method": "POST", "url": "/contrato/generate-pdf-termino", "headers": _auth(t), "json": {
+            "rut_trabajador": str(_rut(t, i)), "ciudad": "Santiago", "fecha_carta": str(date.today()),
+            "fecha_termino": str(date.today() + timedelta(days=30)), "articulo_causal": "Artículo 159 N° 5",
+            "descripcion_causal": "CONCLUSIÓN DEL TRABAJO QUE DIO ORIGEN AL CONTRATO",
+            "fundamentacion": "Término de la obra específica.", "lugar_pago_finiquito": "Notaría de Santiago",
+            "telefono_notaria": "2 2542 3003",
+        }}
+
+    return [
+        Caso("POST /auth/login_api", lambda t, i: {
+            "method": "POST", "url": "/auth/login_api", "json": {"email": t.correo, "password": PASSWORD}}, pesado=True),
+        Caso("POST /auth/refresh", lambda t, i: {
+            "method": "POST", "url": "/auth/refresh", "params": {"refresh_token": t.refresh_token}},
+            despues=_rotar_refresh),
+        Caso("GET /empresa/full", get("/empresa/full")),
+        Caso("GET /nacionalidad/list", get("/nacionalidad/list")),
+        Caso("GET /clausulas/list", get("/clausulas/list")),
+        Caso("GET /epp/list", get("/epp/list")),
+        Caso("GET /odi/list", get("/odi/list")),
+        Caso("GET /trabajadores/search", lambda t, i: {
+            "method": "GET", "url": "/trabajadores/search", "headers": _auth(t),
+            "params": {"apellido_paterno": APELLIDOS[i % len(APELLIDOS)], "limit": 50}}),
+        Caso("GET /trabajadores/search/fuzzy", lambda t, i: {
+            "method": "GET", "url": "/trabajadores/search/fuzzy", "headers": _auth(t),
+            "params": {"q": CONSULTAS_FUZZY[i % len(CONSULTAS_FUZZY)]}}),
+        Caso("GET /trabajadores/search-by-rut", lambda t, i: {
+            "method": "GET", "url": "/trabajadores/search-by-rut", "headers": _auth(t),
+            "params": {"rut": str(_rut(t, i))}}),
+        Caso("POST /epp/generate-pdf", epp_pdf, pesado=True),
+        Caso("POST /epp/generate-pdf-batch", epp_lote, pesado=True),
+        Caso("POST /odi/generate-pdf", odi_pdf, pesado=True),
+        Caso("POST /contrato/generate-pdf", contrato_pdf, pesado=True),
+        Caso("POST /contrato/generate-pdf-termino", termino_pdf, pesado=True),
+        Caso("GET /contrato/generate-list-contracts", get("/contrato/generate-list-contracts"), pesado=True),
+    ]
+
+
+# ==============================================================
+# Medición
+# ==============================================================
+
+def percentil(ordenados: List[float], p: float) -> float:
+    # Nearest-rank, sin interpolar
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+def medir(client, caso: Caso, tenants: List[Tenant], requests: int, calentamiento: int) -> dict:
+    for i in range(calentamiento):
+        tenant = tenants[i % len(tenants)]
+        respuesta = client.request(**caso.preparar(tenant, i))
+        if caso.despues:
+            caso.despues(tenant, respuesta)
+
+    duraciones, errores, primer_error = [], 0, None
+    inicio_total = time.perf_counter()
+    for i in range(calentamiento, calentamiento + requests):
+        tenant = tenants[i % len(tenants)]
+        kwargs = caso.preparar(tenant, i)
+        inicio = time.perf_counter()
+        respuesta = client.request(**kwargs)
+        _ = respuesta.content  # incluye el cuerpo completo (PDF, XLSX) en la medición
+        duraciones.append(time.perf_counter() - inicio)
+        if caso.despues:
+            caso.despues(tenant, respuesta)
+        if respuesta.status_code != caso.esperado:
+            errores += 1
+            primer_error = primer_error or f"{respuesta.status_code}: {respuesta.text[:200]}"
+    total = time.perf_counter() - inicio_total
+
+    ordenados = sorted(duraciones)
+    return {
+        "requests": requests,
+        "errores": errores,
+        "primer_error": primer_error,
+        "req_por_segundo": round(requests / total, 2),
+        "media_ms": round(1000 * sum(ordenados) / len(ordenados), 3),
+        "p50_ms": round(1000 * percentil(ordenados, 50), 3),
+        "p95_ms": round(1000 * percentil(ordenados, 95), 3),
+        "p99_ms": round(1000 * percentil(ordenados, 99), 3),
+        "max_ms": round(1000 * ordenados[-1], 3),
+    }
+
+
+def commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def imprimir(resultados: Dict[str, dict], anterior: Optional[dict]) -> None:
+    print(f"\n{'endpoint':<40}{'n':>6}{'err':>5}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          + (f"{'Δ p50':>9}{'Δ p95':>9}" if anterior else ""))
+    for nombre, r in resultados.items():
+        linea = (f"{nombre:<40}{r['requests']:>6}{r['errores']:>5}{r['req_por_segundo']:>9.1f}"
+                 f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+        previo = (anterior or {}).get("endpoints", {}).get(nombre)
+        if previo:
+            for clave in ("p50_ms", "p95_ms"):
+                linea += f"{100 * (r[clave] / previo[clave] - 1):>+8.1f}%" if previo[clave] else f"{'':>9}"
+        print(linea)
+    for nombre, r in resultados.items():
+        if r["primer_error"]:
+            print(f"\n⚠️  {nombre}: {r['errores']} respuestas inesperadas, p. ej. {r['primer_error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--empresas", type=int, default=2, help="empresas sintéticas")
+    parser.add_argument("--trabajadores", type=int, default=10_000, help="trabajadores por empresa")
+    parser.add_argument("--contratos", type=float, default=0.8, help="fracción de trabajadores con contrato")
+    parser.add_argument("--epp", type=int, default=10, help="elementos EPP por empresa")
+    parser.add_argument("--odi", type=int, default=10, help="ODI por empresa")
+    parser.add_argument("--clausulas", type=int, default=10, help="cláusulas por empresa")
+    parser.add_argument("--requests", type=int, default=200, help="requests medidos por endpoint")
+    parser.add_argument("--requests-pesados", type=int, default=20, help="requests medidos en login, PDF y Excel")
+    parser.add_argument("--calentamiento", type=int, default=3, help="requests sin medir antes de cada endpoint")
+    parser.add_argument("--solo", default="", help="mide solo los endpoints que contienen este texto")
+    parser.add_argument("--database-url", default="", help="base de pruebas (por defecto SQLite temporal)")
+    parser.add_argument("--salida", default="", help="JSON de resultados (por defecto benchmarks/resultados/)")
+    parser.add_argument("--comparar", default="", help="JSON de una corrida anterior para mostrar diferencias")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # La app lee su configuración al importarse: todo el entorno va antes
+    directorio = tempfile.mkdtemp(prefix="bench_endpoints_")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{directorio}/bench.sqlite"
+    os.environ["PDF_CACHE_DIR"] = os.path.join(directorio, "pdf_cache")
+    os.environ["EMAIL_FILE_DIR"] = os.path.join(directorio, "emails")
+    os.environ["EMAIL_TRANSPORT"] = "file"
+    os.environ.setdefault("EMAIL_DISPATCHER_ENABLED", "false")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+    os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+
+    from fastapi.testclient import TestClient
+
+    from app.database import async_engine, engine
+    from app.main import app
+
+    if engine.url.get_backend_name() == "sqlite":
+        preparar_sqlite(engine, async_engine.sync_engine)
+
+    inicio = time.perf_counter()
+    tenants = sembrar(engine, args, random.Random(args.seed))
+    print(f"Base sembrada en {time.perf_counter() - inicio:.1f} s ({engine.url.get_backend_name()}): "
+          f"{args.empresas} empresas × {args.trabajadores:,} trabajadores")
+
+    seleccion = [c for c in casos() if args.solo.lower() in c.nombre.lower()]
+    resultados = {}
+    with TestClient(app) as client:
+        for tenant in tenants:
+            respuesta = client.post("/auth/login_api", json={"email": tenant.correo, "password": PASSWORD})
+            respuesta.raise_for_status()
+            tenant.token = respuesta.json()["access_token"]
+            tenant.refresh_token = respuesta.json()["refresh_token"]
+
+        for caso in seleccion:
+            requests = args.requests_pesados if caso.pesado else args.requests
+            resultados[caso.nombre] = medir(client, caso, tenants, requests, args.calentamiento)
+            print(f"  {caso.nombre}: p50 {resultados[caso.nombre]['p50_ms']:.2f} ms")
+
+    shutil.rmtree(directorio, ignore_errors=True)
+
+    parametros = {k: v for k, v in vars(args).items() if k not in ("salida", "comparar", "database_url")}
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        distintos = sorted(k for k, v in parametros.items() if k != "solo" and anterior["parametros"].get(k) != v)
+        if distintos or anterior.get("base") != engine.url.get_backend_name():
+            print(f"\n⚠️  La corrida anterior usó otra base o parámetros ({', '.join(distintos) or 'base'}): "
+                  f"las diferencias no son solo del código")
+    imprimir(resultados, anterior)
+
+    commit = commit_actual()
+    salida = args.salida or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "resultados",
+        f"endpoints_{commit or 'sin_commit'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump({
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "maquina": f"{platform.machine()} · {os.cpu_count()} núcleos",
+            "base": engine.url.get_backend_name(),
+            "parametros": parametros,
+            "endpoints": resultados,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados en {salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark de throughput de login: verificaciones bcrypt por segundo.
+
+Para cada costo (rounds) mide las verificaciones por segundo en un hilo y
+con el executor dedicado de app.services.auth bajo una ráfaga de logins
+concurrentes, y las reporta por núcleo. También indica cuántas se harían con
+el costo de BCRYPT_ROUNDS y cuánto cuesta el rehash de un hash antiguo.
+
+Uso:
+    poetry run python -m benchmarks.bench_password_hash --rounds 10 11 12 --logins 64
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+
+from passlib.context import CryptContext  # noqa: E402
+
+from app.services import auth  # noqa: E402
+
+PASSWORD = "Contraseña-de-prueba-123"
+
+
+def secuencial(hash_guardado: str, n: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(n):
+        auth.pwd_context.verify(PASSWORD, hash_guardado)
+    return n / (time.perf_counter() - inicio)
+
+
+async def rafaga(hash_guardado: str, n: int) -> float:
+    # n logins simultáneos, como al inicio de turno de un cliente grande
+    inicio = time.perf_counter()
+    await asyncio.gather(*(auth.verify_and_rehash_async(PASSWORD, hash_guardado) for _ in range(n)))
+    return n / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument("--logins", type=int, default=64, help="logins por medición")
+    args = parser.parse_args()
+
+    nucleos = os.cpu_count() or 1
+    hilos = auth._hash_executor._max_workers
+    backend = auth.pwd_context.handler("bcrypt").get_backend()
+    print(f"backend bcrypt: {backend}, núcleos: {nucleos}, hilos del executor: {hilos}, "
+          f"BCRYPT_ROUNDS: {auth.BCRYPT_ROUNDS}\n")
+    print(f"{'rounds':<8}{'1 hilo /s':>12}{'executor /s':>14}{'por núcleo /s':>16}{'ms por login':>15}")
+
+    for rounds in args.rounds:
+        hash_guardado = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(PASSWORD)
+        # El rehash no debe contaminar la medición: se verifica con el costo de este hash
+        auth.pwd_context.update(bcrypt__rounds=rounds)
+        uno = secuencial(hash_guardado, max(4, args.logins // 8))
+        total = asyncio.run(rafaga(hash_guardado, args.logins))
+        por_nucleo = total / min(hilos, nucleos)
+        print(f"{rounds:<8}{uno:>12.1f}{total:>14.1f}{por_nucleo:>16.1f}{1000 / uno:>15.1f}")
+
+    # Costo del primer login de un usuario con hash antiguo (verificar + rehash)
+    auth.pwd_context.update(bcrypt__rounds=auth.BCRYPT_ROUNDS)
+    antiguo = CryptContext(schemes=["bcrypt"], bcrypt__rounds=min(args.rounds)).hash(PASSWORD)
+    inicio = time.perf_counter()
+    valida, nuevo = auth.verify_and_rehash(PASSWORD, antiguo)
+    print(f"\nLogin con hash de {min(args.rounds)} rounds → rehash a {auth.BCRYPT_ROUNDS}: "
+          f"{(time.perf_counter() - inicio) * 1000:.1f}ms (válida={valida}, rehash={'sí' if nuevo else 'no'}; "
+          f"solo ocurre una vez por usuario)")
+
+
+if __name__ == "__main__":
+    main()
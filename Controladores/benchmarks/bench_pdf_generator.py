@@ -0,0 +1,239 @@
+"""
+Benchmark de los generadores PDF (app/services/pdf_generator.py) con
+documentos de tamaño real y extremo, y control de regresiones.
+
+Por escenario renderiza en memoria el mismo documento --repeat veces y
+registra el tiempo (mínimo, mediana y máximo), la memoria máxima de Python
+durante un render (tracemalloc, en una pasada aparte para no inflar los
+tiempos), la cantidad de páginas y el tamaño del PDF. Los resultados se
+comparan con benchmarks/umbrales_pdf.json:
+
+- bytes y páginas son deterministas (PDF invariante): si un escenario pasa
+  su límite el proceso termina con código 1.
+- tiempo y memoria dependen de la máquina y de la carga: se compara el
+  mínimo de las repeticiones (el menos afectado por ruido) y pasar el límite
+  solo genera un aviso, salvo con --estricto.
+
+Regenerar los umbrales en la máquina de referencia (CI) con
+--actualizar-umbrales, que guarda los valores medidos más un margen; en CI
+conviene --estricto solo con umbrales generados ahí mismo.
+
+Uso:
+    poetry run python -m benchmarks.bench_pdf_generator
+    poetry run python -m benchmarks.bench_pdf_generator --solo epp --repeat 10
+    poetry run python -m benchmarks.bench_pdf_generator --actualizar-umbrales
+    poetry run python -m benchmarks.bench_pdf_generator --estricto
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+from reportlab import rl_config
+
+from app.services.pdf_generator import (
+    contrato_pdf_generator,
+    epp_pdf_generator,
+    odi_pdf_generator,
+    termino_contrato_pdf_generator,
+)
+
+UMBRALES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "umbrales_pdf.json")
+# Margen sobre lo medido al regenerar umbrales (los tiempos varían más que el
+# tamaño); a los tiempos se suman además unos ms para que los documentos
+# chicos no avisen por ruido
+MARGEN = {"minimo_ms": 2.0, "memoria_kb": 1.25, "bytes": 1.1, "paginas": 1.0}
+HOLGURA_MS = 10
+# Métricas que hacen fallar el proceso; el resto solo avisa (salvo --estricto)
+DURAS = ("bytes", "paginas")
+
+ELEMENTOS_EPP = ["Casco de seguridad", "Guantes de cabritilla", "Lentes de seguridad claros", "Zapatos de seguridad",
+                 "Arnés de cuerpo completo", "Protector auditivo tipo fono", "Chaleco reflectante", "Mascarilla 3M 6200"]
+RIESGOS = [
+    ("Caída de distinto nivel", "Fracturas, contusiones, lesiones múltiples",
+     "Uso de arnés de seguridad con doble cabo de vida anclado a línea de vida certificada."),
+    ("Proyección de partículas", "Lesiones oculares, cuerpos extraños",
+     "Uso obligatorio de lentes de seguridad y careta facial durante el esmerilado."),
+    ("Exposición a ruido", "Hipoacusia sordera profesional",
+     "Uso de protector auditivo en áreas señalizadas; rotación de puestos de trabajo."),
+    ("Contacto con energía eléctrica", "Quemaduras, paro cardiorrespiratorio",
+     "Bloqueo y etiquetado de equipos; solo personal autorizado interviene tableros."),
+]
+# Objetos de página del PDF: /Type /Page, no el árbol /Pages
+_PAGINA = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+
+def datos_epp(filas: int):
+    return SimpleNamespace(
+        empresa_nombre="Constructora Los Andes SpA", empresa_rut="76543210-3",
+        nombre="José Ignacio González Muñoz", rut="12345678-5", cargo="Operador de grúa",
+        elementos=[SimpleNamespace(elemento_proteccion=ELEMENTOS_EPP[i % len(ELEMENTOS_EPP)], cantidad=1 + i % 3,
+                                   fecha_entrega=date(2025, 1, 1) + timedelta(days=i % 365)) for i in range(filas)],
+    )
+
+
+def datos_odi(filas: int, tareas: int):
+    return SimpleNamespace(
+        nombre="José Ignacio González Muñoz", rut="12345678-5", cargo="Soldador",
+        empresa_nombre="Constructora Los Andes SpA", empresa_rut="76543210-3",
+        elementos=[SimpleNamespace(tarea=f"Tarea {i % tareas + 1:02d}: montaje de estructura metálica",
+                                   riesgo=RIESGOS[i % len(RIESGOS)][0], consecuencias=RIESGOS[i % len(RIESGOS)][1],
+                                   precaucion=RIESGOS[i % len(RIESGOS)][2]) for i in range(filas)],
+    )
+
+
+def datos_contrato(clausulas: int):
+    return SimpleNamespace(
+        ciudad_firma="Santiago", fecha_contrato=date(2025, 3, 1),
+        empresa_nombre="Constructora Los Andes SpA", empresa_rut="76543210-3",
+        representante_legal="Ana María Soto Rojas", rut_representante="9876543-3",
+        domicilio_representante="Av. Apoquindo 4500, Las Condes",
+        nombre_trabajador="José Ignacio González Muñoz", nacionalidad_trabajador="Chilena",
+        rut_trabajador="12345678-5", estado_civil_trabajador="Casado",
+        fecha_nacimiento_trabajador=date(1988, 7, 14), domicilio_trabajador="Pasaje Los Aromos 123, Maipú",
+        cargo_trabajador="Soldador calificado", lugar_trabajo="Obra Edificio Parque Central, Ñuñoa",
+        sueldo=850000, jornada="Completa", descripcion_jornada="Lunes a viernes de 08:00 a 18:00 horas",
+        clausulas=[f"El trabajador se obliga a cumplir el procedimiento de trabajo seguro número {i + 1}, "
+                   f"el reglamento interno de orden, higiene y seguridad y las instrucciones de su jefatura directa."
+                   for i in range(clausulas)],
+    )
+
+
+def datos_termino():
+    return SimpleNamespace(
+        ciudad="Santiago", fecha_carta=date(2025, 6, 1), fecha_termino=date(2025, 6, 30),
+        empresa_nombre="Constructora Los Andes SpA", empresa_rut="76543210-3",
+        nombre_trabajador="José Ignacio González Muñoz", rut_trabajador="12345678-5",
+        direccion_trabajador="Pasaje Los Aromos 123", comuna_trabajador="Maipú",
+        articulo_causal="Artículo 159 N° 5", descripcion_causal="CONCLUSIÓN DEL TRABAJO QUE DIO ORIGEN AL CONTRATO",
+        fundamentacion="Lo anterior se fundamenta en el término de la obra específica para la que fue contratado.",
+        lugar_pago_finiquito="Notaría Teatinos 333, Santiago Centro", telefono_notaria="2 2542 3003",
+    )
+
+
+# Escenario → función que renderiza y devuelve los bytes del PDF
+ESCENARIOS: Dict[str, Callable[[], Callable[[], bytes]]] = {
+    "epp_1_fila": lambda: _render(epp_pdf_generator, datos_epp(1)),
+    "epp_50_filas": lambda: _render(epp_pdf_generator, datos_epp(50)),
+    "epp_2000_filas": lambda: _render(epp_pdf_generator, datos_epp(2000)),
+    "odi_12_filas_4_tareas": lambda: _render(odi_pdf_generator, datos_odi(12, 4)),
+    "odi_500_filas_40_tareas": lambda: _render(odi_pdf_generator, datos_odi(500, 40)),
+    "contrato_sin_clausulas": lambda: _render(contrato_pdf_generator, datos_contrato(0)),
+    "contrato_50_clausulas": lambda: _render(contrato_pdf_generator, datos_contrato(50)),
+    "termino_contrato": lambda: _render(termino_contrato_pdf_generator, datos_termino()),
+}
+
+
+def _render(generador, datos) -> Callable[[], bytes]:
+    return lambda: generador.generate_pdf_bytes(datos).getvalue()
+
+
+def medir(render: Callable[[], bytes], repeticiones: int) -> dict:
+    pdf = render()  # calentamiento: fuentes, imágenes y estilos ya cargados
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        render()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    tracemalloc.start()
+    try:
+        render()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "minimo_ms": round(min(tiempos), 2),
+        "mediana_ms": round(statistics.median(tiempos), 2),
+        "max_ms": round(max(tiempos), 2),
+        "memoria_kb": round(pico / 1024, 1),
+        "paginas": len(_PAGINA.findall(pdf)),
+        "bytes": len(pdf),
+    }
+
+
+def umbral(metrica: str, valor: float):
+    limite = valor * MARGEN[metrica]
+    if metrica == "minimo_ms":
+        return round(max(limite, valor + HOLGURA_MS), 1)
+    if metrica == "memoria_kb":
+        return round(limite, 1)
+    return int(limite)
+
+
+def revisar(resultados: Dict[str, dict], umbrales: Dict[str, dict], estricto: bool = False) -> Tuple[List[str], List[str]]:
+    """(fallas, avisos): métricas que pasan su umbral, separadas según DURAS."""
+    fallas, avisos = [], []
+    for nombre, r in resultados.items():
+        for metrica, limite in umbrales.get(nombre, {}).items():
+            if metrica in r and r[metrica] > limite:
+                mensaje = f"{nombre}: {metrica} = {r[metrica]} supera el umbral {limite}"
+                (fallas if estricto or metrica in DURAS else avisos).append(mensaje)
+    return fallas, avisos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=15, help="renders medidos por escenario")
+    parser.add_argument("--solo", default="", help="mide solo los escenarios que contienen este texto")
+    parser.add_argument("--umbrales", default=UMBRALES, help="archivo JSON de umbrales")
+    parser.add_argument("--actualizar-umbrales", action="store_true",
+                        help="guarda lo medido (más un margen) como nuevos umbrales en vez de compararlo")
+    parser.add_argument("--salida", default="", help="guarda los resultados en este JSON")
+    parser.add_argument("--estricto", action="store_true",
+                        help="también falla por tiempo y memoria (usar con umbrales generados en la misma máquina)")
+    args = parser.parse_args()
+
+    # Sin fecha de creación ni ID aleatorio en el PDF: el tamaño solo cambia con el contenido
+    rl_config.invariant = 1
+
+    resultados = {}
+    print(f"{'escenario':<28}{'mín ms':>10}{'mediana ms':>12}{'máx ms':>10}{'memoria KB':>12}{'páginas':>9}{'bytes':>11}")
+    for nombre, preparar in ESCENARIOS.items():
+        if args.solo not in nombre:
+            continue
+        r = resultados[nombre] = medir(preparar(), args.repeat)
+        print(f"{nombre:<28}{r['minimo_ms']:>10.2f}{r['mediana_ms']:>12.2f}{r['max_ms']:>10.2f}{r['memoria_kb']:>12,.1f}"
+              f"{r['paginas']:>9}{r['bytes']:>11,}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    umbrales = {}
+    if os.path.exists(args.umbrales):
+        with open(args.umbrales, encoding="utf-8") as f:
+            umbrales = json.load(f)
+
+    if args.actualizar_umbrales:
+        for nombre, r in resultados.items():
+            umbrales[nombre] = {metrica: umbral(metrica, r[metrica]) for metrica in MARGEN}
+        with open(args.umbrales, "w", encoding="utf-8") as f:
+            json.dump(umbrales, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\nUmbrales actualizados en {args.umbrales}")
+        return
+
+    sin_umbral = [nombre for nombre in resultados if nombre not in umbrales]
+    if sin_umbral:
+        print(f"\n⚠️  Sin umbrales para: {', '.join(sin_umbral)} (usar --actualizar-umbrales)")
+    fallas, avisos = revisar(resultados, umbrales, args.estricto)
+    if avisos:
+        print("\n⚠️  Más lento o pesado que el umbral (no falla; revisar si se repite):\n  " + "\n  ".join(avisos))
+    if fallas:
+        print("\n❌ Regresiones:\n  " + "\n  ".join(fallas))
+        sys.exit(1)
+    print("\n✅ Dentro de los umbrales")
+
+
+if __name__ == "__main__":
+    main()
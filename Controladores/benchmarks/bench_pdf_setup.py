@@ -0,0 +1,94 @@
+"""
+Benchmark del costo de preparación por documento de los generadores PDF.
+
+"antes" reproduce lo que hacía cada request al instanciar un generador:
+getSampleStyleSheet(), todos los ParagraphStyle y el parseo de los textos
+legales fijos. "después" es lo que queda por documento con el registro de
+estilos compartido: solo crear Paragraph a partir de fragmentos ya parseados.
+Como referencia se mide también el render completo de un documento pequeño.
+
+Uso:
+    poetry run python -m benchmarks.bench_pdf_setup --repeat 2000
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+from types import SimpleNamespace
+
+from reportlab.platypus import Paragraph
+
+from app.services.pdf_generator import (
+    ParrafoFijo,
+    PDFContratoGenerator,
+    PDFEppGenerator,
+    PDFOdiGenerator,
+    PDFTerminoContratoGenerator,
+    construir_estilos,
+    epp_pdf_generator,
+)
+
+GENERADORES = [PDFEppGenerator, PDFOdiGenerator, PDFContratoGenerator, PDFTerminoContratoGenerator]
+
+
+def parrafos_fijos(cls) -> list:
+    parrafos = []
+    for valor in vars(cls).values():
+        if isinstance(valor, ParrafoFijo):
+            parrafos.append(valor)
+        elif isinstance(valor, tuple):
+            parrafos.extend(p for p in valor if isinstance(p, ParrafoFijo))
+    return parrafos
+
+
+def setup_antes(parrafos: list) -> None:
+    # Estilos y textos fijos reconstruidos en cada documento
+    construir_estilos()
+    for parrafo in parrafos:
+        base = parrafo._base
+        Paragraph(base.text, base.style)
+
+
+def setup_despues(parrafos: list) -> None:
+    for parrafo in parrafos:
+        parrafo.nuevo()
+
+
+def medir(fn, repeticiones: int):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1_000_000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def documento_epp():
+    return SimpleNamespace(
+        empresa_nombre="Bench SpA", empresa_rut="76000000-0", nombre="José González", rut="12345678", cargo="Soldador",
+        elementos=[SimpleNamespace(elemento_proteccion="Casco", cantidad=1, fecha_entrega=date(2025, 1, 1))],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'generador':<30}{'antes p50':>12}{'antes p95':>12}{'después p50':>14}{'después p95':>14}{'ahorro':>9}")
+    for cls in GENERADORES:
+        parrafos = parrafos_fijos(cls)
+        a50, a95 = medir(lambda: setup_antes(parrafos), args.repeat)
+        d50, d95 = medir(lambda: setup_despues(parrafos), args.repeat)
+        print(f"{cls.__name__:<30}{a50:>10.1f}µs{a95:>10.1f}µs{d50:>12.1f}µs{d95:>12.1f}µs{a50 / d50:>8.1f}x")
+
+    datos = documento_epp()
+    r50, r95 = medir(lambda: epp_pdf_generator.generate_pdf_bytes(datos), max(1, args.repeat // 20))
+    a50, _ = medir(lambda: setup_antes(parrafos_fijos(PDFEppGenerator)), args.repeat)
+    print(f"\nRender completo EPP de 1 fila: p50 {r50 / 1000:.2f}ms, p95 {r95 / 1000:.2f}ms "
+          f"(el setup anterior sumaba un {a50 / (r50 + a50):.0%} al documento)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark de validación de RUT: validar_rut_chileno (uno a uno) contra
+validar_ruts (lote vectorizado con NumPy).
+
+Genera RUT aleatorios en los formatos que llegan desde planillas
+(12.345.678-5, 12345678-5, 12345678k), con una fracción de DV incorrectos,
+verifica que ambas versiones den el mismo resultado y reporta RUT por segundo.
+
+Uso:
+    poetry run python -m benchmarks.bench_rut_validation --n 1000000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.services.rut_validation import digito_verificador, validar_rut_chileno, validar_ruts
+
+
+def generar(n: int, invalidos: float, semilla: int) -> list:
+    rnd = random.Random(semilla)
+    ruts = []
+    for _ in range(n):
+        cuerpo = rnd.randint(1_000_000, 99_999_999)
+        dv = digito_verificador(cuerpo)
+        if rnd.random() < invalidos:
+            dv = rnd.choice([d for d in "0123456789K" if d != dv])
+        formato = rnd.randrange(3)
+        if formato == 0:
+            ruts.append(f"{cuerpo:,}".replace(",", ".") + f"-{dv}")
+        elif formato == 1:
+            ruts.append(f"{cuerpo}-{dv}")
+        else:
+            ruts.append(f"{cuerpo}{dv.lower()}")
+    return ruts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=1_000_000, help="cantidad de RUT")
+    parser.add_argument("--invalidos", type=float, default=0.1, help="fracción con DV incorrecto")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ruts = generar(args.n, args.invalidos, args.seed)
+
+    inicio = time.perf_counter()
+    escalar = np.fromiter((validar_rut_chileno(r) for r in ruts), dtype=bool, count=len(ruts))
+    t_escalar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    lote = validar_ruts(ruts)
+    t_lote = time.perf_counter() - inicio
+
+    if not np.array_equal(escalar, lote.validos):
+        distintos = np.flatnonzero(escalar != lote.validos)[:5]
+        raise SystemExit(f"Resultados distintos, p. ej.: {[ruts[i] for i in distintos]}")
+
+    print(f"{args.n:,} RUT, {int(lote.validos.sum()):,} válidos\n")
+    print(f"{'':<22}{'segundos':>10}{'RUT/s':>14}")
+    print(f"{'validar_rut_chileno':<22}{t_escalar:>10.3f}{args.n / t_escalar:>14,.0f}")
+    print(f"{'validar_ruts (NumPy)':<22}{t_lote:>10.3f}{args.n / t_lote:>14,.0f}")
+    print(f"\nAceleración: {t_escalar / t_lote:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
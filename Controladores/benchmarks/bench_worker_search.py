@@ -0,0 +1,188 @@
+"""
+Benchmark de la búsqueda difusa de trabajadores.
+
+Siembra N filas de DatosTrabajador en una base SQLite temporal, construye el
+índice n-gram en memoria y compara su latencia contra un recorrido completo
+(normalizar y comparar cada trabajador, como hacía la búsqueda original).
+
+Con --explain-postgres revisa además, contra una base PostgreSQL, que el plan
+de cada consulta del backend pg_trgm use los índices de POSTGRES_SEARCH_DDL
+y no recorra datos_trabajador completa; si no, termina con código 1.
+
+Uso:
+    poetry run python -m benchmarks.bench_worker_search --rows 100000
+    poetry run python -m benchmarks.bench_worker_search --rows 0 --explain-postgres postgresql+psycopg2://...
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, insert, select, text
+
+from app.models.generated import Afp, Base, Cargo, DatosTrabajador, Empresa, Territorial, Trabajador
+from app.services.trabajadores import crear_indices_trabajador
+from app.services.worker_search import (
+    WORKER_SEARCH_THRESHOLD,
+    NgramIndex,
+    _rut_prefijo,
+    consulta_postgres,
+    crear_indices_postgres,
+    normalizar,
+)
+
+NOMBRES = ["José", "María", "Juan", "Ana", "Pedro", "Camila", "Ignacio", "Valentina", "Andrés", "Sofía"]
+APELLIDOS = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez", "Sepúlveda",
+             "Morales", "Rodríguez", "López", "Fuentes", "Hernández", "Torres", "Araya", "Flores", "Espinoza", "Valenzuela"]
+CARGOS = ["Soldador", "Jornal", "Capataz", "Operador de grúa", "Administrativo", "Bodeguero", "Electricista", "Prevencionista"]
+CONSULTAS = ["Gonzalez", "munoz rojas", "Sepulbeda", "jose diaz", "100007", "operador grua", "Valentina Fuentes", "electrisista"]
+
+TABLAS = ["empresa", "afp", "territorial", "cargo", "trabajador", "datos_trabajador"]
+
+
+def sembrar(engine, filas: int) -> None:
+    tablas = [Base.metadata.tables[n] for n in TABLAS]
+    Base.metadata.create_all(engine, tables=tablas)
+    rnd = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(Empresa), [{"id_empresa": 1, "nombre_fantasia": "Bench"}])
+        conn.execute(insert(Afp), [{"id_afp": 1, "nombre": "Modelo"}])
+        conn.execute(insert(Territorial), [{"id_territorial": 1, "region": "RM", "provincia": "Santiago", "comuna": "Santiago"}])
+        conn.execute(insert(Cargo), [
+            {"id_cargo": i, "nombre": n, "descripcion": n, "id_empresa": 1} for i, n in enumerate(CARGOS, 1)
+        ])
+        lote = 10_000
+        for inicio in range(1, filas + 1, lote):
+            ids = range(inicio, min(inicio + lote, filas + 1))
+            conn.execute(insert(Trabajador.__table__), [
+                {"id_trabajador": i, "id_empresa": 1, "id_afp": 1, "id_territorial": 1,
+                 "id_cargo": rnd.randint(1, len(CARGOS))} for i in ids
+            ])
+            conn.execute(insert(DatosTrabajador.__table__), [
+                {"id_trabajador": i, "nombre": rnd.choice(NOMBRES), "apellido_paterno": rnd.choice(APELLIDOS),
+                 "apellido_materno": rnd.choice(APELLIDOS), "fecha_nacimiento": date(1990, 1, 1),
+                 "rut": 10_000_000 + i * 7, "DV_rut": "0", "nacionalidad": "Chilena", "direccion_real": "Calle 1"}
+                for i in ids
+            ])
+
+
+def cargar(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(DatosTrabajador.id_trabajador, DatosTrabajador.nombre, DatosTrabajador.apellido_paterno,
+                   DatosTrabajador.apellido_materno, DatosTrabajador.rut, Cargo.nombre)
+            .outerjoin(Cargo, Cargo.id_cargo == DatosTrabajador.id_cargo)
+            .where(DatosTrabajador.id_empresa == 1)
+        ).all()
+
+
+def recorrido_completo(rows, consulta: str, limit: int):
+    # Línea base: normaliza y compara cada fila en cada búsqueda
+    q = normalizar(consulta)
+    encontrados = []
+    for id_trabajador, nombre, ap, am, rut, cargo in rows:
+        texto = normalizar(f"{nombre} {ap} {am} {cargo}")
+        if q in texto or str(rut).startswith(q):
+            encontrados.append(id_trabajador)
+    return encontrados[:limit]
+
+
+def medir(fn, repeticiones: int):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return statistics.median(tiempos), tiempos[int(len(tiempos) * 0.95) - 1]
+
+
+def _con_dependencias(nombres):
+    # Tablas pedidas más las que referencian por FK (PostgreSQL sí las exige)
+    tablas, pendientes = {}, [Base.metadata.tables[n] for n in nombres]
+    while pendientes:
+        tabla = pendientes.pop()
+        if tabla.name not in tablas:
+            tablas[tabla.name] = tabla
+            pendientes.extend(fk.column.table for fk in tabla.foreign_keys)
+    return list(tablas.values())
+
+
+def revisar_planes_postgres(url: str) -> bool:
+    """
+    EXPLAIN de cada consulta de CONSULTAS con el backend PostgreSQL. Con
+    enable_seqscan desactivado el planner elige un índice siempre que la
+    expresión coincida con la indexada, así el chequeo no depende del volumen
+    de datos: basta una base vacía.
+    """
+    engine = create_engine(url)
+    try:
+        Base.metadata.create_all(engine, tables=_con_dependencias(TABLAS), checkfirst=True)
+        crear_indices_trabajador(engine)
+        crear_indices_postgres(engine)
+        ok = True
+        print(f"\n{'consulta':<20}plan")
+        with engine.begin() as conn:
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+            conn.execute(text("SELECT set_config('pg_trgm.word_similarity_threshold', :umbral, true)"),
+                         {"umbral": str(WORKER_SEARCH_THRESHOLD)})
+            for consulta in CONSULTAS:
+                compilada = consulta_postgres(1, consulta, 10).compile(dialect=conn.dialect)
+                plan = "\n".join(fila[0] for fila in conn.exec_driver_sql(f"EXPLAIN {compilada.string}", compilada.params))
+                esperados = ["ix_datos_trabajador_nombre_trgm", "ix_cargo_nombre_trgm"]
+                if _rut_prefijo(consulta):
+                    esperados.append("ix_datos_trabajador_rut_text")
+                problemas = [f"sin {indice}" for indice in esperados if indice not in plan]
+                if "Seq Scan on datos_trabajador" in plan:
+                    problemas.append("Seq Scan on datos_trabajador")
+                print(f"{consulta:<20}{'✅ ' + ', '.join(esperados) if not problemas else '❌ ' + ', '.join(problemas)}")
+                if problemas:
+                    ok = False
+                    print("    " + plan.replace("\n", "\n    "))
+        return ok
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--explain-postgres", default="", metavar="URL",
+                        help="revisa el plan de las consultas pg_trgm en esta base PostgreSQL")
+    args = parser.parse_args()
+
+    if args.explain_postgres and not revisar_planes_postgres(args.explain_postgres):
+        sys.exit(1)
+    if not args.rows:
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}")
+        inicio = time.perf_counter()
+        sembrar(engine, args.rows)
+        print(f"Sembrado de {args.rows} trabajadores: {time.perf_counter() - inicio:.2f}s")
+
+        rows = cargar(engine)
+        inicio = time.perf_counter()
+        indice = NgramIndex()
+        for id_trabajador, nombre, ap, am, rut, cargo in rows:
+            indice.add(id_trabajador, (nombre, ap, am, cargo), rut)
+        print(f"Construcción del índice n-gram: {time.perf_counter() - inicio:.2f}s")
+        engine.dispose()
+
+    print(f"\n{'consulta':<20}{'ngram p50':>12}{'ngram p95':>12}{'scan p50':>12}{'top-1':>30}")
+    for consulta in CONSULTAS:
+        ng50, ng95 = medir(lambda: indice.search(consulta, limit=args.limit), args.repeat)
+        sc50, _ = medir(lambda: recorrido_completo(rows, consulta, args.limit), max(1, args.repeat // 5))
+        top = indice.search(consulta, limit=1)
+        print(f"{consulta:<20}{ng50:>10.2f}ms{ng95:>10.2f}ms{sc50:>10.2f}ms{str(top):>30}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Fixtures compartidas: la app corre contra una base SQLite temporal sembrada
+con el mismo generador del benchmark de endpoints (benchmarks/bench_endpoints.py).
+
+La app lee su configuración al importarse, así que el entorno se fija aquí,
+antes de cualquier import de `app`.
+"""
+import os
+import random
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+_DIRECTORIO = tempfile.mkdtemp(prefix="tests_contaplus_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DIRECTORIO}/tests.sqlite"
+os.environ["PDF_CACHE_DIR"] = os.path.join(_DIRECTORIO, "pdf_cache")
+os.environ["EMAIL_FILE_DIR"] = os.path.join(_DIRECTORIO, "emails")
+os.environ["EMAIL_TRANSPORT"] = "file"
+os.environ["EMAIL_DISPATCHER_ENABLED"] = "false"
+os.environ["JOBS_WORKERS"] = "0"
+os.environ["PDF_RENDER_WORKERS"] = "0"
+# Sin caché de documentos: cada request ejecuta siempre las mismas sentencias
+os.environ["PDF_CACHE_MEMORY_MB"] = "0"
+os.environ["PDF_CACHE_DISK_MB"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ.setdefault("SECRET_KEY", "tests-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+
+from benchmarks.bench_endpoints import PASSWORD, Tenant, preparar_sqlite, sembrar  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def tenants():
+    from app.database import async_engine, engine
+
+    preparar_sqlite(engine, async_engine.sync_engine)
+    parametros = SimpleNamespace(empresas=2, trabajadores=60, epp=5, odi=5, clausulas=3, contratos=0.5)
+    yield sembrar(engine, parametros, random.Random(42))
+    engine.dispose()
+    shutil.rmtree(_DIRECTORIO, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client(tenants):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def login(client, tenant: Tenant) -> dict:
+    respuesta = client.post("/auth/login_api", json={"email": tenant.correo, "password": PASSWORD})
+    assert respuesta.status_code == 200, respuesta.text
+    return respuesta.json()
+
+
+@pytest.fixture(scope="session")
+def tenant(client, tenants) -> Tenant:
+    """Primera empresa sembrada, con sesión iniciada."""
+    tenant = tenants[0]
+    tokens = login(client, tenant)
+    tenant.token = tokens["access_token"]
+    tenant.refresh_token = tokens["refresh_token"]
+    return tenant
+
+
+@pytest.fixture
+def headers(tenant) -> dict:
+    return {"Authorization": f"Bearer {tenant.token}"}
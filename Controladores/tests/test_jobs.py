@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.models.jobs import JOB_ERROR, JOB_PENDIENTE, Job
+from app.schemas.jobs import ListadoContratosJobRequest
+from app.services import jobs
+
+
+@pytest.fixture
+def job_que_falla(client, tenant, monkeypatch) -> str:
+    async def _fallar(db, empresa_id, datos):
+        raise RuntimeError("base de datos caída")
+
+    monkeypatch.setitem(jobs.TIPOS_JOB, "falla", jobs.TipoJob(ListadoContratosJobRequest, _fallar))
+    monkeypatch.setattr(jobs, "JOBS_MAX_INTENTOS", 2)
+    id_job = str(uuid.uuid4())
+    with SessionLocal() as db:
+        db.add(Job(id_job=id_job, kind="falla", estado=JOB_PENDIENTE, id_empresa=tenant.id_empresa,
+                   payload={}, intentos=0, creado=datetime.now(timezone.utc)))
+        db.commit()
+    return id_job
+
+
+def _job(id_job: str) -> Job:
+    with SessionLocal() as db:
+        return db.get(Job, id_job)
+
+
+def test_job_fallido_espera_el_backoff_antes_de_reintentar(job_que_falla):
+    antes = datetime.now(timezone.utc)
+    assert asyncio.run(jobs.procesar_siguiente()) is True
+
+    job = _job(job_que_falla)
+    assert job.estado == JOB_PENDIENTE
+    assert job.intentos == 1
+    assert "base de datos caída" in job.error
+    # Primer reintento: JOBS_RETRY_BASE_SECONDS ±20 %
+    espera = job.proximo_intento.replace(tzinfo=timezone.utc) - antes
+    assert timedelta(seconds=0.8 * jobs.JOBS_RETRY_BASE_SECONDS) <= espera
+    assert espera <= timedelta(seconds=1.2 * jobs.JOBS_RETRY_BASE_SECONDS + 1)
+
+    # Mientras no vence la espera, la cola no lo entrega
+    assert asyncio.run(jobs.procesar_siguiente()) is False
+
+    with SessionLocal() as db:
+        db.execute(update(Job).where(Job.id_job == job_que_falla)
+                   .values(proximo_intento=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        db.commit()
+    assert asyncio.run(jobs.procesar_siguiente()) is True
+
+    job = _job(job_que_falla)
+    assert job.estado == JOB_ERROR
+    assert job.intentos == 2
@@ -0,0 +1,65 @@
+import asyncio
+import builtins
+import errno
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import pdf_render
+from app.services.pdf_cache import DocumentCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> DocumentCache:
+    return DocumentCache(memoria_bytes=1024 * 1024, disco_bytes=1024 * 1024, directorio=str(tmp_path / "pdf_cache"))
+
+
+def _sin_espacio(*args, **kwargs):
+    raise OSError(errno.ENOSPC, "No space left on device")
+
+
+def test_put_sin_espacio_no_falla_ni_deja_temporales(cache, monkeypatch):
+    monkeypatch.setattr(os, "replace", _sin_espacio)
+
+    cache.put("abc", b"%PDF-1.4 documento")
+
+    assert cache.status()["disk_errors"] == 1
+    assert [n for n in os.listdir(cache.directorio) if n.endswith(".tmp")] == []
+    # El nivel de memoria sí lo guardó
+    assert cache.get_memoria("abc") == b"%PDF-1.4 documento"
+
+
+def test_get_disco_sin_permiso_es_un_fallo_de_cache(cache, monkeypatch):
+    cache.put("abc", b"%PDF-1.4 documento")
+    abrir = builtins.open
+
+    def _sin_permiso(ruta, *args, **kwargs):
+        if str(ruta).endswith(".pdf"):
+            raise PermissionError(errno.EACCES, "Permission denied")
+        return abrir(ruta, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", _sin_permiso)
+
+    assert cache.get_disco("abc") is None
+    assert cache.status()["disk_errors"] == 1
+    assert cache.status()["misses"] == 1
+
+
+def test_get_disco_inexistente_no_cuenta_como_error(cache):
+    assert cache.get_disco("no-existe") is None
+    assert cache.status()["disk_errors"] == 0
+
+
+def test_render_pdf_devuelve_el_pdf_aunque_falle_la_cache(cache, monkeypatch):
+    async def _render(tipo, data):
+        return b"%PDF-1.4 recien generado"
+
+    monkeypatch.setattr(pdf_render, "pdf_cache", cache)
+    monkeypatch.setattr(pdf_render.pdf_render_service, "render", _render)
+    monkeypatch.setattr(os, "replace", _sin_espacio)
+
+    resultado = asyncio.run(pdf_render.render_pdf("epp", SimpleNamespace(rut="12345678-5", elementos=[])))
+
+    assert resultado.getvalue() == b"%PDF-1.4 recien generado"
+    assert cache.status()["disk_errors"] == 1
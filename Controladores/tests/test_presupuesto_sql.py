@@ -0,0 +1,67 @@
+import pytest
+
+from app.services.presupuesto_sql import PresupuestoExcedido, forma_sql, presupuesto_sql
+
+
+# ==============================================================
+# forma_sql
+# ==============================================================
+
+@pytest.mark.parametrize("sentencia, forma", [
+    # asyncpg: los números de los parámetros no se confunden con literales
+    ("SELECT * FROM epp WHERE id_epp IN ($1, $2, $3) AND id_empresa = $4",
+     "SELECT * FROM epp WHERE id_epp IN (?, ...) AND id_empresa = ?"),
+    ("SELECT * FROM epp WHERE id_epp = $10", "SELECT * FROM epp WHERE id_epp = ?"),
+    # psycopg2 y SQLite
+    ("SELECT * FROM epp WHERE id_epp IN (%(id_1)s, %(id_2)s) AND id_empresa = %(id_empresa)s",
+     "SELECT * FROM epp WHERE id_epp IN (?, ...) AND id_empresa = ?"),
+    ("SELECT * FROM epp WHERE id_epp IN (?, ?) LIMIT ? OFFSET ?",
+     "SELECT * FROM epp WHERE id_epp IN (?, ...) LIMIT ? OFFSET ?"),
+    # literales, con comillas escapadas, y casts de PostgreSQL
+    ("SELECT * FROM t WHERE a = 'o''higgins' AND b = 12.5 AND c::text = :nombre",
+     "SELECT * FROM t WHERE a = ? AND b = ? AND c::text = ?"),
+    # espacios y saltos de línea no cambian la forma
+    ("SELECT *\n  FROM  epp\n WHERE id_epp = 1", "SELECT * FROM epp WHERE id_epp = ?"),
+])
+def test_forma_sql(sentencia, forma):
+    assert forma_sql(sentencia) == forma
+
+
+def test_forma_sql_igual_para_otros_valores():
+    assert forma_sql("SELECT * FROM epp WHERE id_epp IN ($1, $2)") == \
+        forma_sql("SELECT * FROM epp WHERE id_epp IN ($1, $2, $3)")
+    assert forma_sql("SELECT * FROM t WHERE rut = 12345678") == forma_sql("SELECT * FROM t WHERE rut = 9876543")
+
+
+# ==============================================================
+# Presupuestos de sentencias por endpoint
+# ==============================================================
+
+def test_presupuesto_excedido(client, headers):
+    with pytest.raises(PresupuestoExcedido, match="presupuesto 0"):
+        with presupuesto_sql(0):
+            client.get("/trabajadores/search", params={"apellido_paterno": "Soto"}, headers=headers)
+
+
+def test_presupuesto_search_trabajadores(client, headers):
+    # Cargo, AFP y salud vienen en la misma consulta, no una por trabajador
+    with presupuesto_sql(1):
+        respuesta = client.get("/trabajadores/search", params={"apellido_paterno": "Soto", "limit": 50}, headers=headers)
+    assert respuesta.status_code == 200
+
+
+def test_presupuesto_generate_list_contracts(client, headers):
+    with presupuesto_sql(1):
+        respuesta = client.get("/contrato/generate-list-contracts", headers=headers)
+    assert respuesta.status_code == 200
+
+
+@pytest.mark.parametrize("cantidad_epp", [1, 5])
+def test_presupuesto_generate_epp_pdf(client, tenant, headers, cantidad_epp):
+    # Empresa, trabajador y un solo SELECT ... IN para los elementos, sin importar cuántos sean
+    elementos = [{"id_epp": id_epp, "cantidad": 1} for id_epp in tenant.epp[:cantidad_epp]]
+    with presupuesto_sql(3):
+        respuesta = client.post("/epp/generate-pdf", json={"rut": str(tenant.ruts[0]), "elementos": elementos},
+                                headers=headers)
+    assert respuesta.status_code == 200
+    assert respuesta.headers["content-type"] == "application/pdf"
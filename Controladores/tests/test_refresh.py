@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+
+import pytest
+from sqlalchemy import update
+
+from tests.conftest import login
+
+
+@pytest.fixture
+def refresh_token(client, tenants) -> str:
+    # Sesión nueva en la segunda empresa: no toca los tokens del fixture `tenant`
+    return login(client, tenants[1])["refresh_token"]
+
+
+def _actualizar_sesion(refresh_token: str, **valores) -> None:
+    from app.database import engine
+    from app.models.generated import Sesiones
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(Sesiones)
+            .where(Sesiones.tokenrefresh_hash == sha256(refresh_token.encode()).hexdigest())
+            .values(**valores)
+        )
+
+
+def _refresh(client, refresh_token: str):
+    return client.post("/auth/refresh", params={"refresh_token": refresh_token})
+
+
+def test_refresh_rota_el_token(client, refresh_token):
+    respuesta = _refresh(client, refresh_token)
+    assert respuesta.status_code == 200
+    nuevo = respuesta.json()
+    assert nuevo["refresh_token"] != refresh_token
+    assert client.get("/empresa/full", headers={"Authorization": f"Bearer {nuevo['access_token']}"}).status_code == 200
+
+    # El token nuevo sigue rotando
+    assert _refresh(client, nuevo["refresh_token"]).status_code == 200
+
+
+def test_refresh_token_rotado_no_se_reutiliza(client, refresh_token):
+    assert _refresh(client, refresh_token).status_code == 200
+
+    respuesta = _refresh(client, refresh_token)
+    assert respuesta.status_code == 401
+    assert respuesta.json()["detail"] == "Refresh token revocado"
+
+
+def test_refresh_sesion_revocada(client, refresh_token):
+    _actualizar_sesion(refresh_token, revoked_at=datetime.now(timezone.utc))
+
+    respuesta = _refresh(client, refresh_token)
+    assert respuesta.status_code == 401
+    assert respuesta.json()["detail"] == "Refresh token revocado"
+
+
+def test_refresh_sesion_expirada(client, refresh_token):
+    ahora = datetime.now(timezone.utc)
+    # chk_sesion_fechas exige limite_sesion > fecha_sesion
+    _actualizar_sesion(refresh_token, fecha_sesion=ahora - timedelta(days=8), limite_sesion=ahora - timedelta(days=1))
+
+    respuesta = _refresh(client, refresh_token)
+    assert respuesta.status_code == 401
+    assert respuesta.json()["detail"] == "Refresh token expirado"
+
+
+def test_refresh_token_desconocido(client, tenant):
+    respuesta = _refresh(client, "no-existe")
+    assert respuesta.status_code == 401
+    assert respuesta.json()["detail"] == "Refresh token inválido"
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from app.services.rut_validation import digito_verificador, validar_rut_chileno, validar_ruts
+
+CASOS = [
+    "12345678-5", "12.345.678-5", "123456785", "1234567-4", "7654321-6", "12345678-K", "12345678-k",
+    "10000013-K", "10000013-k", "00000000-0", "1234567-K",
+    # separadores en cualquier posición: el largo se mide sin ellos
+    "1.2.3.4.5.6.7.8.5", "1.2.3.4.5.6.7.8-5", "1-2-3-4-5-6-7-8-5", "..12345678-5..", "------12345678-5",
+    # largo
+    "123456-0", "123456789-2", "1234567890123456-7", "", "-", ".",
+    # caracteres inválidos
+    " 12345678-5", "12345678 -5", "12345678-5 ", "12,345,678-5", "1234567K-5", "K2345678-5", "12345678/5",
+    "12345678\x005", "1234\x005678-5",
+    # dígitos Unicode: \d los acepta, [0-9] no
+    "１２３４５６７８-５", "１２３４５６７８-5", "12345678-５", "١٢٣٤٥٦٧٨-٥", "12345678-Ｋ",
+]
+
+
+@pytest.mark.parametrize("rut", CASOS)
+def test_validar_ruts_igual_que_validar_rut_chileno(rut):
+    resultado = validar_ruts([rut])
+    assert bool(resultado.validos[0]) == validar_rut_chileno(rut)
+
+
+def test_separadores_no_cuentan_para_el_largo():
+    resultado = validar_ruts(["1.2.3.4.5.6.7.8.5", "12.345.678-5"])
+    assert resultado.validos.tolist() == [True, True]
+    assert resultado.cuerpos.tolist() == [12345678, 12345678]
+    assert resultado.dvs.tolist() == ["5", "5"]
+
+
+def test_digitos_de_ancho_completo_son_invalidos():
+    # El cuerpo de ancho completo da el mismo DV que 12345678
+    assert not validar_rut_chileno("１２３４５６７８-5")
+    assert not validar_ruts(["１２３４５６７８-5"]).validos[0]
+
+
+def test_paridad_con_ruts_aleatorios():
+    azar = random.Random(7)
+    alfabeto = "0123456789kK.- ١５"
+    ruts = []
+    for _ in range(2000):
+        cuerpo = azar.randint(1_000_000, 99_999_999)
+        ruts.append(f"{cuerpo}-{digito_verificador(cuerpo)}")
+        ruts.append("".join(azar.choice(alfabeto) for _ in range(azar.randint(0, 14))))
+
+    resultado = validar_ruts(ruts)
+    assert resultado.validos.tolist() == [validar_rut_chileno(r) for r in ruts]
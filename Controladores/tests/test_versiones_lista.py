@@ -0,0 +1,46 @@
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.generated import EmpresaSocio, LoginUsuario, PagoAcciones
+from tests.conftest import login
+
+
+def _etag_empresa_full(client, headers) -> str:
+    respuesta = client.get("/empresa/full", headers=headers)
+    assert respuesta.status_code == 200
+    return respuesta.headers["etag"]
+
+
+def test_cambio_en_login_usuario_sube_la_version(client, tenant, headers):
+    antes = _etag_empresa_full(client, headers)
+
+    with SessionLocal() as db:
+        login_entry = db.execute(select(LoginUsuario).where(LoginUsuario.correo == tenant.correo)).scalar_one()
+        login_entry.telefono = "+56922222222"
+        db.commit()
+
+    respuesta = client.get("/empresa/full", headers={**headers, "If-None-Match": antes})
+    assert respuesta.status_code == 200
+    assert respuesta.headers["etag"] != antes
+    telefonos = [l["telefono"] for u in respuesta.json()["usuario"] for l in u["login_usuario"]]
+    assert "+56922222222" in telefonos
+
+
+def test_pago_acciones_sube_la_version_de_su_empresa(client, tenant, tenants, headers):
+    with SessionLocal() as db:
+        socio = EmpresaSocio(id_empresa=tenant.id_empresa, nombre_socio="Ana")
+        db.add(socio)
+        db.commit()
+        id_socio = socio.id_socio
+
+    otra_empresa = {"Authorization": f"Bearer {login(client, tenants[1])['access_token']}"}
+    antes = _etag_empresa_full(client, headers)
+    antes_otra = _etag_empresa_full(client, otra_empresa)
+
+    with SessionLocal() as db:
+        db.add(PagoAcciones(id_socio=id_socio, cantidad_acciones=10))
+        db.commit()
+
+    assert _etag_empresa_full(client, headers) != antes
+    # Solo cambia la empresa del socio
+    assert _etag_empresa_full(client, otra_empresa) == antes_otra
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.services import worker_search
+
+
+def test_busquedas_concurrentes_construyen_el_indice_una_vez(tenants, monkeypatch):
+    from app.database import AsyncSessionLocal
+
+    construcciones = []
+    construir = worker_search._construir_indice
+
+    def _contar(rows):
+        construcciones.append(len(rows))
+        return construir(rows)
+
+    monkeypatch.setattr(worker_search, "_construir_indice", _contar)
+    # Locks nuevos: los del event loop de otros tests no sirven en este
+    monkeypatch.setattr(worker_search, "_construcciones", worker_search.defaultdict(asyncio.Lock))
+    empresa_id = tenants[1].id_empresa
+    worker_search.invalidar_indice(empresa_id)
+
+    async def _buscar():
+        async with AsyncSessionLocal() as db:
+            return await worker_search._indice_empresa(db, empresa_id)
+
+    async def _todas():
+        return await asyncio.gather(*(_buscar() for _ in range(5)))
+
+    indices = asyncio.run(_todas())
+
+    assert len(construcciones) == 1
+    assert all(indice is indices[0] for indice in indices)
+    assert len(indices[0]) == construcciones[0] > 0
+
+
+def test_invalidar_durante_la_construccion_no_guarda_el_indice(tenants, monkeypatch):
+    from app.database import AsyncSessionLocal
+
+    empresa_id = tenants[1].id_empresa
+    construir = worker_search._construir_indice
+
+    def _invalidar_a_mitad(rows):
+        worker_search.invalidar_indice(empresa_id)
+        return construir(rows)
+
+    monkeypatch.setattr(worker_search, "_construir_indice", _invalidar_a_mitad)
+    monkeypatch.setattr(worker_search, "_construcciones", worker_search.defaultdict(asyncio.Lock))
+    worker_search.invalidar_indice(empresa_id)
+
+    async def _buscar():
+        async with AsyncSessionLocal() as db:
+            return await worker_search._indice_empresa(db, empresa_id)
+
+    assert len(asyncio.run(_buscar())) > 0
+    assert worker_search._indice_vigente(empresa_id) is None